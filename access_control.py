@@ -1,7 +1,14 @@
 from datetime import datetime
 from typing import List, Dict, Optional
-import json
 import os
+import threading
+import atexit
+from audit_store import open_audit_store, open_activity_summary, AuditWriter
+from policy_store import PolicyStore, hash_password, verify_password
+from tag_catalog import get_tag_catalog, tag_name
+
+# Initial access rules. These seed the policy file at ACL_STORE_PATH the first
+# time it is created; after that the file is the source of truth.
 
 # Strict access control mapping users to specific tags
 USER_TAG_ACCESS = {
@@ -21,9 +28,129 @@ USER_ROLES = {
     "sales": "user",
 }
 
+# Initial login credentials (stored hashed in the policy file)
+# In production, use environment variables or secure credential storage
+DEFAULT_USER_PASSWORDS = {
+    "kelly": "password",
+    "admin": "admin123",
+    "finance": "finance123",
+    "devops": "devops123",
+    "sales": "sales123",
+}
+
+# Policy file shared by every dashboard process. Edits made by another
+# process (or by hand) are picked up within ACL_RELOAD_INTERVAL seconds.
+# It holds password hashes, so it is created readable by its owner only and
+# a file owned by another user is refused (see policy_store).
+ACL_STORE_PATH = os.getenv("ACL_STORE_PATH") or os.path.join(
+    os.getenv("XDG_CONFIG_HOME") or os.path.expanduser("~/.config"),
+    "n8n_dashboard", "acl_policy.json"
+)
+ACL_RELOAD_INTERVAL = float(os.getenv("ACL_RELOAD_INTERVAL", "1.0"))
+
 # Audit log storage path
 AUDIT_LOG_PATH = os.getenv("AUDIT_LOG_PATH", "/tmp/n8n_audit_logs.jsonl")
 
+# Audit log backend: "jsonl" (flat file at AUDIT_LOG_PATH) or "sqlite"
+# (indexed database at AUDIT_DB_PATH, imported from AUDIT_LOG_PATH on first use)
+AUDIT_LOG_BACKEND = os.getenv("AUDIT_LOG_BACKEND", "jsonl")
+AUDIT_DB_PATH = os.getenv("AUDIT_DB_PATH", "/tmp/n8n_audit_logs.db")
+
+# Per-user, per-day activity counters, kept next to the audit log
+AUDIT_SUMMARY_PATH = os.getenv(
+    "AUDIT_SUMMARY_PATH",
+    AUDIT_DB_PATH if AUDIT_LOG_BACKEND == "sqlite" else f"{AUDIT_LOG_PATH}.summary.db"
+)
+
+# Buffered audit writes: entries are group-committed by a background thread
+# every AUDIT_FLUSH_INTERVAL seconds or AUDIT_BATCH_SIZE entries. Set
+# AUDIT_ASYNC_WRITES=0 to write synchronously. AUDIT_FSYNC=1 forces each
+# commit to disk.
+AUDIT_ASYNC_WRITES = os.getenv("AUDIT_ASYNC_WRITES", "1") == "1"
+AUDIT_FLUSH_INTERVAL = float(os.getenv("AUDIT_FLUSH_INTERVAL", "0.5"))
+AUDIT_BATCH_SIZE = int(os.getenv("AUDIT_BATCH_SIZE", "200"))
+AUDIT_QUEUE_SIZE = int(os.getenv("AUDIT_QUEUE_SIZE", "10000"))
+AUDIT_FSYNC = os.getenv("AUDIT_FSYNC", "0") == "1"
+
+# JSONL backend rotation: the active file is moved into a gzip archive
+# segment once it reaches this size or age (0 disables either limit)
+AUDIT_ROTATE_BYTES = int(os.getenv("AUDIT_ROTATE_BYTES", str(64 * 1024 * 1024)))
+AUDIT_ROTATE_SECONDS = int(os.getenv("AUDIT_ROTATE_SECONDS", str(24 * 60 * 60)))
+
+_audit_store = None
+_activity_summary = None
+_audit_writer = None
+_audit_store_lock = threading.Lock()
+
+def get_audit_store():
+    """Return the configured audit log store, opening it on first use."""
+    global _audit_store
+    if _audit_store is None:
+        with _audit_store_lock:
+            if _audit_store is None:
+                _audit_store = open_audit_store(
+                    AUDIT_LOG_BACKEND, AUDIT_LOG_PATH, AUDIT_DB_PATH,
+                    fsync=AUDIT_FSYNC,
+                    rotate_bytes=AUDIT_ROTATE_BYTES,
+                    rotate_seconds=AUDIT_ROTATE_SECONDS
+                )
+    return _audit_store
+
+def get_activity_summary():
+    """Return the activity counters, building them from the log on first use."""
+    global _activity_summary
+    if _activity_summary is None:
+        store = get_audit_store()
+        with _audit_store_lock:
+            if _activity_summary is None:
+                _activity_summary = open_activity_summary(AUDIT_SUMMARY_PATH, store)
+    return _activity_summary
+
+def _record_activity(entries: List[Dict]) -> None:
+    get_activity_summary().record(entries)
+
+def get_audit_writer() -> Optional[AuditWriter]:
+    """Return the background audit writer, or None if writes are synchronous."""
+    global _audit_writer
+    if not AUDIT_ASYNC_WRITES:
+        return None
+    if _audit_writer is None:
+        store = get_audit_store()
+        get_activity_summary()
+        with _audit_store_lock:
+            if _audit_writer is None:
+                _audit_writer = AuditWriter(
+                    store,
+                    batch_size=AUDIT_BATCH_SIZE,
+                    flush_interval=AUDIT_FLUSH_INTERVAL,
+                    queue_size=AUDIT_QUEUE_SIZE,
+                    on_commit=_record_activity
+                )
+                # Write out anything still buffered when the process exits
+                atexit.register(_audit_writer.close)
+    return _audit_writer
+
+def flush_audit_log(timeout: float = 10.0) -> bool:
+    """Wait until buffered audit entries have been written.
+    
+    Args:
+        timeout: Maximum seconds to wait
+        
+    Returns:
+        True if everything buffered was written
+    """
+    writer = get_audit_writer()
+    return writer.flush(timeout) if writer is not None else True
+
+def get_audit_writer_stats() -> Dict:
+    """Get queue depth, batch and backpressure counters for the audit writer.
+    
+    Returns:
+        Dictionary of counters (empty if writes are synchronous)
+    """
+    writer = get_audit_writer()
+    return writer.stats() if writer is not None else {}
+
 class AuditLogger:
     """Audit logging for all user actions."""
     
@@ -52,47 +179,41 @@ class AuditLogger:
         }
         
         try:
-            with open(AUDIT_LOG_PATH, 'a') as f:
-                f.write(json.dumps(log_entry) + '\n')
+            writer = get_audit_writer()
+            if writer is not None:
+                writer.write(log_entry)
+            else:
+                # Open the counters first: their backfill from the log must
+                # not see this entry, which record() counts below
+                summary = get_activity_summary()
+                get_audit_store().append([log_entry])
+                summary.record([log_entry])
         except Exception as e:
             print(f"Error writing audit log: {e}")
     
     @staticmethod
     def get_logs(username: str = None, limit: int = 100, 
-                 action: str = None) -> List[Dict]:
+                 action: str = None, workflow_id: str = None,
+                 since: datetime = None) -> List[Dict]:
         """Retrieve audit logs.
         
         Args:
             username: Filter by specific username
             limit: Maximum number of logs to return
             action: Filter by action type
+            workflow_id: Filter by workflow ID
+            since: Only logs at or after this time (archived logs older
+                than this are not read)
             
         Returns:
-            List of log entries
+            List of log entries, most recent first
         """
-        if not os.path.exists(AUDIT_LOG_PATH):
-            return []
-        
-        logs = []
         try:
-            with open(AUDIT_LOG_PATH, 'r') as f:
-                for line in f:
-                    try:
-                        log = json.loads(line.strip())
-                        
-                        # Apply filters
-                        if username and log.get('username') != username:
-                            continue
-                        if action and log.get('action') != action:
-                            continue
-                        
-                        logs.append(log)
-                    except json.JSONDecodeError:
-                        continue
-            
-            # Return most recent logs first
-            logs.reverse()
-            return logs[:limit]
+            flush_audit_log()
+            return get_audit_store().query(
+                username=username, action=action, workflow_id=workflow_id,
+                since=since, limit=limit
+            )
         except Exception as e:
             print(f"Error reading audit logs: {e}")
             return []
@@ -101,6 +222,10 @@ class AuditLogger:
     def get_user_activity_summary(username: str, days: int = 7) -> Dict:
         """Get summary of user activity.
         
+        Read from the pre-aggregated daily counters, so every event in the
+        window is counted. The window covers whole days, from the day
+        ``days`` days ago through today.
+        
         Args:
             username: Username to analyze
             days: Number of days to analyze
@@ -110,35 +235,59 @@ class AuditLogger:
         """
         from datetime import timedelta
         
-        logs = AuditLogger.get_logs(username=username, limit=1000)
-        cutoff_date = datetime.now() - timedelta(days=days)
+        since_day = (datetime.now() - timedelta(days=days)).date().isoformat()
         
-        recent_logs = [
-            log for log in logs 
-            if datetime.fromisoformat(log['timestamp']) > cutoff_date
-        ]
+        try:
+            flush_audit_log()
+            summary = get_activity_summary().user_summary(username, since_day)
+        except Exception as e:
+            print(f"Error reading activity summary: {e}")
+            summary = {"total_actions": 0, "actions_breakdown": {}, "workflows_accessed": 0}
         
-        actions = {}
-        workflows_accessed = set()
+        summary["period_days"] = days
+        return summary
+    
+    @staticmethod
+    def get_activity_leaderboard(days: int = 7, limit: int = 10) -> Dict:
+        """Get the most active users and most frequent actions fleet-wide.
         
-        for log in recent_logs:
-            action = log.get('action', 'unknown')
-            actions[action] = actions.get(action, 0) + 1
+        Args:
+            days: Number of days to analyze
+            limit: Number of users and actions to return
             
-            if log.get('workflow_id'):
-                workflows_accessed.add(log['workflow_id'])
+        Returns:
+            Dictionary with top_users and top_actions, each a list of
+            {"name", "count"} dictionaries, highest first
+        """
+        from datetime import timedelta
         
-        return {
-            "total_actions": len(recent_logs),
-            "actions_breakdown": actions,
-            "workflows_accessed": len(workflows_accessed),
-            "period_days": days
-        }
+        since_day = (datetime.now() - timedelta(days=days)).date().isoformat()
+        
+        try:
+            flush_audit_log()
+            summary = get_activity_summary()
+            return {
+                "top_users": [
+                    {"name": name, "count": count}
+                    for name, count in summary.top("username", since_day, limit)
+                ],
+                "top_actions": [
+                    {"name": name, "count": count}
+                    for name, count in summary.top("action", since_day, limit)
+                ],
+                "period_days": days
+            }
+        except Exception as e:
+            print(f"Error reading activity summary: {e}")
+            return {"top_users": [], "top_actions": [], "period_days": days}
     
     @staticmethod
     def clear_old_logs(days: int = 90) -> int:
         """Clear logs older than specified days.
         
+        With the JSONL backend, whole archive segments are deleted once
+        their newest entry falls outside the retention window.
+        
         Args:
             days: Keep logs from this many days
             
@@ -147,37 +296,172 @@ class AuditLogger:
         """
         from datetime import timedelta
         
-        if not os.path.exists(AUDIT_LOG_PATH):
-            return 0
-        
         cutoff_date = datetime.now() - timedelta(days=days)
-        kept_logs = []
-        deleted_count = 0
         
         try:
-            with open(AUDIT_LOG_PATH, 'r') as f:
-                for line in f:
-                    try:
-                        log = json.loads(line.strip())
-                        log_date = datetime.fromisoformat(log['timestamp'])
-                        
-                        if log_date > cutoff_date:
-                            kept_logs.append(line)
-                        else:
-                            deleted_count += 1
-                    except:
-                        continue
-            
-            # Rewrite file with kept logs
-            with open(AUDIT_LOG_PATH, 'w') as f:
-                for line in kept_logs:
-                    f.write(line)
-            
-            return deleted_count
+            flush_audit_log()
+            get_activity_summary().delete_before(cutoff_date)
+            return get_audit_store().delete_before(cutoff_date)
         except Exception as e:
             print(f"Error clearing old logs: {e}")
             return 0
 
+# --- POLICY STORE ---
+
+_policy_store = None
+_policy_store_lock = threading.Lock()
+
+def _default_policy() -> Dict[str, Dict]:
+    users = {}
+    for username in set(USER_TAG_ACCESS) | set(USER_ROLES) | set(DEFAULT_USER_PASSWORDS):
+        password = DEFAULT_USER_PASSWORDS.get(username)
+        users[username] = {
+            "role": USER_ROLES.get(username, "user"),
+            "tags": list(USER_TAG_ACCESS.get(username, [])),
+            "password_hash": hash_password(password) if password else None,
+        }
+    return users
+
+def get_policy_store() -> PolicyStore:
+    """Return the access policy store, creating the policy file on first use."""
+    global _policy_store
+    if _policy_store is None:
+        with _policy_store_lock:
+            if _policy_store is None:
+                if os.path.exists(ACL_STORE_PATH):
+                    defaults = {}
+                else:
+                    defaults = _default_policy()
+                _policy_store = PolicyStore(
+                    ACL_STORE_PATH, defaults, reload_interval=ACL_RELOAD_INTERVAL
+                )
+    return _policy_store
+
+def authenticate_user(username: str, password: str) -> bool:
+    """Check a username and password against the policy store.
+    
+    Args:
+        username: Username to check
+        password: Password entered by the user
+    
+    Returns:
+        True if the credentials are valid
+    """
+    try:
+        stored = get_policy_store().snapshot().password_hash(username)
+    except Exception as e:
+        print(f"Error reading access policy: {e}")
+        return False
+    return verify_password(password, stored)
+
+# --- COMPILED ACL ---
+# Access checks run for every workflow on every rerun, so the policy snapshot
+# is compiled into per-user frozensets and capability maps. The compiled form
+# is rebuilt lazily whenever the policy generation changes, i.e. after
+# add_user_access/remove_user_access or when the policy file changes on disk.
+
+class _UserACL:
+    __slots__ = ("role", "tags", "tag_set", "is_admin", "capabilities")
+    
+    def __init__(self, username: str, policy):
+        self.role = policy.role(username)
+        self.tags = list(policy.tags(username))
+        self.tag_set = frozenset(self.tags)
+        self.is_admin = self.role == "administrator"
+        self.capabilities = {
+            "can_view": len(self.tags) > 0,
+            "can_execute": self.role in ["administrator", "user"],
+            "can_toggle": self.is_admin,
+            "can_delete": self.is_admin,
+            "can_view_all": self.is_admin,
+            "can_view_audit_logs": self.is_admin,
+        }
+
+_acl_lock = threading.Lock()
+_compiled_acl = (-1, {})
+
+def invalidate_acl() -> None:
+    """Re-read the policy file now instead of waiting for the next reload check."""
+    get_policy_store().reload(force=True)
+
+def get_acl_generation() -> int:
+    """Return a counter that changes whenever access rules change."""
+    return get_policy_store().snapshot().generation
+
+def _user_acl(username: str) -> _UserACL:
+    """Return the compiled ACL entry for a user."""
+    global _compiled_acl
+    policy = get_policy_store().snapshot()
+    generation, users = _compiled_acl
+    if generation != policy.generation:
+        with _acl_lock:
+            generation, users = _compiled_acl
+            if generation != policy.generation:
+                users = {name: _UserACL(name, policy) for name in policy.users}
+                _compiled_acl = (policy.generation, users)
+    
+    acl = users.get(username)
+    return acl if acl is not None else _UserACL(username, policy)
+
+class WorkflowIndex:
+    """Tag-to-workflow inverted index over one workflow snapshot.
+    
+    Posting lists are keyed by the tag catalog's interned tag IDs, and the
+    per-workflow tag IDs are taken from the catalog when it has already
+    ingested the same snapshot. Filtering a snapshot for a user becomes a
+    union of the posting lists for the user's tags, and the result is
+    memoized per user for as long as the same snapshot is in use; the memo
+    is cleared whenever the ACL generation changes.
+    """
+    
+    def __init__(self, workflows: List[Dict]):
+        self.workflows = workflows
+        self.catalog = get_tag_catalog()
+        self.postings = {}
+        for position, tag_ids in enumerate(self.catalog.tag_ids_by_position(workflows)):
+            for tag_id in tag_ids:
+                self.postings.setdefault(tag_id, []).append(position)
+        self._filtered = (None, {})
+    
+    def positions_for_tags(self, tags) -> List[int]:
+        """Positions of workflows carrying any of the tags, in snapshot order."""
+        positions = set()
+        for tag in tags:
+            tag_id = self.catalog.tag_id(tag)
+            if tag_id is not None:
+                positions.update(self.postings.get(tag_id, ()))
+        return sorted(positions)
+    
+    def filter_for_user(self, username: str) -> List[Dict]:
+        generation = get_acl_generation()
+        memo_generation, memo = self._filtered
+        if memo_generation != generation:
+            # Results for older policies can never be asked for again
+            memo = {}
+            self._filtered = (generation, memo)
+        
+        filtered = memo.get(username)
+        if filtered is None:
+            acl = _user_acl(username)
+            filtered = [self.workflows[i] for i in self.positions_for_tags(acl.tag_set)]
+            memo[username] = filtered
+        return filtered
+
+_workflow_index = None
+
+def get_workflow_index(workflows: List[Dict]) -> WorkflowIndex:
+    """Return the index for a workflow snapshot, building it if the snapshot changed.
+    
+    Snapshots are matched by identity, so callers should pass the same list
+    object for as long as the data is unchanged and treat it as read-only.
+    """
+    global _workflow_index
+    index = _workflow_index
+    if index is None or index.workflows is not workflows:
+        index = WorkflowIndex(workflows)
+        _workflow_index = index
+    return index
+
 def get_user_permissions(username: str) -> Dict:
     """Get all permissions for a user.
     
@@ -187,23 +471,13 @@ def get_user_permissions(username: str) -> Dict:
     Returns:
         Dictionary with role, tags, and capabilities
     """
-    role = USER_ROLES.get(username, "guest")
-    tags = USER_TAG_ACCESS.get(username, [])
-    
-    capabilities = {
-        "can_view": len(tags) > 0,
-        "can_execute": role in ["administrator", "user"],
-        "can_toggle": role == "administrator",
-        "can_delete": role == "administrator",
-        "can_view_all": role == "administrator",
-        "can_view_audit_logs": role == "administrator",
-    }
+    acl = _user_acl(username)
     
     return {
         "username": username,
-        "role": role,
-        "allowed_tags": tags,
-        "capabilities": capabilities
+        "role": acl.role,
+        "allowed_tags": list(acl.tags),
+        "capabilities": dict(acl.capabilities)
     }
 
 def has_workflow_access(username: str, workflow_tags: List[str]) -> bool:
@@ -216,11 +490,11 @@ def has_workflow_access(username: str, workflow_tags: List[str]) -> bool:
     Returns:
         True if user has access, False otherwise
     """
-    if USER_ROLES.get(username) == "administrator":
+    acl = _user_acl(username)
+    if acl.is_admin:
         return True
     
-    user_tags = USER_TAG_ACCESS.get(username, [])
-    return any(tag in user_tags for tag in workflow_tags)
+    return any(tag_name(tag) in acl.tag_set for tag in workflow_tags)
 
 def can_execute_workflow(username: str, workflow_tags: List[str]) -> bool:
     """Check if user can execute a workflow.
@@ -232,9 +506,8 @@ def can_execute_workflow(username: str, workflow_tags: List[str]) -> bool:
     Returns:
         True if user can execute, False otherwise
     """
-    permissions = get_user_permissions(username)
     return (
-        permissions["capabilities"]["can_execute"] and 
+        _user_acl(username).capabilities["can_execute"] and 
         has_workflow_access(username, workflow_tags)
     )
 
@@ -248,15 +521,18 @@ def can_toggle_workflow(username: str, workflow_tags: List[str]) -> bool:
     Returns:
         True if user can toggle, False otherwise
     """
-    permissions = get_user_permissions(username)
     return (
-        permissions["capabilities"]["can_toggle"] and 
+        _user_acl(username).capabilities["can_toggle"] and 
         has_workflow_access(username, workflow_tags)
     )
 
 def filter_workflows_by_access(username: str, workflows: List[Dict]) -> List[Dict]:
     """Filter workflows based on user access.
     
+    Uses the inverted tag index for this workflow snapshot (see
+    get_workflow_index), keyed by the tag catalog's IDs, so repeated calls
+    with the same list are cheap.
+    
     Args:
         username: Username to filter for
         workflows: List of all workflows
@@ -264,29 +540,145 @@ def filter_workflows_by_access(username: str, workflows: List[Dict]) -> List[Dic
     Returns:
         Filtered list of workflows user can access
     """
-    if USER_ROLES.get(username) == "administrator":
+    if _user_acl(username).is_admin:
         return workflows
     
-    user_tags = USER_TAG_ACCESS.get(username, [])
-    return [
-        wf for wf in workflows 
-        if any(tag in user_tags for tag in wf.get("tags", []))
-    ]
+    return list(get_workflow_index(workflows).filter_for_user(username))
 
-def add_user_access(username: str, tags: List[str], role: str = "user") -> bool:
+# Actions understood by authorize_many and the capability each needs on top of
+# tag access (None: tag access alone is enough)
+AUTHORIZATION_ACTIONS = {
+    "view": None,
+    "execute": "can_execute",
+    "toggle": "can_toggle",
+    "delete": "can_delete",
+}
+
+class AuthorizationMatrix:
+    """Decisions for one user over a list of workflows and a set of actions.
+    
+    Each action is stored as an integer bitset in which bit ``i`` is set if
+    the action is allowed on ``workflows[i]``. Shifting a bitset that wide
+    costs time in proportion to its length, so lookups go through a binary
+    string decoded once per action instead.
+    """
+    
+    __slots__ = ("username", "size", "masks", "_decoded")
+    
+    def __init__(self, username: str, size: int, masks: Dict[str, int]):
+        self.username = username
+        self.size = size
+        self.masks = masks
+        self._decoded = {}
+    
+    def _bits(self, action: str) -> str:
+        """The action's bitset as "0"/"1" characters, bit ``i`` at index ``i``."""
+        bits = self._decoded.get(action)
+        if bits is None:
+            mask = self.masks.get(action, 0)
+            bits = format(mask, f"0{self.size}b")[::-1] if mask else "0" * self.size
+            self._decoded[action] = bits
+        return bits
+    
+    def allowed(self, action: str, position: int) -> bool:
+        """Check one decision (unknown actions are denied)."""
+        return self._bits(action)[position:position + 1] == "1"
+    
+    def row(self, position: int) -> Dict[str, bool]:
+        """All decisions for one workflow."""
+        return {action: self.allowed(action, position) for action in self.masks}
+    
+    def positions(self, action: str) -> List[int]:
+        """Positions of the workflows on which the action is allowed."""
+        bits = self._bits(action)
+        positions = []
+        position = bits.find("1")
+        while position != -1:
+            positions.append(position)
+            position = bits.find("1", position + 1)
+        return positions
+    
+    def count(self, action: str) -> int:
+        """Number of workflows on which the action is allowed."""
+        return bin(self.masks.get(action, 0)).count("1")
+
+def authorize_many(username: str, workflows: List[Dict],
+                   actions: List[str] = ("view", "execute", "toggle")) -> AuthorizationMatrix:
+    """Decide several actions for many workflows in one pass.
+    
+    All decisions come from the same compiled ACL entry, so they are
+    consistent even if the policy changes mid-call. Gives the same answers
+    as has_workflow_access, can_execute_workflow and can_toggle_workflow.
+    
+    Args:
+        username: Username to check
+        workflows: Workflows to decide for
+        actions: Actions from AUTHORIZATION_ACTIONS (unknown actions are denied)
+    
+    Returns:
+        AuthorizationMatrix indexed by position in ``workflows``
+    """
+    acl = _user_acl(username)
+    size = len(workflows)
+    
+    if size == 0:
+        access = 0
+    elif acl.is_admin:
+        access = (1 << size) - 1
+    else:
+        index = _workflow_index
+        if index is not None and index.workflows is workflows:
+            positions = index.positions_for_tags(acl.tag_set)
+        else:
+            tag_set = acl.tag_set
+            positions = [
+                i for i, wf in enumerate(workflows)
+                if any(tag_name(tag) in tag_set for tag in wf.get("tags", []))
+            ]
+        # Build the bitset as a binary string (bit 0 is the last character)
+        bits = bytearray(b"0" * size)
+        for i in positions:
+            bits[size - 1 - i] = 0x31
+        access = int(bits, 2)
+    
+    masks = {}
+    for action in actions:
+        if action not in AUTHORIZATION_ACTIONS:
+            masks[action] = 0
+            continue
+        capability = AUTHORIZATION_ACTIONS[action]
+        masks[action] = access if capability is None or acl.capabilities[capability] else 0
+    
+    return AuthorizationMatrix(username, size, masks)
+
+def add_user_access(username: str, tags: List[str], role: str = "user",
+                    password: str = None) -> bool:
     """Add or update user access (admin only operation).
     
+    The change is written to the policy file and seen by every process.
+    
     Args:
         username: Username to add/update
         tags: Tags the user should have access to
         role: Role to assign
+        password: New login password (an existing one is kept if omitted)
         
     Returns:
         True if successful
     """
-    USER_TAG_ACCESS[username] = tags
-    USER_ROLES[username] = role
-    return True
+    def apply(users):
+        user = users.setdefault(username, {})
+        user["tags"] = list(tags)
+        user["role"] = role
+        if password is not None:
+            user["password_hash"] = hash_password(password)
+    
+    try:
+        get_policy_store().update(apply)
+        return True
+    except Exception as e:
+        print(f"Error updating access policy: {e}")
+        return False
 
 def remove_user_access(username: str) -> bool:
     """Remove user access (admin only operation).
@@ -297,11 +689,12 @@ def remove_user_access(username: str) -> bool:
     Returns:
         True if successful
     """
-    if username in USER_TAG_ACCESS:
-        del USER_TAG_ACCESS[username]
-    if username in USER_ROLES:
-        del USER_ROLES[username]
-    return True
+    try:
+        get_policy_store().update(lambda users: users.pop(username, None))
+        return True
+    except Exception as e:
+        print(f"Error updating access policy: {e}")
+        return False
 
 def get_all_users() -> List[Dict]:
     """Get list of all users and their permissions.
@@ -310,6 +703,6 @@ def get_all_users() -> List[Dict]:
         List of user permission dictionaries
     """
     users = []
-    for username in USER_TAG_ACCESS.keys():
+    for username in sorted(get_policy_store().snapshot().users):
         users.append(get_user_permissions(username))
     return users
@@ -4,15 +4,23 @@ import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime, timedelta
 from access_control import (
-    USER_TAG_ACCESS, get_user_permissions, has_workflow_access,
-    can_execute_workflow, can_toggle_workflow, filter_workflows_by_access,
-    AuditLogger, get_all_users
+    get_user_permissions, authenticate_user,
+    authorize_many, filter_workflows_by_access,
+    AuditLogger, get_all_users, get_audit_writer_stats, get_acl_generation
 )
 from n8n_client import (
-    get_workflows, get_executions, toggle_workflow, trigger_workflow,
-    get_workflow_statistics, test_connection, get_all_tags,
-    get_execution_by_id, is_api_configured
+    toggle_workflow, trigger_workflow,
+    test_connection, get_all_tags, get_tag_counts,
+    get_execution_by_id, is_api_configured, start_heartbeat,
+    get_latency_history, get_statistics_bulk,
+    start_poller, get_live_snapshot, refresh_live_snapshot,
+    get_fleet_latency_slo
 )
+import n8n_client_async
+from n8n_client_async import gather_sync
+from execution_store import IN_FLIGHT_STATUSES
+from payload_inspector import PayloadIndex, PAYLOAD_BYTE_BUDGET, format_bytes
+from workflow_search import WorkflowSearchIndex
 import time
 
 # --- PAGE CONFIG ---
@@ -150,6 +158,10 @@ st.markdown("""
     </style>
     """, unsafe_allow_html=True)
 
+# Auto-refresh intervals a session can choose from, in seconds
+REFRESH_INTERVALS = [10, 30, 60, 300]
+DEFAULT_REFRESH_INTERVAL = 30
+
 # --- SESSION STATE ---
 if "logged_in" not in st.session_state:
     st.session_state.logged_in = False
@@ -159,16 +171,33 @@ if "selected_wf_id" not in st.session_state:
     st.session_state.selected_wf_id = None
 if "auto_refresh" not in st.session_state:
     st.session_state.auto_refresh = False
+if "refresh_interval" not in st.session_state:
+    st.session_state.refresh_interval = DEFAULT_REFRESH_INTERVAL
+
+# Background health heartbeat and data poller (one per process, shared by all sessions)
+if is_api_configured():
+    start_heartbeat()
+    start_poller()
+
+# Seconds a session waits for the poller's first snapshot after startup
+SNAPSHOT_WAIT_SECONDS = 30
+
+# History shown on the STATISTICS tab, in days
+ANALYTICS_DAYS = 30
+
+# Window for the latency SLO panels, in hours
+SLO_WINDOW_HOURS = 24
 
-# --- AUTHENTICATION CREDENTIALS ---
-# In production, use environment variables or secure credential storage
-VALID_USERS = {
-    "kelly": "password",
-    "admin": "admin123",
-    "finance": "finance123",
-    "devops": "devops123",
-    "sales": "sales123",
-}
+# Page sizes offered on the EXECUTION_LOGS tab
+EXECUTION_PAGE_SIZES = [25, 50, 100]
+
+# Workflow buttons shown per sidebar page
+SIDEBAR_PAGE_SIZE = 25
+
+# Fleet health scan limits (admin panel)
+FLEET_MAX_WORKFLOWS = 500
+FLEET_CONCURRENCY = 16
+FLEET_DEADLINE_SECONDS = 10
 
 # --- LOGIN PAGE ---
 def login_page():
@@ -178,7 +207,8 @@ def login_page():
     conn_status = test_connection()
     if conn_status["connected"]:
         st.sidebar.success(f"✓ API CONNECTED")
-        st.sidebar.caption(f"Workflows: {conn_status.get('workflow_count', 0)}")
+        if conn_status.get("workflow_count") is not None:
+            st.sidebar.caption(f"Workflows: {conn_status['workflow_count']}")
     else:
         st.sidebar.error(f"✗ API OFFLINE")
         st.sidebar.caption(conn_status.get("message", "Unknown error"))
@@ -190,7 +220,7 @@ def login_page():
         password = st.text_input("ACCESS_CODE", type="password", placeholder="********")
         
         if st.button("INITIALIZE", use_container_width=True):
-            if username in VALID_USERS and password == VALID_USERS[username]:
+            if authenticate_user(username, password):
                 st.session_state.logged_in = True
                 st.session_state.username = username
                 
@@ -239,7 +269,9 @@ if not is_api_configured():
     st.stop()
 
 # --- DATA LOADING ---
-all_workflows = get_workflows()
+# Read the poller's shared snapshot; no request is made on rerun
+live_snapshot = get_live_snapshot(wait=SNAPSHOT_WAIT_SECONDS)
+all_workflows = live_snapshot.workflows
 
 if not all_workflows:
     st.warning("⚠️ NO WORKFLOWS FOUND - Check n8n connection")
@@ -251,7 +283,7 @@ if not all_workflows:
 
 # Filter workflows by user access
 user_workflows = filter_workflows_by_access(username, all_workflows)
-allowed_tags = user_perms["allowed_tags"] if user_perms["role"] != "administrator" else get_all_tags()
+allowed_tags = user_perms["allowed_tags"] if user_perms["role"] != "administrator" else get_all_tags(all_workflows)
 
 if not user_workflows:
     st.error(f"FATAL ERROR: NO WORKFLOWS AUTHORIZED FOR USER [{username.upper()}]")
@@ -274,32 +306,71 @@ if conn_status["connected"]:
 else:
     st.sidebar.error(f"✗ DISCONNECTED")
 
+# Snapshot freshness
+snapshot_age = live_snapshot.age()
+if live_snapshot.is_stale():
+    st.sidebar.warning(f"⚠ DATA STALE: {snapshot_age:.0f}s OLD" if snapshot_age is not None else "⚠ DATA NOT LOADED")
+else:
+    st.sidebar.caption(f"DATA AGE: {snapshot_age:.0f}s")
+if live_snapshot.error:
+    st.sidebar.caption(f"LAST POLL ERROR: {live_snapshot.error}")
+if st.sidebar.button("⟳ FORCE_REFRESH", use_container_width=True):
+    refresh_live_snapshot()
+    st.rerun()
+
 st.sidebar.markdown("---")
 
 # Search and Filter
 search_query = st.sidebar.text_input("🔍 SCAN_NAME", "")
-selected_tag = st.sidebar.selectbox("🏷️ FILTER_TAG", ["ALL_TAGS"] + allowed_tags)
+tag_counts = get_tag_counts(all_workflows)
+selected_tag = st.sidebar.selectbox(
+    "🏷️ FILTER_TAG",
+    ["ALL_TAGS"] + allowed_tags,
+    format_func=lambda tag: tag if tag == "ALL_TAGS" else f"{tag} ({tag_counts.get(tag, 0)})"
+)
 status_filter = st.sidebar.selectbox("📊 STATUS", ["ALL", "ACTIVE", "INACTIVE"])
 
-# Apply filters
-filtered_workflows = user_workflows.copy()
+# Apply filters through the session's search index, which is rebuilt only
+# when the snapshot or the user's access changes
+search_index_key = (username, get_acl_generation())
+cached_index = st.session_state.get("search_index")
+if cached_index is None or cached_index[0] is not all_workflows or cached_index[1] != search_index_key:
+    cached_index = st.session_state.search_index = (
+        all_workflows, search_index_key, WorkflowSearchIndex(user_workflows)
+    )
+search_index = cached_index[2]
 
-if search_query:
-    filtered_workflows = [wf for wf in filtered_workflows if search_query.lower() in wf['name'].lower()]
+filtered_workflows = search_index.search(
+    search_query,
+    tag=None if selected_tag == "ALL_TAGS" else selected_tag,
+    active={"ACTIVE": True, "INACTIVE": False}.get(status_filter)
+)
 
-if selected_tag != "ALL_TAGS":
-    filtered_workflows = [wf for wf in filtered_workflows if selected_tag in wf.get("tags", [])]
+st.sidebar.subheader(f"NODES_FOUND: {len(filtered_workflows)}")
 
-if status_filter == "ACTIVE":
-    filtered_workflows = [wf for wf in filtered_workflows if wf.get('active')]
-elif status_filter == "INACTIVE":
-    filtered_workflows = [wf for wf in filtered_workflows if not wf.get('active')]
+# Workflow Selection: only one page of buttons is rendered per run
+sidebar_pages = max(1, -(-len(filtered_workflows) // SIDEBAR_PAGE_SIZE))
+sidebar_page = 1
+if sidebar_pages > 1:
+    # Start on the page holding the selected workflow; the page is kept per filter combination
+    selected_index = next(
+        (i for i, wf in enumerate(filtered_workflows) if wf['id'] == st.session_state.selected_wf_id), 0
+    )
+    sidebar_page = st.sidebar.number_input(
+        f"PAGE (1-{sidebar_pages})",
+        min_value=1,
+        max_value=sidebar_pages,
+        value=selected_index // SIDEBAR_PAGE_SIZE + 1,
+        key=f"sidebar_page_{search_query}_{selected_tag}_{status_filter}"
+    )
 
-st.sidebar.subheader(f"NODES_FOUND: {len(filtered_workflows)}")
+page_start = (sidebar_page - 1) * SIDEBAR_PAGE_SIZE
+visible_workflows = filtered_workflows[page_start:page_start + SIDEBAR_PAGE_SIZE]
+if visible_workflows:
+    st.sidebar.caption(f"SHOWING {page_start + 1}-{page_start + len(visible_workflows)} OF {len(filtered_workflows)}")
 st.sidebar.markdown("---")
 
-# Workflow Selection
-for wf in filtered_workflows:
+for wf in visible_workflows:
     status_icon = "🟢" if wf.get('active') else "🔴"
     button_label = f"{status_icon} {wf['name']}"
     
@@ -318,8 +389,15 @@ for wf in filtered_workflows:
 # Auto-refresh toggle
 st.sidebar.markdown("---")
 st.sidebar.subheader("⚙️ SETTINGS")
-auto_refresh = st.sidebar.checkbox("AUTO-REFRESH (30s)", value=st.session_state.auto_refresh)
+auto_refresh = st.sidebar.checkbox("AUTO-REFRESH", value=st.session_state.auto_refresh)
 st.session_state.auto_refresh = auto_refresh
+if auto_refresh:
+    st.session_state.refresh_interval = st.sidebar.selectbox(
+        "REFRESH_INTERVAL",
+        REFRESH_INTERVALS,
+        index=REFRESH_INTERVALS.index(st.session_state.refresh_interval),
+        format_func=lambda seconds: f"{seconds}s"
+    )
 
 if st.sidebar.button("TERMINATE_SESSION", use_container_width=True):
     AuditLogger.log_action(username=username, action="logout", status="success")
@@ -332,14 +410,77 @@ if not st.session_state.selected_wf_id and filtered_workflows:
 
 selected_wf = next((wf for wf in user_workflows if wf['id'] == st.session_state.selected_wf_id), None)
 
-if selected_wf:
+# Execution payload viewer: per-node sizes and a preview capped at
+# PAYLOAD_BYTE_BUDGET; larger payloads are offered as a download
+def render_payload_inspector(exec_id: str, payload):
+    # Sizes are measured once per execution and kept for the session
+    cached = st.session_state.get("payload_index")
+    if cached is None or cached[0] != exec_id:
+        cached = st.session_state.payload_index = (exec_id, PayloadIndex(payload))
+    index = cached[1]
+    
+    st.caption(
+        f"Payload size: {format_bytes(index.total)} · "
+        f"preview budget: {format_bytes(PAYLOAD_BYTE_BUDGET)}"
+    )
+    
+    node_rows = index.node_sizes()
+    if node_rows:
+        node_df = pd.DataFrame(node_rows)
+        node_df['size'] = node_df['size'].map(format_bytes)
+        st.dataframe(node_df, use_container_width=True, hide_index=True)
+    
+    subtree = st.selectbox(
+        "Subtree",
+        [()] + index.containers(),
+        format_func=lambda path: (
+            f"{'.'.join(map(str, path)) or '(root)'} · {format_bytes(index.size(index.get(path)))}"
+        ),
+        key=f"payload_path_{exec_id}"
+    )
+    preview, truncated = index.preview(subtree, budget=PAYLOAD_BYTE_BUDGET)
+    if truncated:
+        st.caption("Preview truncated; pick a subtree to see more of it")
+    st.json(preview)
+    
+    if index.total > PAYLOAD_BYTE_BUDGET:
+        st.warning(f"PAYLOAD TOO LARGE TO SHOW IN FULL ({format_bytes(index.total)})")
+        # Serialized only on request, not on every rerun; the result is kept
+        # for the session so the download button survives its own click
+        prepared = st.session_state.get("payload_download")
+        if prepared is None or prepared[0] != exec_id:
+            prepared = None
+            if st.button("📦 PREPARE DOWNLOAD", key=f"payload_prepare_{exec_id}"):
+                prepared = st.session_state.payload_download = (exec_id, index.dumps())
+        if prepared is not None:
+            st.download_button(
+                "⬇️ DOWNLOAD FULL PAYLOAD",
+                data=prepared[1],
+                file_name=f"execution_{exec_id}.json",
+                mime="application/json",
+                key=f"payload_download_{exec_id}"
+            )
+
+# Workflow page body. Runs as a fragment, so auto-refresh ticks and widget
+# changes here rerender this panel only.
+def render_workflow(selected_wf: dict):
+    # Everything else on the page renders from the shared snapshot, so a
+    # full rerun is only needed once the poller has replaced it
+    if get_live_snapshot().workflows is not all_workflows:
+        st.rerun()
+    
     # Header Section
     col_title, col_refresh = st.columns([4, 1])
     with col_title:
         st.title(f"> WORKFLOW: {selected_wf['name']}")
     with col_refresh:
         if st.button("🔄 REFRESH", use_container_width=True):
-            st.rerun()
+            st.rerun(scope="fragment")
+    
+    # Result of an action taken before the last rerun
+    flash = st.session_state.pop("flash", None)
+    if flash:
+        st.success(flash)
     
     st.markdown(f"**ID:** `{selected_wf['id']}` | **TAGS:** {', '.join(selected_wf.get('tags', [])) or 'None'}")
     
@@ -351,18 +492,30 @@ if selected_wf:
     
     st.markdown("---")
     
+    # One execution fetch serves stats, logs and charts for this render; it
+    # and the SLO windows are independent reads, so they run concurrently
+    snapshot, slo = gather_sync(
+        n8n_client_async.get_execution_snapshot(selected_wf['id'], limit=100),
+        n8n_client_async.get_latency_slo(selected_wf['id'], window_hours=SLO_WINDOW_HOURS)
+    )
+    stats = snapshot.statistics()
+    
+    # Execute/toggle decisions from one permission snapshot, taken on every
+    # fragment run so policy changes apply without a full rerun
+    authz = authorize_many(username, [selected_wf], ["execute", "toggle"])
+    
     # Action Buttons
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        can_exec = can_execute_workflow(username, selected_wf.get('tags', []))
+        can_exec = authz.allowed("execute", 0)
         if st.button("⚡ EXECUTE_NOW", use_container_width=True, disabled=not can_exec):
             if can_exec:
                 st.toast("TRANSMITTING SIGNAL...")
                 execution_id = trigger_workflow(selected_wf['id'])
                 
                 if execution_id:
-                    st.success(f"✓ EXECUTION INITIATED: {execution_id}")
+                    st.session_state.flash = f"✓ EXECUTION INITIATED: {execution_id}"
                     AuditLogger.log_action(
                         username=username,
                         action="execute_workflow",
@@ -371,7 +524,6 @@ if selected_wf:
                         status="success",
                         details={"execution_id": execution_id}
                     )
-                    time.sleep(1)
                     st.rerun()
                 else:
                     st.error("✗ EXECUTION FAILED")
@@ -384,13 +536,13 @@ if selected_wf:
                     )
     
     with col2:
-        can_tog = can_toggle_workflow(username, selected_wf.get('tags', []))
+        can_tog = authz.allowed("toggle", 0)
         is_active = selected_wf.get('active', False)
         
         if is_active:
             if st.button("🛑 DEACTIVATE", use_container_width=True, disabled=not can_tog):
                 if can_tog and toggle_workflow(selected_wf['id'], False):
-                    st.success("✓ WORKFLOW DEACTIVATED")
+                    st.session_state.flash = "✓ WORKFLOW DEACTIVATED"
                     AuditLogger.log_action(
                         username=username,
                         action="deactivate_workflow",
@@ -398,12 +550,13 @@ if selected_wf:
                         workflow_name=selected_wf['name'],
                         status="success"
                     )
-                    time.sleep(0.5)
+                    # Pick up the new state before rerendering
+                    refresh_live_snapshot()
                     st.rerun()
         else:
             if st.button("🟢 ACTIVATE", use_container_width=True, disabled=not can_tog):
                 if can_tog and toggle_workflow(selected_wf['id'], True):
-                    st.success("✓ WORKFLOW ACTIVATED")
+                    st.session_state.flash = "✓ WORKFLOW ACTIVATED"
                     AuditLogger.log_action(
                         username=username,
                         action="activate_workflow",
@@ -411,12 +564,11 @@ if selected_wf:
                         workflow_name=selected_wf['name'],
                         status="success"
                     )
-                    time.sleep(0.5)
+                    # Pick up the new state before rerendering
+                    refresh_live_snapshot()
                     st.rerun()
     
     with col3:
-        # Get workflow stats
-        stats = get_workflow_statistics(selected_wf['id'])
         st.metric("SUCCESS RATE", f"{stats['success_rate']:.1f}%")
     
     with col4:
@@ -457,59 +609,118 @@ if selected_wf:
             m3, m4 = st.columns(2)
             m3.metric("Error Count", stats['error'])
             m4.metric("Avg Duration", f"{stats['avg_duration']:.2f}s")
+            
+            m5, m6 = st.columns(2)
+            m5.metric("P50 Duration", f"{stats['p50_duration']:.2f}s")
+            m6.metric("P95 Duration", f"{stats['p95_duration']:.2f}s")
+        
+        # Latency SLO from the hourly duration sketches
+        if slo is not None:
+            st.subheader(f"⏱️ LATENCY SLO ({SLO_WINDOW_HOURS}H)")
+            st.caption(
+                f"Good = succeeded within {slo['latency_threshold']:g}s · "
+                f"target {slo['target'] * 100:g}% · burn rate > 1 spends the error budget too fast"
+            )
+            
+            if slo['total'] == 0:
+                st.info(f"NO FINISHED EXECUTIONS IN THE LAST {SLO_WINDOW_HOURS}H")
+            else:
+                s1, s2, s3, s4 = st.columns(4)
+                s1.metric("P50", f"{slo['p50_duration']:.2f}s" if slo['p50_duration'] is not None else "—")
+                s2.metric("P95", f"{slo['p95_duration']:.2f}s" if slo['p95_duration'] is not None else "—")
+                s3.metric("P99", f"{slo['p99_duration']:.2f}s" if slo['p99_duration'] is not None else "—")
+                s4.metric("Good", f"{slo['good_fraction'] * 100:.2f}%")
+                
+                burn_cols = st.columns(len(slo['burn_rates']))
+                for col, (hours, rate) in zip(burn_cols, sorted(slo['burn_rates'].items())):
+                    if rate is None:
+                        col.metric(f"Burn {hours}H", "—")
+                    else:
+                        col.metric(f"Burn {hours}H", f"{rate:.2f}x" + (" 🔥" if rate > 1 else ""))
 
     with tab2:
         # Execution Logs
         st.subheader("📜 EXECUTION HISTORY")
         
         # Execution filter
-        exec_status_filter = st.selectbox(
+        filter_col, size_col = st.columns([3, 1])
+        exec_status_filter = filter_col.selectbox(
             "Filter by Status",
             ["all", "success", "error", "waiting"],
             key="exec_filter"
         )
+        page_size = size_col.selectbox("Rows per page", EXECUTION_PAGE_SIZES, key="exec_page_size")
+        status_filter = None if exec_status_filter == "all" else exec_status_filter
         
-        executions = get_executions(
-            selected_wf['id'], 
-            limit=50,
-            status=None if exec_status_filter == "all" else exec_status_filter
-        )
+        # Page number is kept per workflow, filter and page size
+        page_key = f"exec_page_{selected_wf['id']}_{exec_status_filter}_{page_size}"
+        page_no = st.session_state.get(page_key, 1)
+        log_page = snapshot.page(status=status_filter, page=page_no - 1, page_size=page_size)
+        total_pages = max(1, -(-log_page['total'] // page_size))
+        if page_no > total_pages:
+            # The log shrank (retention, deletes); go to the last page
+            page_no = st.session_state[page_key] = total_pages
+            log_page = snapshot.page(status=status_filter, page=page_no - 1, page_size=page_size)
         
-        if executions:
-            st.caption(f"Showing {len(executions)} most recent executions")
-            
-            for exe in executions:
+        if log_page['executions']:
+            # Summary rows only; the full payload is loaded when a row is selected
+            log_rows = []
+            for exe in log_page['executions']:
+                duration = None
+                if exe.get('startedAt') and exe.get('finishedAt'):
+                    try:
+                        start = datetime.fromisoformat(exe['startedAt'].replace('Z', '+00:00'))
+                        finish = datetime.fromisoformat(exe['finishedAt'].replace('Z', '+00:00'))
+                        duration = round((finish - start).total_seconds(), 2)
+                    except ValueError:
+                        pass
                 status = exe.get('status', 'unknown')
-                status_icon = "✓" if status == "success" else "✗" if status == "error" else "⏳"
-                status_color = "success" if status == "success" else "error" if status == "error" else "info"
-                
-                with st.expander(f"{status_icon} EXEC_ID: {exe.get('id')} | STATUS: {status.upper()}", expanded=False):
-                    col_1, col_2 = st.columns(2)
-                    
-                    with col_1:
-                        st.text(f"Started: {exe.get('startedAt', 'N/A')}")
-                        if exe.get('finishedAt'):
-                            st.text(f"Finished: {exe['finishedAt']}")
-                        
-                        # Calculate duration
-                        if exe.get('startedAt') and exe.get('finishedAt'):
-                            try:
-                                start = datetime.fromisoformat(exe['startedAt'].replace('Z', '+00:00'))
-                                finish = datetime.fromisoformat(exe['finishedAt'].replace('Z', '+00:00'))
-                                duration = (finish - start).total_seconds()
-                                st.text(f"Duration: {duration:.2f}s")
-                            except:
-                                pass
-                    
-                    with col_2:
-                        st.text(f"Status: {status}")
-                        if exe.get('mode'):
-                            st.text(f"Mode: {exe['mode']}")
-                    
-                    # Show execution data if available
-                    if exe.get('data'):
-                        st.subheader("Execution Data")
-                        st.json(exe['data'])
+                log_rows.append({
+                    "": "✓" if status == "success" else "✗" if status == "error" else "⏳",
+                    "id": exe.get('id'),
+                    "status": status.upper(),
+                    "mode": exe.get('mode'),
+                    "started": exe.get('startedAt'),
+                    "finished": exe.get('finishedAt'),
+                    "duration_s": duration,
+                })
+            log_df = pd.DataFrame(log_rows)
+            
+            first = (page_no - 1) * page_size + 1
+            st.caption(
+                f"Executions {first}-{first + len(log_df) - 1} of {log_page['total']} · "
+                f"select a row to load its data"
+            )
+            log_event = st.dataframe(
+                log_df,
+                use_container_width=True,
+                hide_index=True,
+                on_select="rerun",
+                selection_mode="single-row",
+                key=f"exec_table_{page_key}_{page_no}"
+            )
+            if total_pages > 1:
+                st.number_input(f"Page (of {total_pages})", min_value=1, max_value=total_pages, key=page_key)
+            
+            selected_rows = log_event.selection.rows if log_event else []
+            if selected_rows:
+                exec_id = log_df.iloc[selected_rows[0]]['id']
+                # One payload per session, fetched when the selection changes
+                # rather than on every rerun; running executions are refetched
+                cached = st.session_state.get("execution_details")
+                if cached is not None and cached[0] == exec_id:
+                    details = cached[1]
+                else:
+                    details = get_execution_by_id(exec_id)
+                    if details is not None and details.get('status') not in IN_FLIGHT_STATUSES:
+                        st.session_state.execution_details = (exec_id, details)
+                st.subheader(f"EXEC_ID: {exec_id}")
+                if details is None:
+                    st.error("FAILED TO LOAD EXECUTION")
+                elif details.get('data'):
+                    render_payload_inspector(exec_id, details['data'])
+                else:
+                    st.info("NO EXECUTION DATA STORED")
         else:
             st.info("NO EXECUTION LOGS FOUND IN BUFFER")
 
@@ -538,17 +749,14 @@ if selected_wf:
         # Statistics and Analytics
         st.subheader("📈 WORKFLOW ANALYTICS")
         
-        # Get execution data for charts
-        recent_executions = get_executions(selected_wf['id'], limit=100)
+        # Columnar history of the last ANALYTICS_DAYS days, built once per render
+        frame = snapshot.history(days=ANALYTICS_DAYS)
         
-        if recent_executions:
-            # Prepare dataframe
-            df = pd.DataFrame(recent_executions)
-            df['startedAt'] = pd.to_datetime(df['startedAt'])
-            df['date'] = df['startedAt'].dt.date
+        if len(frame) > 0:
+            st.caption(f"{len(frame)} executions over the last {ANALYTICS_DAYS} days")
             
             # Executions over time
-            daily_counts = df.groupby(['date', 'status']).size().reset_index(name='count')
+            daily_counts = frame.daily_counts()
             
             fig = px.bar(
                 daily_counts, 
@@ -570,11 +778,11 @@ if selected_wf:
             st.plotly_chart(fig, use_container_width=True)
             
             # Status distribution
-            status_counts = df['status'].value_counts()
+            status_counts = frame.status_counts()
             
             fig2 = go.Figure(data=[go.Pie(
-                labels=status_counts.index,
-                values=status_counts.values,
+                labels=list(status_counts.keys()),
+                values=list(status_counts.values()),
                 hole=.3
             )])
             
@@ -590,15 +798,27 @@ if selected_wf:
             # Recent performance metrics
             col1, col2, col3 = st.columns(3)
             
-            recent_7d = df[df['startedAt'] > (datetime.now() - timedelta(days=7))]
+            recent_7d = frame.last_days(7).summary()
             
-            col1.metric("Last 7 Days", len(recent_7d))
-            col2.metric("Success Rate", f"{(len(recent_7d[recent_7d['status']=='success'])/len(recent_7d)*100):.1f}%" if len(recent_7d) > 0 else "N/A")
-            col3.metric("Error Count", len(recent_7d[recent_7d['status']=='error']))
+            col1.metric("Last 7 Days", recent_7d['total'])
+            col2.metric("Success Rate", f"{recent_7d['success_rate']:.1f}%" if recent_7d['total'] > 0 else "N/A")
+            col3.metric("Error Count", recent_7d['error'])
+            
+            # Duration percentiles over the whole window
+            window_stats = frame.summary()
+            col1, col2, col3 = st.columns(3)
+            col1.metric("P50 Duration", f"{window_stats['p50_duration']:.2f}s")
+            col2.metric("P95 Duration", f"{window_stats['p95_duration']:.2f}s")
+            col3.metric("P99 Duration", f"{window_stats['p99_duration']:.2f}s")
             
         else:
             st.info("NO EXECUTION DATA FOR ANALYTICS")
 
+if selected_wf:
+    # Timer-driven refresh runs in the browser's rerun schedule; no script
+    # thread waits between ticks
+    interval = st.session_state.refresh_interval if st.session_state.auto_refresh else None
+    st.fragment(run_every=interval)(render_workflow)(selected_wf)
 else:
     st.title("> SYSTEM_READY")
     st.info("AWAITING NODE SELECTION...")
@@ -613,10 +833,12 @@ if user_perms["role"] == "administrator":
         st.markdown("---")
         st.title("🔐 ADMINISTRATOR PANEL")
         
-        admin_tab1, admin_tab2, admin_tab3 = st.tabs([
+        admin_tab1, admin_tab2, admin_tab3, admin_tab4, admin_tab5 = st.tabs([
             "[ USER_MANAGEMENT ]",
             "[ AUDIT_LOGS ]",
-            "[ SYSTEM_STATUS ]"
+            "[ SYSTEM_STATUS ]",
+            "[ FLEET_HEALTH ]",
+            "[ ACTIVITY ]"
         ])
         
         with admin_tab1:
@@ -631,19 +853,25 @@ if user_perms["role"] == "administrator":
                     st.write("**Capabilities:**")
                     for cap, val in user['capabilities'].items():
                         st.write(f"  - {cap}: {'✓' if val else '✗'}")
+                    
+                    activity = AuditLogger.get_user_activity_summary(user['username'], days=7)
+                    st.write(f"**Actions (7d):** {activity['total_actions']} across {activity['workflows_accessed']} workflows")
         
         with admin_tab2:
             st.subheader("📋 AUDIT LOG VIEWER")
             
             # Log filters
-            log_user = st.selectbox("Filter by User", ["ALL"] + list(VALID_USERS.keys()))
+            log_user = st.selectbox("Filter by User", ["ALL"] + [u["username"] for u in get_all_users()])
             log_action = st.selectbox("Filter by Action", ["ALL", "login", "logout", "view_workflow", "execute_workflow", "activate_workflow", "deactivate_workflow"])
+            log_window = st.selectbox("Time Window", ["ALL", "24H", "7D", "30D"])
+            window_days = {"24H": 1, "7D": 7, "30D": 30}.get(log_window)
             
             # Get logs
             logs = AuditLogger.get_logs(
                 username=None if log_user == "ALL" else log_user,
                 limit=100,
-                action=None if log_action == "ALL" else log_action
+                action=None if log_action == "ALL" else log_action,
+                since=datetime.now() - timedelta(days=window_days) if window_days else None
             )
             
             if logs:
@@ -663,7 +891,8 @@ if user_perms["role"] == "administrator":
             if conn["connected"]:
                 st.success(f"✓ n8n API Connected")
                 st.write(f"**URL:** {conn['url']}")
-                st.write(f"**Workflow Count:** {conn.get('workflow_count', 0)}")
+                st.write(f"**Workflow Count:** {conn.get('workflow_count', len(all_workflows))}")
+                st.write(f"**Latency:** {conn.get('latency_ms', 0):.0f} ms (checked {conn.get('checked_at', 'N/A')})")
             else:
                 st.error(f"✗ n8n API Disconnected")
                 st.write(f"**URL:** {conn['url']}")
@@ -676,11 +905,137 @@ if user_perms["role"] == "administrator":
             col1.metric("Total Workflows", len(all_workflows))
             col2.metric("Total Users", len(all_users))
             col3.metric("Active Workflows", len([w for w in all_workflows if w.get('active')]))
+            
+            # Audit writer throughput and backpressure
+            writer_stats = get_audit_writer_stats()
+            if writer_stats:
+                a1, a2, a3, a4 = st.columns(4)
+                a1.metric("Audit Queue Depth", writer_stats['queue_depth'])
+                a2.metric("Audit Entries Written", writer_stats['written'])
+                a3.metric("Avg Batch Size", f"{writer_stats['avg_batch_size']:.1f}")
+                a4.metric("Blocked / Write Errors", f"{writer_stats['blocked_writes']} / {writer_stats['write_errors']}")
+            
+            # Heartbeat latency history
+            latency_history = get_latency_history()
+            if latency_history:
+                latency_df = pd.DataFrame(latency_history)
+                latency_df['timestamp'] = pd.to_datetime(latency_df['timestamp'])
+                
+                fig_latency = px.line(
+                    latency_df,
+                    x='timestamp',
+                    y='latency_ms',
+                    title="API Latency (heartbeat)",
+                    labels={'timestamp': 'Time', 'latency_ms': 'Latency (ms)'}
+                )
+                
+                fig_latency.update_layout(
+                    plot_bgcolor='black',
+                    paper_bgcolor='black',
+                    font_color='#00FF41',
+                    xaxis=dict(gridcolor='#003300'),
+                    yaxis=dict(gridcolor='#003300')
+                )
+                
+                st.plotly_chart(fig_latency, use_container_width=True)
 
-# Auto-refresh logic
-if st.session_state.auto_refresh:
-    time.sleep(30)
-    st.rerun()
+        with admin_tab4:
+            st.subheader("🛰️ FLEET HEALTH")
+            st.caption(
+                f"Execution statistics for up to {FLEET_MAX_WORKFLOWS} workflows, "
+                f"fetched {FLEET_CONCURRENCY} at a time within {FLEET_DEADLINE_SECONDS}s"
+            )
+            
+            if st.button("📡 SCAN_FLEET", use_container_width=True):
+                fleet_workflows = all_workflows[:FLEET_MAX_WORKFLOWS]
+                scan_started = time.perf_counter()
+                fleet_stats = get_statistics_bulk(
+                    [wf['id'] for wf in fleet_workflows],
+                    concurrency=FLEET_CONCURRENCY,
+                    deadline=FLEET_DEADLINE_SECONDS
+                )
+                
+                st.session_state.fleet_health = {
+                    "rows": [
+                        {
+                            "workflow": wf['name'],
+                            "id": wf['id'],
+                            "active": bool(wf.get('active')),
+                            "total": fleet_stats[wf['id']]['total'],
+                            "success_rate": round(fleet_stats[wf['id']]['success_rate'], 1),
+                            "errors": fleet_stats[wf['id']]['error'],
+                            "avg_duration_s": round(fleet_stats[wf['id']]['avg_duration'], 2),
+                            "fetch_error": fleet_stats[wf['id']]['fetch_error'],
+                        }
+                        for wf in fleet_workflows
+                    ],
+                    "elapsed": time.perf_counter() - scan_started,
+                    "scanned_at": datetime.now().strftime('%H:%M:%S')
+                }
+            
+            fleet_health = st.session_state.get("fleet_health")
+            if fleet_health:
+                fleet_df = pd.DataFrame(fleet_health["rows"])
+                failed = int(fleet_df['fetch_error'].notna().sum())
+                
+                f1, f2, f3 = st.columns(3)
+                f1.metric("Workflows Scanned", len(fleet_df))
+                f2.metric("Fetch Failures", failed)
+                f3.metric("Scan Time", f"{fleet_health['elapsed']:.1f}s")
+                
+                st.caption(f"Last scan: {fleet_health['scanned_at']}")
+                st.dataframe(
+                    fleet_df.sort_values(['errors', 'success_rate'], ascending=[False, True]),
+                    use_container_width=True,
+                    hide_index=True
+                )
+            else:
+                st.info("NO FLEET SCAN YET")
+            
+            st.subheader(f"⏱️ LATENCY SLO ({SLO_WINDOW_HOURS}H)")
+            fleet_slo = get_fleet_latency_slo(window_hours=SLO_WINDOW_HOURS)
+            if fleet_slo:
+                workflow_names = {str(wf['id']): wf['name'] for wf in all_workflows}
+                slo_df = pd.DataFrame([
+                    {
+                        "workflow": workflow_names.get(row['workflow_id'], row['workflow_id']),
+                        "id": row['workflow_id'],
+                        "executions": row['total'],
+                        "p50_s": row['p50_duration'],
+                        "p95_s": row['p95_duration'],
+                        "p99_s": row['p99_duration'],
+                        "threshold_s": row['latency_threshold'],
+                        "good_pct": round(row['good_fraction'] * 100, 2),
+                        "target_pct": row['target'] * 100,
+                        **{f"burn_{h}h": row['burn_rates'][h] for h in sorted(row['burn_rates'])},
+                    }
+                    for row in fleet_slo
+                ])
+                st.dataframe(slo_df.round(2), use_container_width=True, hide_index=True)
+            else:
+                st.info(f"NO FINISHED EXECUTIONS IN THE LAST {SLO_WINDOW_HOURS}H")
+
+        with admin_tab5:
+            st.subheader("📊 FLEET ACTIVITY")
+            
+            activity_window = st.selectbox("Window", [1, 7, 30, 90], index=1, format_func=lambda d: f"{d}D")
+            leaderboard = AuditLogger.get_activity_leaderboard(days=activity_window, limit=10)
+            
+            col_users, col_actions = st.columns(2)
+            
+            with col_users:
+                st.write("**TOP USERS**")
+                if leaderboard["top_users"]:
+                    st.dataframe(pd.DataFrame(leaderboard["top_users"]), use_container_width=True, hide_index=True)
+                else:
+                    st.info("NO ACTIVITY RECORDED")
+            
+            with col_actions:
+                st.write("**TOP ACTIONS**")
+                if leaderboard["top_actions"]:
+                    st.dataframe(pd.DataFrame(leaderboard["top_actions"]), use_container_width=True, hide_index=True)
+                else:
+                    st.info("NO ACTIVITY RECORDED")
 
 # --- FOOTER ---
 st.sidebar.markdown("---")
@@ -0,0 +1,1218 @@
+from collections import deque
+from datetime import datetime
+from itertools import islice
+from typing import List, Dict, Optional, Iterator, Callable
+import contextlib
+import gzip
+import json
+import os
+import queue
+import re
+import sqlite3
+import threading
+import time
+import uuid
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process locking
+    fcntl = None
+
+# Storage backends for the audit log. Both expose the same interface:
+#
+#   append(entries)       -- persist entries in order
+#   query(...)            -- most recent matching entries, newest first
+#   delete_before(cutoff) -- drop entries older than cutoff
+#
+# JSONLAuditStore keeps the original one-JSON-object-per-line file, rotated
+# into compressed archive segments.
+# SQLiteAuditStore keeps entries in an indexed table so "last N matching"
+# queries cost time proportional to N rather than to the size of the log.
+# ActivitySummaryStore keeps per-user, per-day counters next to either one.
+
+# One-off jobs on a SQLite database (the JSONL import and the activity
+# counter backfill) keep their state in its metadata table as a JSON object:
+# the owning process's lease, how far it got and its parameters. The owner
+# renews the lease with every batch it commits; a job whose lease has not
+# been renewed for JOB_LEASE_SECONDS (its process crashed or was killed) is
+# taken over by the next process that opens the database. A finished job's
+# value is a plain summary string.
+JOB_LEASE_SECONDS = 60
+
+# Metadata keys of the JSONL import job and the activity counter backfill
+JSONL_IMPORT_JOB = "jsonl_migrated"
+BACKFILL_JOB = "backfilled"
+
+def _matches(log: Dict, username: str = None, action: str = None,
+             workflow_id: str = None) -> bool:
+    """Check a log entry against the query filters."""
+    if username and log.get('username') != username:
+        return False
+    if action and log.get('action') != action:
+        return False
+    if workflow_id and log.get('workflow_id') != workflow_id:
+        return False
+    return True
+
+def read_lines_reverse(f, block_size: int = 65536):
+    """Yield the lines of a binary file from last to first.
+    
+    The file is read backwards in fixed-size blocks, so memory use does not
+    depend on the file size and reading stops as soon as the caller does.
+    Empty lines are skipped. A final line without a trailing newline (for
+    example one still being written) is yielded as-is; callers that parse
+    lines are expected to skip it if it is malformed.
+    
+    Args:
+        f: File object opened in binary mode
+        block_size: Bytes read per seek
+    
+    Yields:
+        Lines as bytes, without the newline
+    """
+    f.seek(0, os.SEEK_END)
+    position = f.tell()
+    remainder = b""
+    
+    while position > 0:
+        read_size = min(block_size, position)
+        position -= read_size
+        f.seek(position)
+        lines = (f.read(read_size) + remainder).split(b"\n")
+        
+        # The first piece may be the tail of a line that starts in an
+        # earlier block, so hold it back until that block is read
+        remainder = lines[0]
+        for line in reversed(lines[1:]):
+            if line:
+                yield line
+    
+    if remainder:
+        yield remainder
+
+# Archive segments are named <log path>.<first>_<last>.<entry count>.gz, with
+# the first and last entry timestamps in this format. A name that is already
+# taken gets a "-<n>" suffix after the count instead of replacing the segment.
+_SEGMENT_TIME_FORMAT = "%Y%m%dT%H%M%S%f"
+
+def _segment_stamp(timestamp: str) -> str:
+    return datetime.fromisoformat(timestamp).strftime(_SEGMENT_TIME_FORMAT)
+
+class JSONLAuditStore:
+    """Audit log stored as one JSON object per line.
+    
+    The active file at ``path`` is rotated into a gzip-compressed archive
+    segment once it reaches ``max_bytes`` or its first entry is older than
+    ``max_age`` seconds. Segment names record the time range and number of
+    entries they hold, so queries skip segments outside their time filter
+    and retention deletes whole segments without opening them.
+    """
+    
+    def __init__(self, path: str, fsync: bool = False, max_bytes: int = 0,
+                 max_age: int = 0):
+        self.path = path
+        self.fsync = fsync
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self._active_started = None
+        self._rotate_lock = threading.Lock()
+        self._append_lock = threading.Lock()
+        self._segment_pattern = re.compile(
+            re.escape(os.path.basename(path))
+            + r"\.(\d{8}T\d{12})_(\d{8}T\d{12})\.(\d+)(?:-(\d+))?\.gz$"
+        )
+    
+    def append(self, entries: List[Dict]) -> None:
+        """Append entries to the log file with a single write."""
+        if not entries:
+            return
+        try:
+            self._maybe_rotate()
+        except Exception as e:
+            # The entries still go to the active file; rotation is retried next time
+            print(f"Error rotating audit log {self.path}: {e}")
+        
+        data = ''.join(json.dumps(entry) + '\n' for entry in entries)
+        with self._write_lock(exclusive=False):
+            with open(self.path, 'a') as f:
+                f.write(data)
+                if self.fsync:
+                    f.flush()
+                    os.fsync(f.fileno())
+        
+        if self._active_started is None:
+            self._active_started = entries[0].get("timestamp")
+    
+    def _read_first_timestamp(self) -> Optional[str]:
+        try:
+            with open(self.path, 'rb') as f:
+                return json.loads(f.readline()).get("timestamp")
+        except (OSError, ValueError, AttributeError):
+            return None
+    
+    def _read_last_timestamp(self) -> Optional[str]:
+        try:
+            with open(self.path, 'rb') as f:
+                for line in read_lines_reverse(f):
+                    try:
+                        return json.loads(line).get("timestamp")
+                    except (ValueError, AttributeError):
+                        continue
+        except OSError:
+            pass
+        return None
+    
+    def _rotation_due(self) -> bool:
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            self._active_started = None
+            return False
+        if size == 0:
+            return False
+        
+        if self.max_bytes and size >= self.max_bytes:
+            return True
+        if self.max_age:
+            if self._active_started is None:
+                self._active_started = self._read_first_timestamp()
+            try:
+                started = datetime.fromisoformat(self._active_started)
+                return (datetime.now() - started).total_seconds() >= self.max_age
+            except (TypeError, ValueError):
+                return False
+        return False
+    
+    @contextlib.contextmanager
+    def _write_lock(self, exclusive: bool):
+        """Shared for appends, exclusive for moving the active file away."""
+        with self._append_lock:
+            if fcntl is None:
+                yield
+                return
+            with open(f"{self.path}.write.lock", "w") as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+    
+    @contextlib.contextmanager
+    def _rotation_lock(self, blocking: bool = True):
+        """Serialize rotations across threads and, with fcntl, processes.
+        
+        Yields:
+            False if ``blocking`` is False and another rotation holds the lock
+        """
+        if not self._rotate_lock.acquire(blocking):
+            yield False
+            return
+        try:
+            if fcntl is None:
+                yield True
+                return
+            with open(f"{self.path}.rotate.lock", "w") as lock_file:
+                try:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    yield False
+                    return
+                try:
+                    yield True
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+        finally:
+            self._rotate_lock.release()
+    
+    def _maybe_rotate(self) -> None:
+        """Rotate the active file if it is over the size or age limit.
+        
+        Never waits for a rotation already running elsewhere: that one
+        moves the file out of the way, and appends go to a fresh file.
+        """
+        if not self._rotation_due():
+            return
+        with self._rotation_lock(blocking=False) as locked:
+            # Another thread or process may have rotated in the meantime, so
+            # the cached start time may belong to a file that is gone
+            self._active_started = None
+            if locked and self._rotation_due():
+                self._rotate()
+    
+    def rotate(self) -> Optional[str]:
+        """Move the active file into a compressed archive segment.
+        
+        The active file is renamed first, so entries appended meanwhile go
+        to a fresh file and nothing is lost or rewritten in place.
+        Rotations are serialized across threads and processes.
+        
+        Returns:
+            Path of the new segment, or None if there was nothing to rotate
+        """
+        with self._rotation_lock():
+            return self._rotate()
+    
+    def _rotate(self) -> Optional[str]:
+        rotating = f"{self.path}.rotating"
+        
+        # Finish a rotation interrupted by a crash before starting a new one
+        if os.path.exists(rotating):
+            self._compress_segment(rotating)
+        
+        # Wait for writes in progress, which would otherwise land in the
+        # renamed file after it has been compressed
+        with self._write_lock(exclusive=True):
+            try:
+                os.replace(self.path, rotating)
+            except FileNotFoundError:
+                return None
+        self._active_started = None
+        return self._compress_segment(rotating)
+    
+    def _compress_segment(self, source: str) -> Optional[str]:
+        first = last = None
+        count = 0
+        temp_path = f"{source}.{os.getpid()}.gz.tmp"
+        
+        try:
+            src = open(source, 'rb')
+        except FileNotFoundError:
+            # Already compressed by another rotation
+            return None
+        with src, gzip.open(temp_path, 'wb') as dst:
+            for line in src:
+                dst.write(line if line.endswith(b"\n") else line + b"\n")
+                try:
+                    timestamp = json.loads(line)["timestamp"]
+                    _segment_stamp(timestamp)
+                except (ValueError, KeyError, TypeError):
+                    continue
+                first = first or timestamp
+                last = timestamp
+                count += 1
+        
+        if count == 0:
+            os.remove(temp_path)
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(source)
+            return None
+        
+        stem = f"{self.path}.{_segment_stamp(first)}_{_segment_stamp(last)}.{count}"
+        segment, suffix = f"{stem}.gz", 0
+        while True:
+            try:
+                # Unlike a rename, linking fails if the name is taken
+                os.link(temp_path, segment)
+                break
+            except FileExistsError:
+                if self._same_entries(segment, source):
+                    # Archived before a crash kept the source from being removed
+                    break
+                suffix += 1
+                segment = f"{stem}-{suffix}.gz"
+        os.remove(temp_path)
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(source)
+        return segment
+    
+    @staticmethod
+    def _same_entries(segment: str, source: str) -> bool:
+        """Check whether an archive segment holds exactly the lines of ``source``."""
+        try:
+            with gzip.open(segment, 'rb') as archived, open(source, 'rb') as src:
+                for line in src:
+                    if archived.readline() != (line if line.endswith(b"\n") else line + b"\n"):
+                        return False
+                return archived.readline() == b""
+        except (OSError, EOFError):
+            return False
+    
+    def segments(self) -> List[Dict]:
+        """List archive segments, newest first.
+        
+        Returns:
+            List of dictionaries with path, start, end and count
+        """
+        directory = os.path.dirname(self.path) or "."
+        segments = []
+        try:
+            names = os.listdir(directory)
+        except OSError:
+            return segments
+        
+        suffixes = {}
+        for name in names:
+            match = self._segment_pattern.match(name)
+            if match:
+                path = os.path.join(directory, name)
+                segments.append({
+                    "path": path,
+                    "start": datetime.strptime(match.group(1), _SEGMENT_TIME_FORMAT),
+                    "end": datetime.strptime(match.group(2), _SEGMENT_TIME_FORMAT),
+                    "count": int(match.group(3)),
+                })
+                suffixes[path] = int(match.group(4) or 0)
+        
+        # Of segments ending at the same time, a suffixed one was archived later
+        segments.sort(key=lambda segment: (segment["end"], suffixes[segment["path"]]), reverse=True)
+        return segments
+    
+    def query(self, username: str = None, action: str = None,
+              workflow_id: str = None, since: datetime = None,
+              limit: int = 100) -> List[Dict]:
+        """Return the most recent matching entries, newest first.
+        
+        The active file is read backwards from the end and reading stops
+        once ``limit`` matches are found. Archive segments are only opened
+        if more matches are needed, and never when they end before
+        ``since``.
+        """
+        logs = []
+        if limit <= 0:
+            return logs
+        since_text = since.isoformat() if since else None
+        
+        if os.path.exists(self.path):
+            with open(self.path, 'rb') as f:
+                for line in read_lines_reverse(f):
+                    try:
+                        log = json.loads(line)
+                    except (json.JSONDecodeError, UnicodeDecodeError):
+                        continue
+                    if not isinstance(log, dict):
+                        continue
+                    if since_text and str(log.get('timestamp', '')) < since_text:
+                        return logs
+                    if _matches(log, username, action, workflow_id):
+                        logs.append(log)
+                        if len(logs) >= limit:
+                            return logs
+        
+        for segment in self.segments():
+            if since is not None and segment["end"] < since:
+                break
+            
+            # gzip cannot be read backwards, so scan forward keeping only
+            # the newest matches still needed
+            needed = deque(maxlen=limit - len(logs))
+            with gzip.open(segment["path"], 'rb') as f:
+                for line in f:
+                    try:
+                        log = json.loads(line)
+                    except (json.JSONDecodeError, UnicodeDecodeError):
+                        continue
+                    if not isinstance(log, dict):
+                        continue
+                    if since_text and str(log.get('timestamp', '')) < since_text:
+                        continue
+                    if _matches(log, username, action, workflow_id):
+                        needed.append(log)
+            
+            logs.extend(reversed(needed))
+            if len(logs) >= limit:
+                break
+        
+        return logs
+    
+    def iter_all(self) -> Iterator[Dict]:
+        """Yield every entry, oldest first, across archives and the active file."""
+        sources = [segment["path"] for segment in reversed(self.segments())]
+        if os.path.exists(self.path):
+            sources.append(self.path)
+        
+        for source in sources:
+            opener = gzip.open if source.endswith(".gz") else open
+            with opener(source, 'rb') as f:
+                for line in f:
+                    try:
+                        log = json.loads(line)
+                    except (json.JSONDecodeError, UnicodeDecodeError):
+                        continue
+                    if isinstance(log, dict):
+                        yield log
+    
+    def delete_before(self, cutoff: datetime) -> int:
+        """Drop archive segments that end before cutoff.
+        
+        Retention works on whole segments: a segment is deleted once its
+        newest entry is older than cutoff. The active file is rotated first
+        if everything in it is older than cutoff.
+        
+        Returns:
+            Number of entries deleted
+        """
+        last = self._read_last_timestamp()
+        if last is not None and datetime.fromisoformat(last) <= cutoff:
+            self.rotate()
+        
+        deleted_count = 0
+        for segment in self.segments():
+            if segment["end"] <= cutoff:
+                try:
+                    os.remove(segment["path"])
+                except FileNotFoundError:
+                    # Deleted by another process sharing the log
+                    continue
+                deleted_count += segment["count"]
+        
+        return deleted_count
+
+class _SQLiteDatabase:
+    """Per-thread SQLite connections plus a small key/value metadata table."""
+    
+    _SCHEMA = ""
+    
+    def __init__(self, path: str, fsync: bool = False):
+        self.path = path
+        self.fsync = fsync
+        self._local = threading.local()
+        self._connect().executescript(self._SCHEMA + """
+            CREATE TABLE IF NOT EXISTS audit_meta (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            );
+        """)
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Return this thread's connection, opening it on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(f"PRAGMA synchronous={'FULL' if self.fsync else 'NORMAL'}")
+            self._local.conn = conn
+        return conn
+    
+    def get_meta(self, key: str) -> Optional[str]:
+        row = self._connect().execute(
+            "SELECT value FROM audit_meta WHERE key = ?", (key,)
+        ).fetchone()
+        return row[0] if row else None
+    
+    def set_meta(self, key: str, value: str) -> None:
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO audit_meta (key, value) VALUES (?, ?)", (key, value)
+            )
+    
+    @staticmethod
+    def _parse_job(value: str) -> Optional[Dict]:
+        """Job state stored under a key, or None if the job has finished."""
+        try:
+            job = json.loads(value)
+        except ValueError:
+            return None
+        return job if isinstance(job, dict) and "owner" in job else None
+    
+    def claim_job(self, key: str, params: Dict = None) -> Optional[Dict]:
+        """Start a one-off job, or take it over if its owner has stopped.
+        
+        Args:
+            key: Metadata key of the job
+            params: Parameters stored with a new job (a job that is taken
+                over keeps the parameters it was started with)
+        
+        Returns:
+            The job (owner, renewed, done, params) if this process should
+            run it, or None if it has finished or a live process owns it
+        """
+        now = time.time()
+        conn = self._connect()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute("SELECT value FROM audit_meta WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                job = {"done": 0, "params": params or {}}
+            else:
+                job = self._parse_job(row[0])
+                if job is None or now - job["renewed"] < JOB_LEASE_SECONDS:
+                    return None
+            job.update(owner=uuid.uuid4().hex, renewed=now)
+            conn.execute(
+                "INSERT OR REPLACE INTO audit_meta (key, value) VALUES (?, ?)", (key, json.dumps(job))
+            )
+        return job
+    
+    def _commit_owned(self, key: str, job: Dict, value: str,
+                      write: Callable[[sqlite3.Connection], None] = None) -> bool:
+        """Run ``write`` and store ``value`` under ``key`` in one transaction,
+        but only while ``job`` still owns the key."""
+        conn = self._connect()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute("SELECT value FROM audit_meta WHERE key = ?", (key,)).fetchone()
+            current = self._parse_job(row[0]) if row else None
+            if current is None or current["owner"] != job["owner"]:
+                return False
+            if write is not None:
+                write(conn)
+            conn.execute("UPDATE audit_meta SET value = ? WHERE key = ?", (value, key))
+        return True
+    
+    def advance_job(self, key: str, job: Dict, done: int,
+                    write: Callable[[sqlite3.Connection], None]) -> bool:
+        """Apply one batch of a job and record its progress atomically.
+        
+        Also renews the job's lease.
+        
+        Args:
+            key: Metadata key of the job
+            job: Job returned by claim_job()
+            done: Progress after this batch
+            write: Writes the batch, given the open transaction's connection
+        
+        Returns:
+            False, with nothing written, if another process has taken the
+            job over
+        """
+        advanced = dict(job, done=done, renewed=time.time())
+        if not self._commit_owned(key, job, json.dumps(advanced), write):
+            return False
+        job.update(advanced)
+        return True
+    
+    def finish_job(self, key: str, job: Dict, summary: str,
+                   write: Callable[[sqlite3.Connection], None] = None) -> bool:
+        """Mark a job finished, replacing its state with ``summary``.
+        
+        Returns:
+            False if another process has taken the job over
+        """
+        return self._commit_owned(key, job, summary, write)
+
+class SQLiteAuditStore(_SQLiteDatabase):
+    """Audit log stored in an indexed SQLite table.
+    
+    Rows are ordered by an autoincrement id, which follows insertion (and so
+    timestamp) order. Every filter column has an index that ends in id, so
+    SQLite can walk it backwards and stop after ``limit`` rows.
+    """
+    
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS audit_logs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            timestamp TEXT NOT NULL,
+            username TEXT,
+            action TEXT,
+            workflow_id TEXT,
+            workflow_name TEXT,
+            status TEXT,
+            details TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_audit_timestamp ON audit_logs (timestamp);
+        CREATE INDEX IF NOT EXISTS idx_audit_username ON audit_logs (username, id);
+        CREATE INDEX IF NOT EXISTS idx_audit_action ON audit_logs (action, id);
+        CREATE INDEX IF NOT EXISTS idx_audit_workflow ON audit_logs (workflow_id, id);
+    """
+    
+    _COLUMNS = ("timestamp", "username", "action", "workflow_id",
+                "workflow_name", "status", "details")
+    
+    @classmethod
+    def _to_row(cls, entry: Dict) -> tuple:
+        return (
+            entry.get("timestamp"),
+            entry.get("username"),
+            entry.get("action"),
+            entry.get("workflow_id"),
+            entry.get("workflow_name"),
+            entry.get("status"),
+            json.dumps(entry.get("details") or {}),
+        )
+    
+    @classmethod
+    def _from_row(cls, row: tuple) -> Dict:
+        log = dict(zip(cls._COLUMNS, row))
+        try:
+            log["details"] = json.loads(log["details"]) if log["details"] else {}
+        except json.JSONDecodeError:
+            log["details"] = {}
+        return log
+    
+    def append(self, entries: List[Dict]) -> None:
+        """Insert entries in a single transaction."""
+        conn = self._connect()
+        with conn:
+            self._insert(conn, entries)
+    
+    def _insert(self, conn: sqlite3.Connection, entries: List[Dict]) -> None:
+        conn.executemany(
+            "INSERT INTO audit_logs (timestamp, username, action, workflow_id, "
+            "workflow_name, status, details) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [self._to_row(entry) for entry in entries]
+        )
+    
+    def query(self, username: str = None, action: str = None,
+              workflow_id: str = None, since: datetime = None,
+              limit: int = 100) -> List[Dict]:
+        """Return the most recent matching entries, newest first."""
+        clauses, params = [], []
+        for column, value in (("username", username), ("action", action),
+                              ("workflow_id", workflow_id)):
+            if value:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if since is not None:
+            clauses.append("timestamp >= ?")
+            params.append(since.isoformat())
+        
+        sql = f"SELECT {', '.join(self._COLUMNS)} FROM audit_logs"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY id DESC LIMIT ?"
+        params.append(limit)
+        
+        return [self._from_row(row) for row in self._connect().execute(sql, params)]
+    
+    def delete_before(self, cutoff: datetime) -> int:
+        """Drop entries older than cutoff.
+        
+        Returns:
+            Number of entries deleted
+        """
+        conn = self._connect()
+        with conn:
+            cursor = conn.execute(
+                "DELETE FROM audit_logs WHERE timestamp <= ?", (cutoff.isoformat(),)
+            )
+        return cursor.rowcount
+    
+    def iter_all(self, batch_size: int = 10000) -> Iterator[Dict]:
+        """Yield every entry, oldest first."""
+        cursor = self._connect().execute(
+            f"SELECT {', '.join(self._COLUMNS)} FROM audit_logs ORDER BY id"
+        )
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                return
+            for row in rows:
+                yield self._from_row(row)
+
+def migrate_jsonl_to_sqlite(jsonl_path: str, store: SQLiteAuditStore,
+                            batch_size: int = 10000, job: Dict = None) -> int:
+    """Copy every entry of a JSONL audit log into a SQLite store.
+    
+    Archive segments and the active file are inserted in chronological
+    order, so ids keep that order. Malformed lines are skipped. The JSONL
+    files are left untouched.
+    
+    With ``job`` (the store's JSONL_IMPORT_JOB), every batch is committed
+    together with the number of entries imported so far, and an import
+    taken over from a process that died resumes after the entries that
+    process had committed. The import stops if the job is taken over.
+    
+    Args:
+        jsonl_path: Path of the existing JSONL audit log
+        store: Destination store
+        batch_size: Entries inserted per transaction
+        job: Import job from store.claim_job(JSONL_IMPORT_JOB)
+    
+    Returns:
+        Number of entries imported, including those of an earlier,
+        interrupted run that this one resumed
+    """
+    migrated = job["done"] if job is not None else 0
+    entries = islice(JSONLAuditStore(jsonl_path).iter_all(), migrated, None)
+    
+    def commit(batch: List[Dict]) -> bool:
+        if job is None:
+            store.append(batch)
+            return True
+        return store.advance_job(
+            JSONL_IMPORT_JOB, job, migrated + len(batch),
+            lambda conn: store._insert(conn, batch)
+        )
+    
+    batch = []
+    for log in entries:
+        batch.append(log)
+        if len(batch) >= batch_size:
+            if not commit(batch):
+                return migrated
+            migrated += len(batch)
+            batch = []
+    if batch and commit(batch):
+        migrated += len(batch)
+    
+    return migrated
+
+class ActivitySummaryStore(_SQLiteDatabase):
+    """Per-user, per-day activity counters kept next to the audit log.
+    
+    Counters are updated incrementally as entries are written, so a summary
+    for any window is a few indexed lookups instead of a log scan. Action
+    counts are kept per (day, user, action); distinct workflows are kept as
+    a compact per-(day, user) set of workflow IDs. Days are the date part of
+    the entry timestamp.
+    """
+    
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS activity_daily (
+            day TEXT NOT NULL,
+            username TEXT NOT NULL,
+            action TEXT NOT NULL,
+            count INTEGER NOT NULL,
+            PRIMARY KEY (day, username, action)
+        );
+        CREATE INDEX IF NOT EXISTS idx_activity_user ON activity_daily (username, day);
+        CREATE TABLE IF NOT EXISTS activity_workflows (
+            day TEXT NOT NULL,
+            username TEXT NOT NULL,
+            workflow_id TEXT NOT NULL,
+            PRIMARY KEY (day, username, workflow_id)
+        );
+        CREATE INDEX IF NOT EXISTS idx_activity_workflows_user ON activity_workflows (username, day);
+        CREATE TABLE IF NOT EXISTS activity_daily_backfill (
+            day TEXT NOT NULL,
+            username TEXT NOT NULL,
+            action TEXT NOT NULL,
+            count INTEGER NOT NULL,
+            PRIMARY KEY (day, username, action)
+        );
+        CREATE TABLE IF NOT EXISTS activity_workflows_backfill (
+            day TEXT NOT NULL,
+            username TEXT NOT NULL,
+            workflow_id TEXT NOT NULL,
+            PRIMARY KEY (day, username, workflow_id)
+        );
+    """
+    
+    def record(self, entries: List[Dict]) -> None:
+        """Add a batch of audit entries to the counters."""
+        conn = self._connect()
+        with conn:
+            self._record(conn, entries, "activity_daily", "activity_workflows")
+    
+    @staticmethod
+    def _record(conn: sqlite3.Connection, entries: List[Dict],
+                daily_table: str, workflows_table: str) -> None:
+        counts = {}
+        workflows = set()
+        for entry in entries:
+            day = str(entry.get("timestamp", ""))[:10]
+            username = entry.get("username") or "unknown"
+            key = (day, username, entry.get("action") or "unknown")
+            counts[key] = counts.get(key, 0) + 1
+            if entry.get("workflow_id"):
+                workflows.add((day, username, str(entry["workflow_id"])))
+        
+        conn.executemany(
+            f"INSERT INTO {daily_table} (day, username, action, count) VALUES (?, ?, ?, ?) "
+            f"ON CONFLICT (day, username, action) DO UPDATE SET count = count + excluded.count",
+            [key + (count,) for key, count in counts.items()]
+        )
+        conn.executemany(
+            f"INSERT OR IGNORE INTO {workflows_table} (day, username, workflow_id) VALUES (?, ?, ?)",
+            list(workflows)
+        )
+    
+    def backfill(self, entries: Iterator[Dict], before: str, batch_size: int = 10000,
+                 job: Dict = None) -> Optional[int]:
+        """Count existing log entries written before a timestamp.
+        
+        With ``job`` (the BACKFILL_JOB), entries are counted into staging
+        tables that are merged into the live counters in the same
+        transaction that marks the job finished, so the counters never hold
+        part of a backfill. A job taken over from a process that died starts
+        its backfill again.
+        
+        Args:
+            entries: Audit entries, e.g. from a store's iter_all()
+            before: Only entries with an earlier ISO timestamp are counted;
+                later ones are recorded as they are written
+            batch_size: Entries recorded per transaction
+            job: Backfill job from claim_job(BACKFILL_JOB)
+        
+        Returns:
+            Number of entries counted, or None if another process took the
+            job over
+        """
+        def commit(batch: List[Dict], counted: int) -> bool:
+            if job is None:
+                self.record(batch)
+                return True
+            return self.advance_job(
+                BACKFILL_JOB, job, counted,
+                lambda conn: self._record(conn, batch, "activity_daily_backfill", "activity_workflows_backfill")
+            )
+        
+        if job is not None and not self.advance_job(BACKFILL_JOB, job, 0, self._clear_staging):
+            return None
+        
+        counted = 0
+        batch = []
+        for entry in entries:
+            if str(entry.get("timestamp", "")) >= before:
+                continue
+            batch.append(entry)
+            if len(batch) >= batch_size:
+                if not commit(batch, counted + len(batch)):
+                    return None
+                counted += len(batch)
+                batch = []
+        if batch:
+            if not commit(batch, counted + len(batch)):
+                return None
+            counted += len(batch)
+        return counted
+    
+    def finish_backfill(self, job: Dict, summary: str) -> bool:
+        """Merge a finished backfill into the live counters and mark it done.
+        
+        Returns:
+            False if another process has taken the job over
+        """
+        def merge(conn: sqlite3.Connection) -> None:
+            conn.execute(
+                "INSERT INTO activity_daily (day, username, action, count) "
+                "SELECT day, username, action, count FROM activity_daily_backfill WHERE true "
+                "ON CONFLICT (day, username, action) DO UPDATE SET count = count + excluded.count"
+            )
+            conn.execute(
+                "INSERT OR IGNORE INTO activity_workflows (day, username, workflow_id) "
+                "SELECT day, username, workflow_id FROM activity_workflows_backfill"
+            )
+            self._clear_staging(conn)
+        
+        return self.finish_job(BACKFILL_JOB, job, summary, merge)
+    
+    @staticmethod
+    def _clear_staging(conn: sqlite3.Connection) -> None:
+        conn.execute("DELETE FROM activity_daily_backfill")
+        conn.execute("DELETE FROM activity_workflows_backfill")
+    
+    def user_summary(self, username: str, since_day: str) -> Dict:
+        """Action breakdown and distinct workflows for a user since a day.
+        
+        Returns:
+            Dictionary with total_actions, actions_breakdown and workflows_accessed
+        """
+        conn = self._connect()
+        actions = dict(conn.execute(
+            "SELECT action, SUM(count) FROM activity_daily "
+            "WHERE username = ? AND day >= ? GROUP BY action",
+            (username, since_day)
+        ).fetchall())
+        workflows = conn.execute(
+            "SELECT COUNT(DISTINCT workflow_id) FROM activity_workflows "
+            "WHERE username = ? AND day >= ?",
+            (username, since_day)
+        ).fetchone()[0]
+        
+        return {
+            "total_actions": sum(actions.values()),
+            "actions_breakdown": actions,
+            "workflows_accessed": workflows
+        }
+    
+    def top(self, column: str, since_day: str, limit: int = 10) -> List[tuple]:
+        """Most active users or most frequent actions since a day.
+        
+        Args:
+            column: "username" or "action"
+            since_day: First day included (YYYY-MM-DD)
+            limit: Number of rows to return
+        
+        Returns:
+            List of (value, count) tuples, highest count first
+        """
+        if column not in ("username", "action"):
+            raise ValueError(f"Cannot rank by {column}")
+        return self._connect().execute(
+            f"SELECT {column}, SUM(count) AS total FROM activity_daily "
+            f"WHERE day >= ? GROUP BY {column} ORDER BY total DESC LIMIT ?",
+            (since_day, limit)
+        ).fetchall()
+    
+    def delete_before(self, cutoff: datetime) -> None:
+        """Drop counters for days before the cutoff's day."""
+        day = cutoff.date().isoformat()
+        conn = self._connect()
+        with conn:
+            conn.execute("DELETE FROM activity_daily WHERE day < ?", (day,))
+            conn.execute("DELETE FROM activity_workflows WHERE day < ?", (day,))
+
+def open_activity_summary(path: str, store) -> ActivitySummaryStore:
+    """Open the activity summary at ``path``, building it from ``store`` if new.
+    
+    Args:
+        path: SQLite database for the counters
+        store: Audit store whose existing entries seed new counters
+    
+    Returns:
+        An ActivitySummaryStore
+    """
+    summary = ActivitySummaryStore(path)
+    # Running the backfill as a job keeps concurrent processes from counting
+    # the same entries twice, and restarts one whose process died part-way
+    job = summary.claim_job(BACKFILL_JOB, {"before": datetime.now().isoformat()})
+    if job is not None:
+        before = job["params"]["before"]
+        count = summary.backfill(store.iter_all(), before=before, job=job)
+        if count is not None:
+            summary.finish_backfill(job, f"{before} ({count} entries)")
+    return summary
+
+def open_audit_store(backend: str, jsonl_path: str, db_path: str, fsync: bool = False,
+                     rotate_bytes: int = 0, rotate_seconds: int = 0):
+    """Create the audit store for the configured backend.
+    
+    The first time the SQLite backend is opened, an existing JSONL log at
+    ``jsonl_path`` is imported into it. An import interrupted by a crash is
+    resumed by the next process that opens the store.
+    
+    Args:
+        backend: "jsonl" or "sqlite"
+        jsonl_path: Path of the JSONL audit log
+        db_path: Path of the SQLite database
+        fsync: Force every write to disk before it is acknowledged
+        rotate_bytes: Rotate the JSONL file at this size (0 disables)
+        rotate_seconds: Rotate the JSONL file at this age (0 disables)
+    
+    Returns:
+        A JSONLAuditStore or SQLiteAuditStore
+    """
+    if backend == "sqlite":
+        store = SQLiteAuditStore(db_path, fsync=fsync)
+        # Running the import as a job keeps concurrent processes from
+        # importing the same file twice, and resumes an import whose
+        # process died part-way
+        job = store.claim_job(JSONL_IMPORT_JOB)
+        if job is not None:
+            count = migrate_jsonl_to_sqlite(jsonl_path, store, job=job)
+            store.finish_job(JSONL_IMPORT_JOB, job, f"{datetime.now().isoformat()} ({count} entries)")
+        return store
+    return JSONLAuditStore(
+        jsonl_path, fsync=fsync, max_bytes=rotate_bytes, max_age=rotate_seconds
+    )
+
+class _FlushRequest:
+    """Queue marker that is signalled once everything before it is written.
+    
+    ``failed`` is set if an entry queued before it could not be committed by
+    the time it was signalled.
+    """
+    __slots__ = ("done", "failed")
+    
+    def __init__(self):
+        self.done = threading.Event()
+        self.failed = False
+
+_STOP = object()
+
+class AuditWriter:
+    """Background writer that group-commits audit entries to a store.
+    
+    Callers enqueue entries and return immediately. A single writer thread
+    drains the queue in FIFO order and hands batches to ``store.append``,
+    committing when ``batch_size`` entries are waiting or ``flush_interval``
+    seconds after the first entry of a batch arrived, then passes the batch
+    to ``on_commit`` if one is given. A batch that fails to commit is kept
+    and retried with exponential backoff (``retry_delay`` doubling up to
+    ``max_retry_delay``) before anything newer is taken from the queue.
+    When the queue is full, ``write`` blocks for up to ``put_timeout``
+    seconds (backpressure) and then writes the entry synchronously, so
+    entries are never dropped.
+    """
+    
+    def __init__(self, store, batch_size: int = 200, flush_interval: float = 0.5,
+                 queue_size: int = 10000, put_timeout: float = 5.0,
+                 on_commit: Callable[[List[Dict]], None] = None,
+                 retry_delay: float = 0.1, max_retry_delay: float = 5.0):
+        self.store = store
+        self.on_commit = on_commit
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.put_timeout = put_timeout
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self._queue = queue.Queue(maxsize=queue_size)
+        # Held while checking _closed and enqueueing, so nothing can be
+        # queued behind the stop marker
+        self._lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._closed = False
+        self._stats = {
+            "enqueued": 0,
+            "written": 0,
+            "batches": 0,
+            "blocked_writes": 0,
+            "sync_writes": 0,
+            "write_errors": 0,
+            "unwritten": 0,
+            "max_queue_depth": 0,
+            "last_batch_size": 0,
+            "last_commit_ms": 0.0,
+        }
+        self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+        self._thread.start()
+    
+    def write(self, entry: Dict) -> None:
+        """Queue an entry for writing.
+        
+        Blocks while the queue is full. If it is still full after
+        ``put_timeout`` seconds, or the writer has been closed, the entry is
+        written synchronously in the calling thread instead.
+        
+        Raises:
+            Whatever ``store.append`` raises if a synchronous write fails
+        """
+        with self._lock:
+            if not self._closed:
+                try:
+                    self._queue.put_nowait(entry)
+                    queued = True
+                except queue.Full:
+                    with self._stats_lock:
+                        self._stats["blocked_writes"] += 1
+                    try:
+                        self._queue.put(entry, timeout=self.put_timeout)
+                        queued = True
+                    except queue.Full:
+                        queued = False
+                
+                if queued:
+                    with self._stats_lock:
+                        self._stats["enqueued"] += 1
+                        self._stats["max_queue_depth"] = max(self._stats["max_queue_depth"], self._queue.qsize())
+                    return
+            closed = self._closed
+        
+        if closed:
+            # Let the writer drain first so late entries stay in order
+            self._thread.join(self.put_timeout)
+        self.store.append([entry])
+        with self._stats_lock:
+            self._stats["sync_writes"] += 1
+        if self.on_commit is not None:
+            self.on_commit([entry])
+    
+    def flush(self, timeout: float = None) -> bool:
+        """Block until every entry queued so far has been written.
+        
+        Returns:
+            True if the flush completed within the timeout and every entry
+            before it was committed
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        request = _FlushRequest()
+        with self._lock:
+            if self._closed or not self._thread.is_alive():
+                with self._stats_lock:
+                    return self._stats["unwritten"] == 0
+            try:
+                self._queue.put(request, timeout=timeout)
+            except queue.Full:
+                return False
+        
+        remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+        return request.done.wait(remaining) and not request.failed
+    
+    def close(self, timeout: float = 10.0) -> None:
+        """Write everything still queued and stop the writer thread."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            try:
+                self._queue.put(_STOP, timeout=timeout)
+            except queue.Full:
+                print(f"Error closing audit writer: {self._queue.qsize()} entries still queued")
+                return
+        self._thread.join(timeout)
+    
+    def stats(self) -> Dict:
+        """Return throughput and backpressure counters."""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats["queue_depth"] = self._queue.qsize()
+        stats["avg_batch_size"] = stats["written"] / stats["batches"] if stats["batches"] else 0
+        return stats
+    
+    def _run(self) -> None:
+        stop = False
+        batch, flushes = [], []
+        delay = self.retry_delay
+        while True:
+            if batch:
+                # The last commit failed. Newer entries stay queued behind
+                # the batch, so write() applies backpressure until it is in
+                time.sleep(delay)
+                delay = min(delay * 2, self.max_retry_delay)
+            else:
+                stop = self._collect(batch, flushes)
+            
+            if batch and not self._commit(batch):
+                # Flushes waiting on the batch learn of the failure now
+                # rather than at their timeout
+                for request in flushes:
+                    request.failed = True
+                    request.done.set()
+                flushes = []
+                if not stop or delay < self.max_retry_delay:
+                    continue
+                print(f"Error closing audit writer: {len(batch)} entries could not be written")
+                with self._stats_lock:
+                    self._stats["unwritten"] += len(batch)
+                return
+            
+            batch = []
+            delay = self.retry_delay
+            for request in flushes:
+                request.done.set()
+            flushes = []
+            if stop:
+                return
+    
+    def _collect(self, batch: List[Dict], flushes: List[_FlushRequest]) -> bool:
+        """Fill ``batch`` from the queue.
+        
+        The batch is cut short at a flush or stop marker so that everything
+        queued before the marker is committed now.
+        
+        Returns:
+            True if the stop marker was read
+        """
+        item = self._queue.get()
+        deadline = time.monotonic() + self.flush_interval
+        while True:
+            if item is _STOP:
+                return True
+            if isinstance(item, _FlushRequest):
+                flushes.append(item)
+                return False
+            batch.append(item)
+            if len(batch) >= self.batch_size:
+                return False
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                return False
+    
+    def _commit(self, batch: List[Dict]) -> bool:
+        started = time.perf_counter()
+        try:
+            self.store.append(batch)
+        except Exception as e:
+            print(f"Error writing audit log batch of {len(batch)}: {e}")
+            with self._stats_lock:
+                self._stats["write_errors"] += 1
+            return False
+        
+        with self._stats_lock:
+            self._stats["written"] += len(batch)
+            self._stats["batches"] += 1
+            self._stats["last_batch_size"] = len(batch)
+            self._stats["last_commit_ms"] = (time.perf_counter() - started) * 1000
+        
+        if self.on_commit is not None:
+            try:
+                self.on_commit(batch)
+            except Exception as e:
+                print(f"Error in audit commit hook: {e}")
+        return True
@@ -0,0 +1,166 @@
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+# access_control reads its paths at import time
+_tmp = tempfile.TemporaryDirectory(prefix="access_bench_")
+os.environ.update({
+    "ACL_STORE_PATH": os.path.join(_tmp.name, "acl_policy.json"),
+    "AUDIT_LOG_PATH": os.path.join(_tmp.name, "audit.jsonl"),
+    "AUDIT_DB_PATH": os.path.join(_tmp.name, "audit.db"),
+})
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from access_control import (
+    filter_workflows_by_access, get_workflow_index, get_policy_store,
+    can_execute_workflow, can_toggle_workflow
+)
+from tag_catalog import get_tag_catalog
+
+# Access filtering benchmark: the original list-based ACL vs the compiled ACL
+# and per-snapshot inverted tag index.
+#
+# Builds a policy with --users users, each allowed 1-5 of --tags tags, and a
+# snapshot of --workflows workflows carrying 1-3 tags each. Times
+# filter_workflows_by_access() for every user against the original
+# implementation (reproduced below) and checks that both return the same
+# workflows, then times execute/toggle checks for one user.
+#
+#   python benchmarks/bench_access_filter.py --workflows 50000 --users 1000
+
+def build_policy(users: int, tags: int, seed: int = 0) -> dict:
+    """Create ``users`` users with random tag grants in the policy store.
+    
+    Returns:
+        {username: tags} as the original USER_TAG_ACCESS map would hold it
+    """
+    rng = random.Random(seed)
+    grants = {
+        f"user{i}": rng.sample([f"tag{t}" for t in range(tags)], rng.randint(1, 5))
+        for i in range(users)
+    }
+    
+    def apply(policy):
+        for username, user_tags in grants.items():
+            policy[username] = {"role": "user", "tags": user_tags, "password_hash": None}
+    
+    get_policy_store().update(apply)
+    return grants
+
+def build_workflows(count: int, tags: int, seed: int = 1) -> list:
+    rng = random.Random(seed)
+    return [
+        {
+            "id": str(i),
+            "name": f"Workflow {i}",
+            "active": True,
+            "tags": rng.sample([f"tag{t}" for t in range(tags)], rng.randint(1, 3)),
+            "nodes": [],
+        }
+        for i in range(count)
+    ]
+
+# --- ORIGINAL IMPLEMENTATION (baseline) ---
+
+def baseline_filter(grants: dict, username: str, workflows: list) -> list:
+    user_tags = grants.get(username, [])
+    return [
+        wf for wf in workflows
+        if any(tag in user_tags for tag in wf.get("tags", []))
+    ]
+
+def baseline_permissions(grants: dict, username: str) -> dict:
+    role = "user" if username in grants else "guest"
+    tags = grants.get(username, [])
+    return {
+        "role": role,
+        "capabilities": {
+            "can_view": len(tags) > 0,
+            "can_execute": role in ["administrator", "user"],
+            "can_toggle": role == "administrator",
+            "can_delete": role == "administrator",
+            "can_view_all": role == "administrator",
+            "can_view_audit_logs": role == "administrator",
+        },
+    }
+
+def baseline_can(grants: dict, username: str, capability: str, workflow_tags: list) -> bool:
+    user_tags = grants.get(username, [])
+    return (
+        baseline_permissions(grants, username)["capabilities"][capability]
+        and any(tag in user_tags for tag in workflow_tags)
+    )
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark compiled ACL filtering against the original list scan.")
+    parser.add_argument("--workflows", type=int, default=50000, help="Workflows in the snapshot")
+    parser.add_argument("--users", type=int, default=1000, help="Users in the policy")
+    parser.add_argument("--tags", type=int, default=300, help="Distinct tags")
+    parser.add_argument("--checks", type=int, default=2000, help="Workflows checked for execute/toggle")
+    args = parser.parse_args()
+    
+    grants = build_policy(args.users, args.tags)
+    workflows = build_workflows(args.workflows, args.tags)
+    usernames = list(grants)
+    
+    started = time.perf_counter()
+    for username in usernames:
+        baseline = baseline_filter(grants, username, workflows)
+    baseline_ms = (time.perf_counter() - started) * 1000 / len(usernames)
+    
+    started = time.perf_counter()
+    get_tag_catalog().update(workflows)
+    get_workflow_index(workflows)
+    build_ms = (time.perf_counter() - started) * 1000
+    
+    mismatches = 0
+    started = time.perf_counter()
+    for username in usernames:
+        compiled = filter_workflows_by_access(username, workflows)
+    first_ms = (time.perf_counter() - started) * 1000 / len(usernames)
+    
+    started = time.perf_counter()
+    for username in usernames:
+        filter_workflows_by_access(username, workflows)
+    memo_ms = (time.perf_counter() - started) * 1000 / len(usernames)
+    
+    for username in usernames:
+        baseline = baseline_filter(grants, username, workflows)
+        compiled = filter_workflows_by_access(username, workflows)
+        if [wf["id"] for wf in baseline] != [wf["id"] for wf in compiled]:
+            mismatches += 1
+    
+    checked = workflows[:args.checks]
+    username = usernames[0]
+    started = time.perf_counter()
+    expected = [
+        (baseline_can(grants, username, "can_execute", wf["tags"]),
+         baseline_can(grants, username, "can_toggle", wf["tags"]))
+        for wf in checked
+    ]
+    baseline_checks_ms = (time.perf_counter() - started) * 1000
+    started = time.perf_counter()
+    actual = [
+        (can_execute_workflow(username, wf["tags"]), can_toggle_workflow(username, wf["tags"]))
+        for wf in checked
+    ]
+    compiled_checks_ms = (time.perf_counter() - started) * 1000
+    mismatches += expected != actual
+    
+    print(f"{args.workflows:,} workflows, {args.users:,} users, {args.tags} tags\n")
+    print(f"filter per user, original         {baseline_ms:>9.3f} ms")
+    print(f"index build (once per snapshot)   {build_ms:>9.3f} ms")
+    print(f"filter per user, compiled         {first_ms:>9.3f} ms")
+    print(f"filter per user, memoized         {memo_ms:>9.3f} ms")
+    print(f"{args.checks:,} execute/toggle checks, original {baseline_checks_ms:>9.3f} ms")
+    print(f"{args.checks:,} execute/toggle checks, compiled {compiled_checks_ms:>9.3f} ms")
+    if mismatches:
+        print(f"\n{mismatches} MISMATCHES")
+    return 1 if mismatches else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
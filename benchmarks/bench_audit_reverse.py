@@ -0,0 +1,110 @@
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from audit_store import JSONLAuditStore
+from bench_audit_store import write_log
+
+# Reverse tail read vs full scan for JSONL audit log queries.
+#
+# Writes a synthetic multi-GB JSONL audit log and answers "last N matching"
+# queries twice: with JSONLAuditStore.query(), which reads the file backwards
+# in blocks and stops after N matches, and with the original get_logs() full
+# scan, which parses every line, keeps every match, reverses and slices.
+# Both must return the same entries. Peak memory is traced for the reverse
+# reader; for the full scan the number of entries it held is reported.
+#
+#   python benchmarks/bench_audit_reverse.py --gigabytes 2
+#
+# The unfiltered full scan holds the whole log in memory (several times the
+# file size), so it only runs with --full-scan-unfiltered. The last query
+# matches nothing and so makes the reverse reader read the whole file too.
+
+QUERIES = [
+    {},
+    {"username": "user7"},
+    {"username": "user3", "action": "execute_workflow"},
+    {"action": "delete_workflow"},
+]
+
+def full_scan(path: str, limit: int, username: str = None, action: str = None):
+    """The original AuditLogger.get_logs() (baseline)."""
+    logs = []
+    with open(path, 'r') as f:
+        for line in f:
+            try:
+                log = json.loads(line.strip())
+                if username and log.get('username') != username:
+                    continue
+                if action and log.get('action') != action:
+                    continue
+                logs.append(log)
+            except json.JSONDecodeError:
+                continue
+    held = len(logs)
+    logs.reverse()
+    return logs[:limit], held
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark reverse tail reads against a full scan of a JSONL audit log.")
+    parser.add_argument("--gigabytes", type=float, default=2.0, help="Size of the generated log")
+    parser.add_argument("--limit", type=int, default=100, help="Entries returned per query")
+    parser.add_argument("--full-scan-unfiltered", action="store_true",
+                        help="Also run the unfiltered full scan (needs memory for the whole log)")
+    parser.add_argument("--dir", help="Working directory (default: a temporary directory, removed afterwards)")
+    args = parser.parse_args()
+    
+    workdir = args.dir or tempfile.mkdtemp(prefix="audit_reverse_bench_")
+    path = os.path.join(workdir, "audit.jsonl")
+    
+    try:
+        # Size the log from a sample of the generator's output
+        write_log(path, 10000)
+        entries = int(args.gigabytes * 1e9 / (os.path.getsize(path) / 10000))
+        started = time.perf_counter()
+        write_log(path, entries)
+        print(f"generate   {entries:,} entries, {os.path.getsize(path) / 1e9:.2f} GB, "
+              f"{time.perf_counter() - started:.0f} s")
+        store = JSONLAuditStore(path)
+        
+        failures = 0
+        print(f"\n{'filter':<40} {'reverse ms':>11} {'peak MB':>8} {'full scan s':>12} {'held':>11}")
+        for filters in QUERIES:
+            label = ", ".join(f"{k}={v}" for k, v in filters.items()) or "(none)"
+            
+            started = time.perf_counter()
+            reverse = store.query(limit=args.limit, **filters)
+            reverse_ms = (time.perf_counter() - started) * 1000
+            
+            # Traced separately, since tracing slows the reader down
+            tracemalloc.start()
+            store.query(limit=args.limit, **filters)
+            peak_mb = tracemalloc.get_traced_memory()[1] / 1e6
+            tracemalloc.stop()
+            
+            if not filters and not args.full_scan_unfiltered:
+                print(f"{label:<40} {reverse_ms:>11.1f} {peak_mb:>8.2f} {'skipped':>12} {entries:>11,}")
+                continue
+            
+            started = time.perf_counter()
+            scanned, held = full_scan(path, args.limit, **filters)
+            scan_s = time.perf_counter() - started
+            
+            ok = reverse == scanned
+            failures += 0 if ok else 1
+            print(f"{label:<40} {reverse_ms:>11.1f} {peak_mb:>8.2f} {scan_s:>12.1f} {held:>11,}"
+                  + ("" if ok else "  MISMATCH"))
+        return 1 if failures else 0
+    finally:
+        if not args.dir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+if __name__ == "__main__":
+    sys.exit(main())
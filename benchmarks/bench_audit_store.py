@@ -0,0 +1,105 @@
+import argparse
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from audit_store import JSONLAuditStore, open_audit_store
+
+# Audit log query benchmark: JSONL scan vs indexed SQLite.
+#
+# Writes a synthetic JSONL audit log, migrates it into the SQLite backend the
+# way open_audit_store() does on first use, then times "last N matching"
+# queries on both backends and checks that they return the same entries.
+#
+#   python benchmarks/bench_audit_store.py --entries 10000000
+#
+# Workflow IDs are spread over 500 workflows and users over 50; the combined
+# user+action filter is the sparsest (1 in 250 entries), so from 25,000
+# entries up every query fills the default limit.
+
+USERS = [f"user{i}" for i in range(50)]
+ACTIONS = ["login", "logout", "view_workflow", "execute_workflow", "activate_workflow"]
+QUERIES = [
+    {},
+    {"username": "user7"},
+    {"workflow_id": "42"},
+    {"username": "user3", "action": "execute_workflow"},
+]
+
+def write_log(path: str, entries: int, seed: int = 0) -> None:
+    """Write ``entries`` synthetic audit entries, one second apart, oldest first."""
+    rng = random.Random(seed)
+    start = datetime(2025, 1, 1)
+    with open(path, "w") as f:
+        for i in range(entries):
+            f.write(json.dumps({
+                "timestamp": (start + timedelta(seconds=i)).isoformat(),
+                "username": rng.choice(USERS),
+                "action": rng.choice(ACTIONS),
+                "workflow_id": str(i % 500),
+                "workflow_name": f"Workflow {i % 500}",
+                "status": "success",
+                "details": {},
+            }) + "\n")
+
+def timed(func, repeat: int):
+    """Run ``func`` ``repeat`` times; return (last result, best time in ms)."""
+    best, result = None, None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        elapsed = (time.perf_counter() - started) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return result, best
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark audit log queries on the JSONL and SQLite backends.")
+    parser.add_argument("--entries", type=int, default=10_000_000, help="Audit entries to generate")
+    parser.add_argument("--limit", type=int, default=100, help="Entries returned per query")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per query (best is reported)")
+    parser.add_argument("--dir", help="Working directory (default: a temporary directory, removed afterwards)")
+    args = parser.parse_args()
+    
+    workdir = args.dir or tempfile.mkdtemp(prefix="audit_bench_")
+    jsonl_path = os.path.join(workdir, "audit.jsonl")
+    db_path = os.path.join(workdir, "audit.db")
+    for path in (jsonl_path, db_path, db_path + "-wal", db_path + "-shm"):
+        if os.path.exists(path):
+            os.remove(path)
+    
+    try:
+        started = time.perf_counter()
+        write_log(jsonl_path, args.entries)
+        print(f"generate   {args.entries:,} entries, {os.path.getsize(jsonl_path) / 1e6:,.0f} MB, "
+              f"{time.perf_counter() - started:.1f} s")
+        
+        started = time.perf_counter()
+        sqlite_store = open_audit_store("sqlite", jsonl_path, db_path)
+        print(f"migrate    {os.path.getsize(db_path) / 1e6:,.0f} MB, {time.perf_counter() - started:.1f} s")
+        jsonl_store = JSONLAuditStore(jsonl_path)
+        
+        failures = 0
+        print(f"\n{'filter':<45} {'sqlite ms':>10} {'jsonl ms':>10}  rows")
+        for filters in QUERIES:
+            from_sqlite, sqlite_ms = timed(lambda: sqlite_store.query(limit=args.limit, **filters), args.repeat)
+            from_jsonl, jsonl_ms = timed(lambda: jsonl_store.query(limit=args.limit, **filters), args.repeat)
+            
+            ok = [e["timestamp"] for e in from_sqlite] == [e["timestamp"] for e in from_jsonl]
+            failures += 0 if ok else 1
+            label = ", ".join(f"{k}={v}" for k, v in filters.items()) or "(none)"
+            print(f"{label:<45} {sqlite_ms:>10.2f} {jsonl_ms:>10.2f}  {len(from_sqlite)}"
+                  + ("" if ok else "  MISMATCH"))
+        return 1 if failures else 0
+    finally:
+        if not args.dir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,98 @@
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+# access_control reads its paths at import time
+_tmp = tempfile.TemporaryDirectory(prefix="authz_bench_")
+os.environ.update({
+    "ACL_STORE_PATH": os.path.join(_tmp.name, "acl_policy.json"),
+    "AUDIT_LOG_PATH": os.path.join(_tmp.name, "audit.jsonl"),
+    "AUDIT_DB_PATH": os.path.join(_tmp.name, "audit.db"),
+})
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from access_control import (
+    authorize_many, filter_workflows_by_access, get_workflow_index,
+    has_workflow_access, can_execute_workflow, can_toggle_workflow
+)
+
+# Bulk authorization benchmark: execute and toggle decisions for a list of
+# workflows with per-workflow calls vs one authorize_many() call.
+#
+# Uses the default demo users (kelly, a tag-scoped user, and admin). The
+# bulk call is timed on a plain list and on the snapshot behind the current
+# WorkflowIndex, and for the single open workflow as the workflow page does.
+# Every matrix cell is checked against the per-workflow helpers.
+#
+#   python benchmarks/bench_authorize_many.py --workflows 2000
+
+TAGS = ["Kelly", "Sales", "Finance", "DevOps", "Marketing", "Support", "Ops", "Legal"]
+USERS = ["kelly", "admin"]
+
+def build_workflows(count: int, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    return [
+        {"id": str(i), "name": f"Workflow {i}", "active": True,
+         "tags": rng.sample(TAGS, rng.randint(0, 2))}
+        for i in range(count)
+    ]
+
+def timed(func, repeat: int) -> float:
+    """Best of ``repeat`` runs, in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark authorize_many against per-workflow permission checks.")
+    parser.add_argument("--workflows", type=int, default=2000, help="Workflows to decide for")
+    parser.add_argument("--repeat", type=int, default=20, help="Runs per measurement (best is reported)")
+    args = parser.parse_args()
+    
+    workflows = build_workflows(args.workflows)
+    get_workflow_index(workflows)
+    copy = list(workflows)
+    mismatches = 0
+    
+    print(f"{args.workflows:,} workflows, execute + toggle\n")
+    print(f"{'user':<8} {'per-call ms':>12} {'bulk ms':>10} {'indexed ms':>11} {'open wf ms':>11}")
+    for username in USERS:
+        def per_call():
+            return [
+                (can_execute_workflow(username, wf["tags"]), can_toggle_workflow(username, wf["tags"]))
+                for wf in workflows
+            ]
+        
+        per_call_ms = timed(per_call, args.repeat)
+        bulk_ms = timed(lambda: authorize_many(username, copy, ["execute", "toggle"]), args.repeat)
+        indexed_ms = timed(lambda: authorize_many(username, workflows, ["execute", "toggle"]), args.repeat)
+        single_ms = timed(lambda: authorize_many(username, workflows[:1], ["execute", "toggle"]), args.repeat)
+        print(f"{username:<8} {per_call_ms:>12.3f} {bulk_ms:>10.3f} {indexed_ms:>11.3f} {single_ms:>11.4f}")
+        
+        for matrix in (authorize_many(username, copy), authorize_many(username, workflows)):
+            expected = [
+                {"view": has_workflow_access(username, wf["tags"]),
+                 "execute": can_execute_workflow(username, wf["tags"]),
+                 "toggle": can_toggle_workflow(username, wf["tags"])}
+                for wf in workflows
+            ]
+            mismatches += sum(matrix.row(i) != row for i, row in enumerate(expected))
+    
+    # The page's non-admin list is a fresh copy, so it never hits the index
+    visible = filter_workflows_by_access("kelly", workflows)
+    print(f"\nkelly's visible list ({len(visible):,} workflows): "
+          f"bulk {timed(lambda: authorize_many('kelly', visible, ['execute', 'toggle']), args.repeat):.3f} ms")
+    
+    if mismatches:
+        print(f"\n{mismatches} MISMATCHES")
+    return 1 if mismatches else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+import argparse
+import os
+import statistics
+import sys
+import time
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from n8n_client import N8NClient, ENDPOINT_TIMEOUTS
+from stub_n8n import StubN8N, make_workflows, make_executions
+
+# Per-rerun latency of the n8n transport: one requests.get per call vs the
+# pooled keep-alive N8NClient.
+#
+# A "rerun" replays the six GETs one app.py rerun made before any caching:
+# the connection test, the workflow list, the tag scan's workflow list, the
+# statistics fetch and the two execution fetches for the selected workflow.
+# The response cache is not involved; every call reaches the stub server,
+# which counts new TCP connections.
+#
+#   python benchmarks/bench_client_pool.py --reruns 200 --latency-ms 0
+
+RERUN_CALLS = [
+    ("/workflows", "health", {"limit": 1}),
+    ("/workflows", "workflows", {"limit": 250}),
+    ("/workflows", "workflows", {"limit": 250}),
+    ("/executions", "executions", {"workflowId": "1", "limit": 100}),
+    ("/executions", "executions", {"workflowId": "1", "limit": 50}),
+    ("/executions", "executions", {"workflowId": "1", "limit": 100}),
+]
+
+def rerun_per_call(base_url: str) -> None:
+    """The original transport: a fresh requests.get (new connection) per call."""
+    headers = {"X-N8N-API-KEY": "bench", "Content-Type": "application/json"}
+    for path, endpoint, params in RERUN_CALLS:
+        response = requests.get(
+            f"{base_url}{path}", headers=headers, params=params,
+            timeout=ENDPOINT_TIMEOUTS[endpoint]
+        )
+        response.raise_for_status()
+        response.json()
+
+def rerun_pooled(client: N8NClient) -> None:
+    for path, endpoint, params in RERUN_CALLS:
+        response = client.get(path, endpoint=endpoint, params=params)
+        response.raise_for_status()
+        response.json()
+
+def measure(stub: StubN8N, rerun, reruns: int) -> dict:
+    rerun()  # warm up (and open the pooled connection)
+    stub.reset_counts()
+    times = []
+    for _ in range(reruns):
+        started = time.perf_counter()
+        rerun()
+        times.append((time.perf_counter() - started) * 1000)
+    return {
+        "mean": statistics.mean(times),
+        "p95": sorted(times)[int(len(times) * 0.95) - 1],
+        "connections": stub.connections / reruns,
+        "requests": stub.requests / reruns,
+    }
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark per-call requests.get against the pooled n8n client.")
+    parser.add_argument("--reruns", type=int, default=200, help="Simulated app.py reruns per transport")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Server-side delay per request")
+    parser.add_argument("--workflows", type=int, default=50, help="Workflows served by the stub")
+    args = parser.parse_args()
+    
+    workflows = make_workflows(args.workflows)
+    executions = make_executions(1000, args.workflows)
+    
+    with StubN8N(workflows, executions, latency_ms=args.latency_ms) as stub:
+        client = N8NClient(base_url=stub.url, api_key="bench")
+        results = {
+            "requests.get per call": measure(stub, lambda: rerun_per_call(stub.url), args.reruns),
+            "pooled N8NClient": measure(stub, lambda: rerun_pooled(client), args.reruns),
+        }
+        client.close()
+    
+    print(f"{len(RERUN_CALLS)} GETs per rerun, {args.reruns} reruns, "
+          f"{args.latency_ms:g} ms server latency\n")
+    print(f"{'transport':<24} {'mean ms':>9} {'p95 ms':>9} {'conns/rerun':>12} {'reqs/rerun':>11}")
+    for name, result in results.items():
+        print(f"{name:<24} {result['mean']:>9.2f} {result['p95']:>9.2f} "
+              f"{result['connections']:>12.2f} {result['requests']:>11.2f}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
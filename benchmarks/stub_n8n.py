@@ -0,0 +1,120 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+# Local stand-in for the n8n public API, shared by the client benchmarks.
+#
+# Serves cursor-paged /workflows and /executions (filtered by workflowId and
+# status like n8n does) over HTTP/1.1 keep-alive, with an optional fixed delay
+# per request to model network latency. The server counts requests and new
+# TCP connections so benchmarks can report connection reuse.
+
+class StubN8N:
+    """Stub n8n server on a local port, running on a background thread."""
+    
+    def __init__(self, workflows, executions, latency_ms: float = 0.0):
+        self.workflows = workflows
+        self.executions = executions
+        self.latency = latency_ms / 1000
+        self.requests = 0
+        self.connections = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self._server.server_port}/api/v1"
+    
+    def __enter__(self):
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+    
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+    
+    def reset_counts(self) -> None:
+        with self._lock:
+            self.requests = self.connections = 0
+    
+    def _handler(self):
+        stub = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body go out in separate writes; without TCP_NODELAY
+            # (which Node, and so n8n, sets) delayed ACKs stall each response
+            disable_nagle_algorithm = True
+            
+            def log_message(self, *args):
+                pass
+            
+            def setup(self):
+                super().setup()
+                with stub._lock:
+                    stub.connections += 1
+            
+            def _send(self, code, body):
+                data = json.dumps(body).encode()
+                self.send_response(code)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+            
+            def do_GET(self):
+                with stub._lock:
+                    stub.requests += 1
+                if stub.latency:
+                    time.sleep(stub.latency)
+                
+                url = urlparse(self.path)
+                query = {key: values[0] for key, values in parse_qs(url.query).items()}
+                limit, cursor = int(query.get("limit", 100)), int(query.get("cursor", 0))
+                if url.path.endswith("/workflows"):
+                    rows = stub.workflows
+                elif url.path.endswith("/executions"):
+                    rows = [
+                        exe for exe in stub.executions
+                        if query.get("workflowId", exe["workflowId"]) == exe["workflowId"]
+                        and query.get("status", exe["status"]) == exe["status"]
+                    ]
+                else:
+                    return self._send(404, {"message": "not found"})
+                
+                more = cursor + limit < len(rows)
+                self._send(200, {
+                    "data": rows[cursor:cursor + limit],
+                    "nextCursor": str(cursor + limit) if more else None,
+                })
+        
+        return Handler
+
+def make_workflows(count: int, tags_per_workflow: int = 2, tag_count: int = 20):
+    """Synthetic workflows with a few tags each."""
+    return [
+        {
+            "id": str(i),
+            "name": f"Workflow {i}",
+            "active": i % 3 != 0,
+            "tags": [f"tag{(i + k) % tag_count}" for k in range(tags_per_workflow)],
+            "nodes": [],
+        }
+        for i in range(1, count + 1)
+    ]
+
+def make_executions(count: int, workflow_count: int):
+    """Synthetic executions, newest first, spread round-robin over workflows."""
+    now = time.time()
+    executions = []
+    for i in range(count):
+        started = now - 60 * i
+        executions.append({
+            "id": str(count - i),
+            "workflowId": str(i % workflow_count + 1),
+            "status": ("success", "success", "error", "waiting")[i % 4],
+            "mode": "trigger",
+            "startedAt": time.strftime("%Y-%m-%dT%H:%M:%S.000Z", time.gmtime(started)),
+            "finishedAt": time.strftime("%Y-%m-%dT%H:%M:%S.000Z", time.gmtime(started + 2)),
+        })
+    return executions
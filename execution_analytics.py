@@ -0,0 +1,159 @@
+from datetime import datetime, timedelta, timezone
+from typing import List, Dict
+import numpy as np
+import pandas as pd
+
+# Vectorized execution analytics.
+#
+# Executions are converted once into typed columns (UTC datetime64 start and
+# finish times, categorical status, float duration in seconds), and every
+# statistic the dashboard shows is computed from those columns. Timestamps
+# without a timezone are taken to be local time, as in window().
+
+# Duration percentiles reported by summary()
+PERCENTILES = (50, 95, 99)
+
+STATUS_CATEGORIES = ["success", "error", "waiting", "running", "new", "canceled", "crashed", "unknown"]
+_STATUS_SET = frozenset(STATUS_CATEGORIES)
+
+def _to_utc(values: List) -> pd.Series:
+    """Parse ISO timestamps into a UTC datetime64 column (invalid values become NaT)."""
+    # n8n sends "...Z" UTC strings, which numpy parses much faster than pandas
+    if values and all(isinstance(v, str) and v.endswith("Z") for v in values):
+        try:
+            parsed = np.array([v[:-1] for v in values], dtype="datetime64[ns]")
+            return pd.Series(parsed).dt.tz_localize("UTC")
+        except ValueError:
+            pass
+    return pd.to_datetime(
+        pd.Series([_localize(v) for v in values], dtype=object), utc=True, errors="coerce"
+    )
+
+def _localize(value):
+    """Parse an ISO string and attach the local timezone if it has none (None if invalid)."""
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except ValueError:
+            return None
+    if isinstance(value, datetime) and value.tzinfo is None:
+        value = value.astimezone()
+    return value
+
+class ExecutionFrame:
+    """Executions held as typed columns, built once and queried many times."""
+    
+    def __init__(self, executions: List[Dict] = None, frame: pd.DataFrame = None):
+        """Build the columns from execution dictionaries.
+        
+        Args:
+            executions: Execution dictionaries as returned by the n8n API
+            frame: Already-built columns (used internally by window())
+        """
+        if frame is not None:
+            self.df = frame
+            return
+        
+        executions = executions or []
+        started = _to_utc([e.get('startedAt') for e in executions])
+        finished = _to_utc([e.get('finishedAt') for e in executions])
+        status = pd.Categorical(
+            [e.get('status') if e.get('status') in _STATUS_SET else "unknown" for e in executions],
+            categories=STATUS_CATEGORIES
+        )
+        
+        self.df = pd.DataFrame({
+            "id": [e.get('id') for e in executions],
+            "workflow_id": [e.get('workflowId') for e in executions],
+            "status": status,
+            "started": started,
+            "finished": finished,
+            "duration": (finished - started).dt.total_seconds().astype("float64"),
+        })
+    
+    def __len__(self) -> int:
+        return len(self.df)
+    
+    def window(self, since: datetime = None, until: datetime = None) -> "ExecutionFrame":
+        """Executions started in [since, until).
+        
+        Args:
+            since: Start of the window (naive values are local time)
+            until: End of the window (naive values are local time)
+        """
+        mask = np.ones(len(self.df), dtype=bool)
+        if since is not None:
+            mask &= (self.df["started"] >= pd.Timestamp(_aware(since))).to_numpy()
+        if until is not None:
+            mask &= (self.df["started"] < pd.Timestamp(_aware(until))).to_numpy()
+        return ExecutionFrame(frame=self.df[mask])
+    
+    def last_days(self, days: int) -> "ExecutionFrame":
+        """Executions started in the last ``days`` days."""
+        return self.window(since=datetime.now(timezone.utc) - timedelta(days=days))
+    
+    def status_counts(self) -> Dict[str, int]:
+        """Number of executions per status, most frequent first (zero counts omitted)."""
+        counts = self.df["status"].value_counts()
+        return {str(status): int(count) for status, count in counts.items() if count > 0}
+    
+    def duration_percentiles(self, percentiles=PERCENTILES) -> Dict[int, float]:
+        """Duration percentiles in seconds over executions with a known duration."""
+        durations = self.df["duration"].to_numpy()
+        durations = durations[~np.isnan(durations)]
+        if len(durations) == 0:
+            return {p: 0.0 for p in percentiles}
+        values = np.percentile(durations, percentiles)
+        return {p: float(v) for p, v in zip(percentiles, values)}
+    
+    def summary(self) -> Dict:
+        """Counts, success rate and duration statistics.
+        
+        Returns:
+            Dictionary with total, success, error, waiting, success_rate,
+            avg_duration and p50/p95/p99_duration (seconds)
+        """
+        total = len(self.df)
+        counts = self.df["status"].value_counts()
+        success = int(counts.get("success", 0))
+        durations = self.df["duration"]
+        avg_duration = float(durations.mean()) if durations.notna().any() else 0
+        
+        summary = {
+            "total": total,
+            "success": success,
+            "error": int(counts.get("error", 0)),
+            "waiting": int(counts.get("waiting", 0)),
+            "success_rate": (success / total * 100) if total > 0 else 0,
+            "avg_duration": avg_duration,
+        }
+        for p, value in self.duration_percentiles().items():
+            summary[f"p{p}_duration"] = value
+        return summary
+    
+    def daily_counts(self, tz=None) -> pd.DataFrame:
+        """Executions per calendar day and status.
+        
+        Args:
+            tz: Timezone that defines day boundaries (local time if None)
+        
+        Returns:
+            DataFrame with date (midnight, as a naive datetime), status and
+            count columns, only non-zero rows
+        """
+        if tz is None:
+            tz = datetime.now().astimezone().tzinfo
+        df = self.df.dropna(subset=["started"])
+        if df.empty:
+            return pd.DataFrame({"date": [], "status": [], "count": []})
+        dates = df["started"].dt.tz_convert(tz).dt.tz_localize(None).dt.normalize()
+        counts = (
+            df.assign(date=dates)
+            .groupby(["date", "status"], observed=True)
+            .size()
+            .reset_index(name="count")
+        )
+        return counts[counts["count"] > 0]
+
+def _aware(value: datetime) -> datetime:
+    return value if value.tzinfo is not None else value.astimezone()
@@ -0,0 +1,376 @@
+from datetime import datetime, timedelta, timezone
+from typing import List, Dict, Optional, Iterable
+import json
+import sqlite3
+import threading
+import time
+from latency_sketch import DDSketch
+
+# Local SQLite copy of n8n executions.
+#
+# Rows are upserted by execution ID, so re-syncing an execution (for example
+# one that was still running) replaces it. The numeric part of the ID is kept
+# as ``seq`` and is the sync high-water mark: n8n assigns IDs in increasing
+# order, so anything newer than the highest stored ``seq`` is new.
+#
+# ``checked_at`` records when a row was last written or re-fetched, so that
+# in-flight executions are re-checked least recently checked first and every
+# one of them is reached in turn.
+
+# Statuses of executions that have not finished yet and need re-syncing
+IN_FLIGHT_STATUSES = ("new", "running", "waiting")
+
+# Finished statuses counted as failures in the duration sketches
+FAILED_STATUSES = ("error", "crashed")
+
+# SQLite limits the number of bound parameters per statement
+_ID_CHUNK = 500
+
+def _utc_key(value) -> Optional[str]:
+    """Normalize a timestamp to a sortable UTC ISO string."""
+    if not value:
+        return None
+    try:
+        if isinstance(value, str):
+            value = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        if value.tzinfo is None:
+            value = value.astimezone()
+        return value.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%f")
+    except (TypeError, ValueError):
+        return None
+
+def _duration(exe: Dict) -> Optional[float]:
+    try:
+        start = datetime.fromisoformat(exe['startedAt'].replace('Z', '+00:00'))
+        finish = datetime.fromisoformat(exe['finishedAt'].replace('Z', '+00:00'))
+        return (finish - start).total_seconds()
+    except (KeyError, AttributeError, TypeError, ValueError):
+        return None
+
+def hour_key(value) -> Optional[str]:
+    """UTC hour bucket ("YYYY-MM-DDTHH") for a timestamp."""
+    key = _utc_key(value)
+    return key[:13] if key else None
+
+def execution_seq(execution_id) -> Optional[int]:
+    try:
+        return int(execution_id)
+    except (TypeError, ValueError):
+        return None
+
+class ExecutionStore:
+    """Executions stored in an indexed SQLite table, newest first by ``seq``.
+    
+    Alongside the rows, each workflow gets one duration sketch per UTC hour
+    (by start time). An execution is added to its sketch once, when it is
+    first stored in a finished state; successful runs contribute their
+    duration, failed runs are only counted.
+    """
+    
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS executions (
+            id TEXT PRIMARY KEY,
+            seq INTEGER,
+            workflow_id TEXT,
+            status TEXT,
+            started_at TEXT,
+            body TEXT NOT NULL,
+            checked_at REAL
+        );
+        CREATE INDEX IF NOT EXISTS idx_exec_seq ON executions (seq);
+        CREATE INDEX IF NOT EXISTS idx_exec_workflow ON executions (workflow_id, seq);
+        CREATE INDEX IF NOT EXISTS idx_exec_status ON executions (status);
+        CREATE INDEX IF NOT EXISTS idx_exec_started ON executions (started_at);
+        CREATE INDEX IF NOT EXISTS idx_exec_checked ON executions (status, checked_at);
+        CREATE TABLE IF NOT EXISTS duration_sketches (
+            workflow_id TEXT NOT NULL,
+            hour TEXT NOT NULL,
+            total INTEGER NOT NULL,
+            errors INTEGER NOT NULL,
+            sketch TEXT NOT NULL,
+            PRIMARY KEY (workflow_id, hour)
+        );
+        CREATE INDEX IF NOT EXISTS idx_sketch_hour ON duration_sketches (hour);
+        CREATE TABLE IF NOT EXISTS sync_meta (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        );
+    """
+    
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        self._connect().executescript(self._SCHEMA)
+        if self.get_meta("sketches_built") is None:
+            self.rebuild_sketches()
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Return this thread's connection, opening it on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+    
+    def get_meta(self, key: str) -> Optional[str]:
+        row = self._connect().execute(
+            "SELECT value FROM sync_meta WHERE key = ?", (key,)
+        ).fetchone()
+        return row[0] if row else None
+    
+    def set_meta(self, key: str, value: str) -> None:
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO sync_meta (key, value) VALUES (?, ?)", (key, value)
+            )
+    
+    def upsert(self, executions: Iterable[Dict]) -> int:
+        """Insert or replace executions and update the duration sketches.
+        
+        Returns:
+            Number of executions written
+        """
+        executions = [exe for exe in executions if exe.get('id') is not None]
+        now = time.time()
+        rows = [
+            (
+                str(exe.get('id')),
+                execution_seq(exe.get('id')),
+                str(exe.get('workflowId')) if exe.get('workflowId') is not None else None,
+                exe.get('status'),
+                _utc_key(exe.get('startedAt')),
+                json.dumps(exe),
+                now,
+            )
+            for exe in executions
+        ]
+        if not rows:
+            return 0
+        conn = self._connect()
+        with conn:
+            # Only executions finishing for the first time go into the sketches
+            previous = self._statuses(conn, [row[0] for row in rows])
+            finished = [
+                exe for exe in executions
+                if exe.get('status') not in IN_FLIGHT_STATUSES
+                and (str(exe['id']) not in previous or previous[str(exe['id'])] in IN_FLIGHT_STATUSES)
+            ]
+            conn.executemany(
+                "INSERT OR REPLACE INTO executions "
+                "(id, seq, workflow_id, status, started_at, body, checked_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            self._add_to_sketches(conn, finished)
+        return len(rows)
+    
+    def _statuses(self, conn: sqlite3.Connection, ids: List[str]) -> Dict[str, str]:
+        statuses = {}
+        for i in range(0, len(ids), _ID_CHUNK):
+            chunk = ids[i:i + _ID_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            statuses.update(conn.execute(
+                f"SELECT id, status FROM executions WHERE id IN ({placeholders})", chunk
+            ).fetchall())
+        return statuses
+    
+    def _add_to_sketches(self, conn: sqlite3.Connection, executions: List[Dict]) -> None:
+        """Fold finished executions into their hourly sketches (inside a transaction)."""
+        buckets = {}
+        for exe in executions:
+            hour = hour_key(exe.get('startedAt'))
+            if hour is None or exe.get('workflowId') is None:
+                continue
+            bucket = buckets.setdefault((str(exe['workflowId']), hour), [0, 0, DDSketch()])
+            bucket[0] += 1
+            if exe.get('status') in FAILED_STATUSES:
+                bucket[1] += 1
+            elif exe.get('status') == "success":
+                bucket[2].add(_duration(exe))
+        
+        for (workflow_id, hour), (total, errors, sketch) in buckets.items():
+            row = conn.execute(
+                "SELECT total, errors, sketch FROM duration_sketches "
+                "WHERE workflow_id = ? AND hour = ?", (workflow_id, hour)
+            ).fetchone()
+            if row is not None:
+                total += row[0]
+                errors += row[1]
+                sketch.merge(DDSketch.from_dict(json.loads(row[2])))
+            conn.execute(
+                "INSERT OR REPLACE INTO duration_sketches "
+                "(workflow_id, hour, total, errors, sketch) VALUES (?, ?, ?, ?, ?)",
+                (workflow_id, hour, total, errors, json.dumps(sketch.to_dict()))
+            )
+    
+    def rebuild_sketches(self, batch_size: int = 10000) -> None:
+        """Recompute all duration sketches from the stored executions."""
+        conn = self._connect()
+        with conn:
+            conn.execute("DELETE FROM duration_sketches")
+            cursor = self._connect().execute(
+                "SELECT body FROM executions WHERE status NOT IN (?, ?, ?)", IN_FLIGHT_STATUSES
+            )
+            while True:
+                batch = cursor.fetchmany(batch_size)
+                if not batch:
+                    break
+                self._add_to_sketches(conn, [json.loads(row[0]) for row in batch])
+            conn.execute(
+                "INSERT OR REPLACE INTO sync_meta (key, value) VALUES ('sketches_built', ?)",
+                (datetime.now().isoformat(),)
+            )
+    
+    def load_sketches(self, windows_hours: Iterable[int], workflow_id: str = None,
+                      now: datetime = None) -> Dict[str, Dict[int, Dict]]:
+        """Merge hourly sketches over several trailing windows in one query.
+        
+        A window of N hours covers the current (partial) UTC hour and the
+        N - 1 hours before it.
+        
+        Args:
+            windows_hours: Window lengths in hours
+            workflow_id: Only this workflow (all workflows if None)
+            now: End of the windows (defaults to the current time)
+        
+        Returns:
+            {workflow_id: {hours: {"total", "errors", "sketch"}}}
+        """
+        windows_hours = sorted(set(windows_hours))
+        now = now or datetime.now(timezone.utc)
+        starts = {
+            hours: hour_key(now - timedelta(hours=hours - 1)) for hours in windows_hours
+        }
+        
+        sql = "SELECT workflow_id, hour, total, errors, sketch FROM duration_sketches WHERE hour >= ?"
+        params = [starts[windows_hours[-1]]]
+        if workflow_id is not None:
+            sql += " AND workflow_id = ?"
+            params.append(str(workflow_id))
+        
+        result = {}
+        for wf_id, hour, total, errors, data in self._connect().execute(sql, params):
+            sketch = DDSketch.from_dict(json.loads(data))
+            windows = result.setdefault(wf_id, {
+                hours: {"total": 0, "errors": 0, "sketch": DDSketch()} for hours in windows_hours
+            })
+            for hours in windows_hours:
+                if hour >= starts[hours]:
+                    window = windows[hours]
+                    window["total"] += total
+                    window["errors"] += errors
+                    window["sketch"].merge(sketch)
+        return result
+    
+    def delete_sketches_before(self, cutoff: datetime) -> int:
+        """Delete hourly sketches for hours before ``cutoff``."""
+        conn = self._connect()
+        with conn:
+            cursor = conn.execute(
+                "DELETE FROM duration_sketches WHERE hour < ?", (hour_key(cutoff),)
+            )
+        return cursor.rowcount
+    
+    def delete(self, execution_ids: Iterable[str]) -> int:
+        conn = self._connect()
+        with conn:
+            cursor = conn.executemany(
+                "DELETE FROM executions WHERE id = ?", [(str(i),) for i in execution_ids]
+            )
+        return cursor.rowcount
+    
+    def high_water(self) -> Optional[int]:
+        """Highest execution ``seq`` stored (None if the store is empty)."""
+        return self._connect().execute("SELECT MAX(seq) FROM executions").fetchone()[0]
+    
+    def known_ids(self, execution_ids: Iterable[str]) -> set:
+        """Which of the given execution IDs are already stored."""
+        ids = [str(i) for i in execution_ids]
+        if not ids:
+            return set()
+        placeholders = ",".join("?" * len(ids))
+        rows = self._connect().execute(
+            f"SELECT id FROM executions WHERE id IN ({placeholders})", ids
+        ).fetchall()
+        return {row[0] for row in rows}
+    
+    def in_flight(self, limit: int = 50) -> List[str]:
+        """IDs of stored executions that had not finished when last synced.
+        
+        Least recently checked first (then oldest first), so that passing
+        each batch to mark_checked() rotates through all of them.
+        """
+        placeholders = ",".join("?" * len(IN_FLIGHT_STATUSES))
+        rows = self._connect().execute(
+            f"SELECT id FROM executions WHERE status IN ({placeholders}) "
+            f"ORDER BY checked_at ASC, seq ASC LIMIT ?",
+            (*IN_FLIGHT_STATUSES, limit)
+        ).fetchall()
+        return [row[0] for row in rows]
+    
+    def mark_checked(self, execution_ids: Iterable[str]) -> None:
+        """Record that executions were just re-checked, even if nothing changed."""
+        conn = self._connect()
+        with conn:
+            conn.executemany(
+                "UPDATE executions SET checked_at = ? WHERE id = ?",
+                [(time.time(), str(i)) for i in execution_ids]
+            )
+    
+    def _where(self, workflow_id: str = None, status: str = None,
+               since: datetime = None) -> tuple:
+        clauses, params = [], []
+        if workflow_id is not None:
+            clauses.append("workflow_id = ?")
+            params.append(str(workflow_id))
+        if status:
+            clauses.append("status = ?")
+            params.append(status)
+        if since is not None:
+            clauses.append("started_at >= ?")
+            params.append(_utc_key(since))
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+        
+    def query(self, workflow_id: str = None, status: str = None,
+              since: datetime = None, limit: int = None, offset: int = 0) -> List[Dict]:
+        """Return executions, newest first.
+        
+        Args:
+            workflow_id: Only executions of this workflow
+            status: Only executions with this status
+            since: Only executions started at or after this time
+            limit: Maximum number of executions
+            offset: Number of matching executions to skip (for paging)
+        
+        Returns:
+            List of execution dictionaries as received from the API
+        """
+        where, params = self._where(workflow_id, status, since)
+        sql = "SELECT body FROM executions" + where + " ORDER BY seq DESC"
+        if limit is not None or offset:
+            sql += " LIMIT ? OFFSET ?"
+            params += [limit if limit is not None else -1, offset]
+        
+        return [json.loads(row[0]) for row in self._connect().execute(sql, params)]
+    
+    def count(self, workflow_id: str = None, status: str = None,
+              since: datetime = None) -> int:
+        """Number of stored executions matching the same filters as query()."""
+        where, params = self._where(workflow_id, status, since)
+        return self._connect().execute("SELECT COUNT(*) FROM executions" + where, params).fetchone()[0]
+    
+    def delete_before(self, cutoff: datetime) -> int:
+        """Delete executions started before ``cutoff``.
+        
+        Returns:
+            Number of executions deleted
+        """
+        conn = self._connect()
+        with conn:
+            cursor = conn.execute(
+                "DELETE FROM executions WHERE started_at < ?", (_utc_key(cutoff),)
+            )
+        return cursor.rowcount
@@ -0,0 +1,139 @@
+from typing import Dict, Iterable, Optional
+import math
+
+# Mergeable quantile sketch for execution durations (DDSketch).
+#
+# Values are counted in logarithmically sized buckets, so any quantile is
+# returned within a fixed relative error (1% by default) no matter how many
+# values were added, and sketches for different hours or workflows can be
+# merged by adding bucket counts.
+
+DEFAULT_RELATIVE_ACCURACY = 0.01
+
+# Durations at or below this many seconds are counted as zero
+MIN_TRACKED_VALUE = 1e-3
+
+# Bucket limit; beyond it the lowest buckets are folded together, which only
+# affects accuracy for the smallest values
+MAX_BUCKETS = 2048
+
+class DDSketch:
+    """Relative-error quantile sketch over non-negative values."""
+    
+    __slots__ = ("relative_accuracy", "gamma", "_log_gamma", "bins", "zero_count",
+                 "count", "total", "min", "max")
+    
+    def __init__(self, relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.bins: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+    
+    def _key(self, value: float) -> int:
+        return math.ceil(math.log(value) / self._log_gamma)
+    
+    def _value(self, key: int) -> float:
+        return 2 * self.gamma ** key / (self.gamma + 1)
+    
+    def add(self, value: float, count: int = 1) -> None:
+        """Add a value (negative values are treated as zero)."""
+        if value is None or count <= 0 or math.isnan(value):
+            return
+        value = max(value, 0.0)
+        if value <= MIN_TRACKED_VALUE:
+            self.zero_count += count
+        else:
+            key = self._key(value)
+            self.bins[key] = self.bins.get(key, 0) + count
+            if len(self.bins) > MAX_BUCKETS:
+                self._collapse()
+        self.count += count
+        self.total += value * count
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+    
+    def extend(self, values: Iterable[float]) -> None:
+        for value in values:
+            self.add(value)
+    
+    def _collapse(self) -> None:
+        keys = sorted(self.bins)
+        excess = keys[:len(keys) - MAX_BUCKETS + 1]
+        folded = sum(self.bins.pop(key) for key in excess)
+        target = keys[len(excess)]
+        self.bins[target] = self.bins.get(target, 0) + folded
+    
+    def merge(self, other: "DDSketch") -> None:
+        """Add another sketch's values to this one (same accuracy required)."""
+        if other.count == 0:
+            return
+        if abs(other.gamma - self.gamma) > 1e-12:
+            raise ValueError("Cannot merge sketches with different relative accuracy")
+        for key, count in other.bins.items():
+            self.bins[key] = self.bins.get(key, 0) + count
+        if len(self.bins) > MAX_BUCKETS:
+            self._collapse()
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+    
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate the q-quantile (0 <= q <= 1), or None if the sketch is empty."""
+        if self.count == 0:
+            return None
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+        for key in sorted(self.bins):
+            seen += self.bins[key]
+            if rank < seen:
+                return min(max(self._value(key), self.min), self.max)
+        return self.max
+    
+    def count_above(self, threshold: float) -> int:
+        """Approximate number of values greater than ``threshold``."""
+        if self.count == 0 or threshold >= self.max:
+            return 0
+        if threshold <= MIN_TRACKED_VALUE:
+            return self.count - self.zero_count
+        limit = self._key(threshold)
+        above = sum(count for key, count in self.bins.items() if key > limit)
+        # Part of the bucket holding the threshold, assuming values spread evenly
+        lower, upper = self.gamma ** (limit - 1), self.gamma ** limit
+        above += self.bins.get(limit, 0) * (upper - threshold) / (upper - lower)
+        return int(round(above))
+    
+    @property
+    def mean(self) -> Optional[float]:
+        return self.total / self.count if self.count else None
+    
+    def to_dict(self) -> Dict:
+        return {
+            "a": self.relative_accuracy,
+            "b": {str(key): count for key, count in self.bins.items()},
+            "z": self.zero_count,
+            "n": self.count,
+            "s": self.total,
+            "lo": self.min if self.count else None,
+            "hi": self.max if self.count else None,
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> "DDSketch":
+        sketch = cls(data.get("a", DEFAULT_RELATIVE_ACCURACY))
+        sketch.bins = {int(key): count for key, count in data.get("b", {}).items()}
+        sketch.zero_count = data.get("z", 0)
+        sketch.count = data.get("n", 0)
+        sketch.total = data.get("s", 0.0)
+        if sketch.count:
+            sketch.min = data["lo"]
+            sketch.max = data["hi"]
+        return sketch
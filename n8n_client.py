@@ -1,12 +1,86 @@
 import requests
+import json
 import os
-from datetime import datetime
-from typing import List, Dict, Optional
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import datetime, timedelta
+from typing import List, Dict, Optional, Iterator, Union
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from execution_store import ExecutionStore, execution_seq
+from execution_analytics import ExecutionFrame
+from latency_sketch import DDSketch
+from tag_catalog import get_tag_catalog, normalize_tags
 
 # Configuration for n8n API
 N8N_API_URL = os.getenv("N8N_API_URL", "http://localhost:5678/api/v1")
 N8N_API_KEY = os.getenv("N8N_API_KEY", "")
 
+# Connection pool and retry settings for the shared client
+N8N_POOL_SIZE = int(os.getenv("N8N_POOL_SIZE", "10"))
+N8N_MAX_RETRIES = int(os.getenv("N8N_MAX_RETRIES", "3"))
+N8N_BACKOFF_FACTOR = float(os.getenv("N8N_BACKOFF_FACTOR", "0.5"))
+
+# Status codes that are retried with exponential backoff
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+# Request timeouts in seconds, per endpoint
+ENDPOINT_TIMEOUTS = {
+    "workflows": 10,
+    "executions": 10,
+    "execute": 30,
+    "credentials": 10,
+    "health": 5,
+}
+DEFAULT_TIMEOUT = 10
+
+# Response cache: time-to-live in seconds per endpoint (0 disables caching)
+CACHE_TTLS = {
+    "workflows": int(os.getenv("N8N_CACHE_TTL_WORKFLOWS", "30")),
+    "executions": int(os.getenv("N8N_CACHE_TTL_EXECUTIONS", "10")),
+    "credentials": int(os.getenv("N8N_CACHE_TTL_CREDENTIALS", "300")),
+}
+CACHE_MAX_ENTRIES = int(os.getenv("N8N_CACHE_MAX_ENTRIES", "512"))
+
+# Health probe: seconds a probe result is reused, and heartbeat settings
+HEALTH_TTL = int(os.getenv("N8N_HEALTH_TTL", "15"))
+HEARTBEAT_INTERVAL = int(os.getenv("N8N_HEARTBEAT_INTERVAL", "30"))
+LATENCY_HISTORY_SIZE = 120
+
+# Background poller: one thread per process keeps a shared snapshot of all
+# workflows and the most recent executions fleet-wide, from which
+# per-workflow execution reads are served while it is fresh
+POLL_WORKFLOWS_INTERVAL = int(os.getenv("N8N_POLL_WORKFLOWS_INTERVAL", "30"))
+POLL_EXECUTIONS_INTERVAL = int(os.getenv("N8N_POLL_EXECUTIONS_INTERVAL", "10"))
+POLL_EXECUTIONS_LIMIT = int(os.getenv("N8N_POLL_EXECUTIONS_LIMIT", "500"))
+
+# Local execution history: executions are delta-synced into a SQLite store
+# and execution reads are served from it (an empty path disables the store)
+EXECUTION_STORE_PATH = os.getenv("N8N_EXECUTION_STORE_PATH", "/tmp/n8n_executions.db")
+EXECUTION_HISTORY_DAYS = int(os.getenv("N8N_EXECUTION_HISTORY_DAYS", "90"))
+EXECUTION_BACKFILL_LIMIT = int(os.getenv("N8N_EXECUTION_BACKFILL_LIMIT", "20000"))
+EXECUTION_SYNC_MAX_AGE = 2 * POLL_EXECUTIONS_INTERVAL
+# Older executions still running or waiting are re-fetched one by one, at
+# most EXECUTION_INFLIGHT_BATCH of them every EXECUTION_INFLIGHT_INTERVAL
+# seconds, least recently checked first
+EXECUTION_INFLIGHT_BATCH = 10
+EXECUTION_INFLIGHT_INTERVAL = 60
+
+# Latency SLO: an execution is good if it succeeds within SLO_LATENCY_SECONDS,
+# and SLO_TARGET is the fraction of executions that must be good. Per-workflow
+# overrides come from N8N_SLO_OVERRIDES, e.g. '{"12": {"latency": 120, "target": 0.95}}'.
+# Hourly duration sketches are kept for SKETCH_RETENTION_DAYS.
+SLO_LATENCY_SECONDS = float(os.getenv("N8N_SLO_LATENCY_SECONDS", "30"))
+SLO_TARGET = float(os.getenv("N8N_SLO_TARGET", "0.99"))
+SLO_OVERRIDES = json.loads(os.getenv("N8N_SLO_OVERRIDES", "{}") or "{}")
+SLO_BURN_WINDOWS = (1, 6, 24)
+SKETCH_RETENTION_DAYS = int(os.getenv("N8N_SKETCH_RETENTION_DAYS", "400"))
+
+# n8n caps page size on its public API at 250 items
+MAX_PAGE_SIZE = 250
+
 def get_headers():
     """Return headers for n8n API authentication."""
     return {
@@ -18,9 +92,472 @@ def is_api_configured() -> bool:
     """Check if API credentials are configured."""
     return bool(N8N_API_KEY and N8N_API_URL)
 
-def get_workflows() -> List[Dict]:
+class N8NClient:
+    """Pooled, keep-alive HTTP client for the n8n API.
+    
+    One connection pool is shared by all threads (and so by all Streamlit
+    sessions). Each thread gets its own ``requests.Session`` mounted on that
+    pool, because sessions themselves are not thread-safe. Idempotent
+    requests are retried with exponential backoff on 429 and 5xx responses,
+    honouring ``Retry-After``.
+    """
+    
+    def __init__(self, base_url: str = None, api_key: str = None,
+                 pool_size: int = None, max_retries: int = None,
+                 backoff_factor: float = None):
+        """Create a client.
+        
+        Args:
+            base_url: n8n API base URL (defaults to N8N_API_URL)
+            api_key: n8n API key (defaults to N8N_API_KEY)
+            pool_size: Maximum number of pooled keep-alive connections
+            max_retries: Retries for idempotent requests on 429/5xx
+            backoff_factor: Exponential backoff factor between retries
+        """
+        self.base_url = (base_url or N8N_API_URL).rstrip("/")
+        self.api_key = api_key if api_key is not None else N8N_API_KEY
+        
+        retry = Retry(
+            total=N8N_MAX_RETRIES if max_retries is None else max_retries,
+            backoff_factor=N8N_BACKOFF_FACTOR if backoff_factor is None else backoff_factor,
+            status_forcelist=RETRY_STATUS_CODES,
+            allowed_methods=frozenset(["GET", "HEAD", "PATCH", "DELETE"]),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        self._adapter = HTTPAdapter(
+            pool_maxsize=N8N_POOL_SIZE if pool_size is None else pool_size,
+            max_retries=retry,
+        )
+        # Single-connection pool without retries, for probes that must
+        # report the server's state as it is rather than wait it out
+        self._probe_adapter = HTTPAdapter(pool_maxsize=1, max_retries=0)
+        self._local = threading.local()
+    
+    def _session(self, retry: bool = True) -> requests.Session:
+        """Return this thread's session, creating it on first use."""
+        name = "session" if retry else "probe_session"
+        session = getattr(self._local, name, None)
+        if session is None:
+            adapter = self._adapter if retry else self._probe_adapter
+            session = requests.Session()
+            session.headers.update({
+                "X-N8N-API-KEY": self.api_key,
+                "Content-Type": "application/json"
+            })
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            setattr(self._local, name, session)
+        return session
+    
+    def request(self, method: str, path: str, endpoint: str = None,
+                retry: bool = True, **kwargs) -> requests.Response:
+        """Send a request to the n8n API over the shared pool.
+        
+        Args:
+            method: HTTP method
+            path: Path relative to the API base URL, e.g. "/workflows"
+            endpoint: Key into ENDPOINT_TIMEOUTS used for the default timeout
+            retry: Retry on 429/5xx with backoff (False sends exactly once)
+            **kwargs: Passed through to ``requests.Session.request``
+            
+        Returns:
+            The response object
+        """
+        kwargs.setdefault("timeout", ENDPOINT_TIMEOUTS.get(endpoint, DEFAULT_TIMEOUT))
+        return self._session(retry).request(method, f"{self.base_url}{path}", **kwargs)
+    
+    def get(self, path: str, endpoint: str = None, **kwargs) -> requests.Response:
+        return self.request("GET", path, endpoint, **kwargs)
+    
+    def post(self, path: str, endpoint: str = None, **kwargs) -> requests.Response:
+        return self.request("POST", path, endpoint, **kwargs)
+    
+    def patch(self, path: str, endpoint: str = None, **kwargs) -> requests.Response:
+        return self.request("PATCH", path, endpoint, **kwargs)
+    
+    def delete(self, path: str, endpoint: str = None, **kwargs) -> requests.Response:
+        return self.request("DELETE", path, endpoint, **kwargs)
+    
+    def close(self) -> None:
+        """Close all pooled connections."""
+        self._adapter.close()
+        self._probe_adapter.close()
+
+_client = None
+_client_lock = threading.Lock()
+
+def get_client() -> N8NClient:
+    """Return the process-wide shared client, creating it on first use."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = N8NClient()
+    return _client
+
+def reset_client() -> None:
+    """Close the shared client so the next call picks up new settings."""
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+        _client = None
+
+class _CacheEntry:
+    __slots__ = ("body", "etag", "expires")
+    
+    def __init__(self, body, etag: Optional[str], expires: float):
+        self.body = body
+        self.etag = etag
+        self.expires = expires
+
+class _Flight:
+    """An upstream fetch that concurrent callers for the same key wait on."""
+    __slots__ = ("done", "body", "error")
+    
+    def __init__(self):
+        self.done = threading.Event()
+        self.body = None
+        self.error = None
+
+class ResponseCache:
+    """Process-wide read-through cache for GET responses from the n8n API.
+    
+    Entries are keyed by path and query parameters, expire after the TTL
+    configured for their endpoint and are evicted in LRU order beyond
+    ``max_entries``. Expired entries that carry an ETag are revalidated
+    with ``If-None-Match`` instead of being refetched. Concurrent misses on
+    the same key share a single upstream request.
+    
+    Cached bodies are shared between callers and must be treated as
+    read-only.
+    """
+    
+    def __init__(self, max_entries: int = CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._inflight = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "revalidated": 0,
+            "coalesced": 0,
+            "evictions": 0,
+            "invalidations": 0,
+        }
+    
+    def get_json(self, path: str, endpoint: str, params: Dict = None):
+        """Return the parsed JSON body for a GET request, using the cache.
+        
+        Args:
+            path: Path relative to the API base URL
+            endpoint: Endpoint name, used for the TTL and request timeout
+            params: Query parameters
+            
+        Returns:
+            Parsed JSON body
+            
+        Raises:
+            requests.exceptions.RequestException if the upstream request fails
+        """
+        ttl = CACHE_TTLS.get(endpoint, 0)
+        key = (path, tuple(sorted((params or {}).items())))
+        
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires > time.monotonic():
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                return entry.body
+            
+            flight = self._inflight.get(key)
+            if flight is not None:
+                self._stats["coalesced"] += 1
+                leader = False
+            else:
+                flight = self._inflight[key] = _Flight()
+                leader = True
+            generation = self._generation
+        
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.body
+        
+        try:
+            flight.body = self._fetch(key, path, endpoint, params, entry, ttl, generation)
+            return flight.body
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            flight.done.set()
+    
+    def _fetch(self, key, path, endpoint, params, entry, ttl, generation):
+        """Fetch from upstream, revalidating a stale entry when possible."""
+        headers = {}
+        if entry is not None and entry.etag:
+            headers["If-None-Match"] = entry.etag
+        
+        response = get_client().get(path, endpoint=endpoint, params=params, headers=headers)
+        
+        if response.status_code == 304 and entry is not None:
+            body, etag = entry.body, entry.etag
+            counter = "revalidated"
+        else:
+            response.raise_for_status()
+            body, etag = response.json(), response.headers.get("ETag")
+            counter = "misses"
+        
+        with self._lock:
+            self._stats[counter] += 1
+            # A write that happened while this request was in flight may
+            # have made the response stale, so only store it if none did
+            if ttl > 0 and generation == self._generation:
+                self._entries[key] = _CacheEntry(body, etag, time.monotonic() + ttl)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self._stats["evictions"] += 1
+        return body
+    
+    def invalidate(self, prefix: str = "") -> int:
+        """Drop all entries whose path starts with ``prefix``.
+        
+        Args:
+            prefix: Path prefix, e.g. "/workflows" (empty drops everything)
+            
+        Returns:
+            Number of entries dropped
+        """
+        with self._lock:
+            self._generation += 1
+            keys = [key for key in self._entries if key[0].startswith(prefix)]
+            for key in keys:
+                del self._entries[key]
+            self._stats["invalidations"] += len(keys)
+            return len(keys)
+    
+    def expire(self, prefix: str = "") -> int:
+        """Mark entries whose path starts with ``prefix`` as expired.
+        
+        Unlike invalidate(), entries are kept so that the next read can
+        revalidate them with their ETag.
+        
+        Args:
+            prefix: Path prefix, e.g. "/workflows" (empty expires everything)
+        
+        Returns:
+            Number of entries expired
+        """
+        with self._lock:
+            count = 0
+            for key, entry in self._entries.items():
+                if key[0].startswith(prefix):
+                    entry.expires = 0.0
+                    count += 1
+            return count
+    
+    def stats(self) -> Dict:
+        """Return hit/miss counters and the current size."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["size"] = len(self._entries)
+        lookups = stats["hits"] + stats["misses"] + stats["revalidated"] + stats["coalesced"]
+        stats["hit_rate"] = (
+            (stats["hits"] + stats["revalidated"] + stats["coalesced"]) / lookups * 100
+            if lookups > 0 else 0
+        )
+        return stats
+
+_response_cache = ResponseCache()
+
+def get_cache_stats() -> Dict:
+    """Get response cache counters.
+    
+    Returns:
+        Dictionary with hits, misses, revalidated, coalesced, evictions,
+        invalidations, size and hit_rate
+    """
+    return _response_cache.stats()
+
+def clear_cache() -> None:
+    """Drop every cached response."""
+    _response_cache.invalidate()
+
+_prefetch_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="n8n-prefetch")
+
+def _fetch_page(path: str, endpoint: str, params: Dict) -> tuple:
+    """Fetch one page of a cursor-paginated endpoint.
+    
+    Returns:
+        Tuple of (items, next_cursor)
+    """
+    body = _response_cache.get_json(path, endpoint, params)
+    return body.get("data", []), body.get("nextCursor")
+
+def _iter_pages(path: str, endpoint: str, params: Dict, max_items: int = None,
+                prefetch: bool = True) -> Iterator[List[Dict]]:
+    """Yield pages from a cursor-paginated endpoint, following nextCursor.
+    
+    While the caller consumes one page, the next one is fetched in the
+    background when ``prefetch`` is set. No page is requested once
+    ``max_items`` items have been fetched.
+    
+    Raises:
+        requests.exceptions.RequestException on any failed page
+    """
+    fetched = 0
+    page, cursor = _fetch_page(path, endpoint, params)
+    
+    while True:
+        fetched += len(page)
+        has_more = bool(cursor) and (max_items is None or fetched < max_items)
+        
+        pending = None
+        if has_more and prefetch:
+            pending = _prefetch_executor.submit(
+                _fetch_page, path, endpoint, dict(params, cursor=cursor)
+            )
+        
+        try:
+            yield page
+        except GeneratorExit:
+            if pending is not None:
+                pending.cancel()
+            raise
+        
+        if not has_more:
+            return
+        if pending is not None:
+            page, cursor = pending.result()
+        else:
+            page, cursor = _fetch_page(path, endpoint, dict(params, cursor=cursor))
+
+def _normalize_workflow(wf: Dict) -> Dict:
+    """Ensure a workflow has the fields the dashboard relies on.
+    
+    Tags are reduced to their names here, once per fetched workflow.
+    """
+    tags = wf.get('tags')
+    if not tags:
+        wf['tags'] = []
+    elif not all(isinstance(tag, str) for tag in tags):
+        wf['tags'] = normalize_tags(tags)
+    if 'nodes' not in wf:
+        wf['nodes'] = []
+    if 'active' not in wf:
+        wf['active'] = False
+    return wf
+
+def _normalize_execution(exe: Dict) -> Dict:
+    """Ensure datetime fields are present on an execution."""
+    if 'startedAt' not in exe:
+        exe['startedAt'] = datetime.now().astimezone().isoformat()
+    if 'finishedAt' not in exe and exe.get('status') in ['success', 'error']:
+        exe['finishedAt'] = exe['startedAt']
+    return exe
+
+def _parse_timestamp(value: Union[str, datetime]) -> datetime:
+    """Parse an n8n timestamp into a timezone-aware datetime.
+    
+    Naive values are taken to be in local time.
+    """
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if value.tzinfo is None:
+        value = value.astimezone()
+    return value
+
+def iter_workflows(page_size: int = MAX_PAGE_SIZE, max_items: int = None,
+                   prefetch: bool = True) -> Iterator[Dict]:
+    """Lazily iterate over all workflows, following pagination cursors.
+    
+    Args:
+        page_size: Number of workflows requested per page
+        max_items: Stop after this many workflows
+        prefetch: Fetch the next page in the background while iterating
+        
+    Yields:
+        Workflow dictionaries
+        
+    Raises:
+        requests.exceptions.RequestException if a page cannot be fetched
+    """
+    if not is_api_configured():
+        return
+    
+    if max_items is not None:
+        page_size = min(page_size, max_items)
+    params = {"limit": min(page_size, MAX_PAGE_SIZE)}
+    
+    count = 0
+    for page in _iter_pages("/workflows", "workflows", params, max_items, prefetch):
+        for wf in page:
+            if max_items is not None and count >= max_items:
+                return
+            yield _normalize_workflow(wf)
+            count += 1
+
+def iter_executions(workflow_id: str = None, status: str = None,
+                    since: Union[str, datetime] = None,
+                    page_size: int = MAX_PAGE_SIZE, max_items: int = None,
+                    prefetch: bool = True) -> Iterator[Dict]:
+    """Lazily iterate over executions, newest first, following pagination cursors.
+    
+    Args:
+        workflow_id: Only executions of this workflow (all workflows if None)
+        status: Filter by status (success, error, waiting, etc.)
+        since: Stop at the first execution started before this time
+        page_size: Number of executions requested per page
+        max_items: Stop after this many executions
+        prefetch: Fetch the next page in the background while iterating
+        
+    Yields:
+        Execution dictionaries
+        
+    Raises:
+        requests.exceptions.RequestException if a page cannot be fetched
+    """
+    if not is_api_configured():
+        return
+    
+    if max_items is not None:
+        page_size = min(page_size, max_items)
+    params = {"limit": min(page_size, MAX_PAGE_SIZE)}
+    if workflow_id:
+        params["workflowId"] = workflow_id
+    if status:
+        params["status"] = status
+    cutoff = _parse_timestamp(since) if since is not None else None
+    
+    count = 0
+    for page in _iter_pages("/executions", "executions", params, max_items, prefetch):
+        for exe in page:
+            if max_items is not None and count >= max_items:
+                return
+            _normalize_execution(exe)
+            if cutoff is not None:
+                try:
+                    if _parse_timestamp(exe['startedAt']) < cutoff:
+                        return
+                except ValueError:
+                    pass
+            yield exe
+            count += 1
+
+def get_workflows(max_items: int = None) -> List[Dict]:
     """Fetch all workflows from n8n API.
     
+    Args:
+        max_items: Optional cap on the number of workflows returned
+    
     Returns:
         List of workflow dictionaries with id, name, active status, tags, nodes, etc.
     """
@@ -28,19 +565,10 @@ def get_workflows() -> List[Dict]:
         return []
     
     try:
-        response = requests.get(f"{N8N_API_URL}/workflows", headers=get_headers(), timeout=10)
-        response.raise_for_status()
-        workflows = response.json().get("data", [])
-        
-        # Ensure each workflow has required fields
-        for wf in workflows:
-            if 'tags' not in wf:
-                wf['tags'] = []
-            if 'nodes' not in wf:
-                wf['nodes'] = []
-            if 'active' not in wf:
-                wf['active'] = False
-                
+        workflows = list(iter_workflows(max_items=max_items))
+        if max_items is None:
+            _workflow_metadata["count"] = len(workflows)
+            _workflow_metadata["updated"] = datetime.now().isoformat()
         return workflows
     except requests.exceptions.Timeout:
         print(f"Timeout connecting to n8n API at {N8N_API_URL}")
@@ -68,20 +596,153 @@ def get_workflow_by_id(workflow_id: str) -> Optional[Dict]:
         return None
     
     try:
-        response = requests.get(
-            f"{N8N_API_URL}/workflows/{workflow_id}", 
-            headers=get_headers(), 
-            timeout=10
-        )
-        response.raise_for_status()
-        return response.json().get("data", None)
+        body = _response_cache.get_json(f"/workflows/{workflow_id}", "workflows")
+        return body.get("data", None)
     except Exception as e:
         print(f"Error fetching workflow {workflow_id}: {e}")
         return None
 
+_execution_store = None
+_execution_store_lock = threading.Lock()
+_sync_lock = threading.Lock()
+_last_sync = 0.0
+_last_inflight_check = 0.0
+# Wall-clock time of the last execution change made through this client
+_executions_changed = 0.0
+
+def get_execution_store() -> Optional[ExecutionStore]:
+    """Return the local execution store, or None if it is disabled."""
+    global _execution_store
+    if not EXECUTION_STORE_PATH:
+        return None
+    if _execution_store is None:
+        with _execution_store_lock:
+            if _execution_store is None:
+                _execution_store = ExecutionStore(EXECUTION_STORE_PATH)
+    return _execution_store
+
+def sync_executions(max_age: float = None) -> Dict:
+    """Bring the local execution store up to date with n8n.
+    
+    The first sync backfills EXECUTION_HISTORY_DAYS of history. Later syncs
+    page through executions newest first until they reach one already
+    stored. The whole newest page is always re-stored, which also updates
+    recent executions that were still running; older in-flight executions
+    are re-fetched individually in small, rate-limited batches that rotate
+    through all of them.
+    
+    Args:
+        max_age: Skip the sync if the last one finished less than this many
+            seconds ago (checked once this call holds the sync lock, so
+            callers queued behind a sync do not repeat it)
+    
+    Returns:
+        Dictionary with new, updated, removed and pruned counts (empty if
+        the store is disabled or the sync was skipped)
+    
+    Raises:
+        requests.exceptions.RequestException if the execution list cannot be fetched
+    """
+    global _last_sync, _last_inflight_check
+    store = get_execution_store()
+    if store is None or not is_api_configured():
+        return {}
+    
+    with _sync_lock:
+        if max_age is not None and time.monotonic() - _last_sync <= max_age:
+            return {}
+        _response_cache.expire("/executions")
+        high_water = store.high_water()
+        
+        if high_water is None:
+            since = datetime.now() - timedelta(days=EXECUTION_HISTORY_DAYS)
+            rows = list(iter_executions(since=since, max_items=EXECUTION_BACKFILL_LIMIT))
+            new_count = len(rows)
+        else:
+            rows, new_count = [], 0
+            for exe in iter_executions(prefetch=False):
+                seq = execution_seq(exe.get('id'))
+                if seq is None:
+                    known = bool(store.known_ids([exe.get('id')]))
+                else:
+                    known = seq <= high_water
+                rows.append(exe)
+                new_count += 0 if known else 1
+                if known and len(rows) >= MAX_PAGE_SIZE:
+                    break
+        store.upsert(rows)
+        
+        updated, removed = [], []
+        if rows and time.monotonic() - _last_inflight_check > EXECUTION_INFLIGHT_INTERVAL:
+            _last_inflight_check = time.monotonic()
+            fetched = {str(exe.get('id')) for exe in rows}
+            stale = [
+                execution_id
+                for execution_id in store.in_flight(EXECUTION_INFLIGHT_BATCH + len(fetched))
+                if execution_id not in fetched
+            ]
+            stale = stale[:EXECUTION_INFLIGHT_BATCH]
+            for execution_id in stale:
+                try:
+                    body = _response_cache.get_json(f"/executions/{execution_id}", "executions")
+                    if body.get("data"):
+                        # Only summaries are stored; payloads are fetched on demand
+                        summary = {k: v for k, v in body["data"].items() if k != "data"}
+                        updated.append(_normalize_execution(summary))
+                except requests.exceptions.HTTPError as e:
+                    if e.response is not None and e.response.status_code == 404:
+                        removed.append(execution_id)
+                    else:
+                        print(f"Error re-syncing execution {execution_id}: {e}")
+                except Exception as e:
+                    print(f"Error re-syncing execution {execution_id}: {e}")
+            # Unchanged and failed ones go to the back of the queue too
+            store.mark_checked(stale)
+            store.upsert(updated)
+            if removed:
+                store.delete(removed)
+        
+        pruned = store.delete_before(datetime.now() - timedelta(days=EXECUTION_HISTORY_DAYS))
+        store.delete_sketches_before(datetime.now() - timedelta(days=SKETCH_RETENTION_DAYS))
+        store.set_meta("synced_at", datetime.now().isoformat())
+        _last_sync = time.monotonic()
+    
+    return {"new": new_count, "updated": len(updated), "removed": len(removed), "pruned": pruned}
+
+def _ensure_synced() -> None:
+    """Sync the execution store if the last sync is older than EXECUTION_SYNC_MAX_AGE.
+    
+    A failed sync is reported and the local data is used as it is.
+    """
+    if time.monotonic() - _last_sync > EXECUTION_SYNC_MAX_AGE:
+        try:
+            sync_executions(max_age=EXECUTION_SYNC_MAX_AGE)
+        except Exception as e:
+            print(f"Error syncing executions: {e}")
+
+def _stored_executions(workflow_id: str = None, status: str = None,
+                       since: datetime = None, limit: int = None) -> Optional[List[Dict]]:
+    """Query the local execution store, syncing first if it has fallen behind.
+    
+    Returns:
+        List of execution dictionaries, or None if the store is unavailable
+    """
+    store = get_execution_store()
+    if store is None:
+        return None
+    
+    try:
+        _ensure_synced()
+        return store.query(workflow_id=workflow_id, status=status, since=since, limit=limit)
+    except Exception as e:
+        print(f"Error reading execution store: {e}")
+        return None
+
 def get_executions(workflow_id: str, limit: int = 20, status: str = None) -> List[Dict]:
     """Fetch recent executions for a specific workflow.
     
+    Served from the local execution store when it is enabled.
+    
     Args:
         workflow_id: The workflow ID
         limit: Maximum number of executions to fetch
@@ -93,32 +754,70 @@ def get_executions(workflow_id: str, limit: int = 20, status: str = None) -> Lis
     if not is_api_configured():
         return []
     
+    stored = _stored_executions(workflow_id, status=status, limit=limit)
+    if stored is not None:
+        return stored
+    
     try:
-        params = {"workflowId": workflow_id, "limit": limit}
-        if status:
-            params["status"] = status
-            
-        response = requests.get(
-            f"{N8N_API_URL}/executions", 
-            headers=get_headers(), 
-            params=params,
-            timeout=10
-        )
-        response.raise_for_status()
-        executions = response.json().get("data", [])
-        
-        # Ensure datetime fields are present
-        for exe in executions:
-            if 'startedAt' not in exe:
-                exe['startedAt'] = datetime.now().isoformat()
-            if 'finishedAt' not in exe and exe.get('status') in ['success', 'error']:
-                exe['finishedAt'] = exe['startedAt']
-                
-        return executions
+        return list(iter_executions(workflow_id, status=status, max_items=limit))
     except Exception as e:
         print(f"Error fetching executions for workflow {workflow_id}: {e}")
         return []
 
+def get_execution_page(workflow_id: str, status: str = None,
+                       page: int = 0, page_size: int = 25) -> Dict:
+    """Fetch one page of a workflow's execution log as summary rows.
+    
+    Rows never carry the execution payload; load it per execution with
+    get_execution_by_id(). Pages are read from the local execution store
+    when it is enabled; otherwise the API is paged up to the requested page.
+    
+    Args:
+        workflow_id: The workflow ID
+        status: Filter by status (all if None)
+        page: Zero-based page number
+        page_size: Executions per page
+    
+    Returns:
+        Dictionary with executions (newest first), total and page. Without
+        the store, total is only a lower bound: it counts the executions
+        fetched so far plus one if there are more.
+    """
+    if not is_api_configured():
+        return {"executions": [], "total": 0, "page": page}
+    
+    offset = page * page_size
+    executions, total = None, 0
+    store = get_execution_store()
+    if store is not None:
+        try:
+            _ensure_synced()
+            total = store.count(workflow_id=workflow_id, status=status)
+            executions = store.query(workflow_id=workflow_id, status=status,
+                                     limit=page_size, offset=offset)
+        except Exception as e:
+            print(f"Error reading execution store: {e}")
+            executions = None
+    
+    if executions is None:
+        try:
+            fetched = list(iter_executions(workflow_id, status=status,
+                                           max_items=offset + page_size + 1))
+        except Exception as e:
+            print(f"Error fetching executions for workflow {workflow_id}: {e}")
+            fetched = []
+        total = len(fetched)
+        executions = fetched[offset:offset + page_size]
+    
+    return {
+        "executions": [
+            {key: value for key, value in exe.items() if key != 'data'}
+            for exe in executions
+        ],
+        "total": total,
+        "page": page,
+    }
+
 def get_execution_by_id(execution_id: str) -> Optional[Dict]:
     """Fetch detailed information about a specific execution.
     
@@ -132,10 +831,10 @@ def get_execution_by_id(execution_id: str) -> Optional[Dict]:
         return None
     
     try:
-        response = requests.get(
-            f"{N8N_API_URL}/executions/{execution_id}",
-            headers=get_headers(),
-            timeout=10
+        # Full payloads can be many megabytes, so they bypass the response
+        # cache (which is bounded by entry count, not size)
+        response = get_client().get(
+            f"/executions/{execution_id}", endpoint="executions", params={"includeData": "true"}
         )
         response.raise_for_status()
         return response.json().get("data", None)
@@ -143,6 +842,17 @@ def get_execution_by_id(execution_id: str) -> Optional[Dict]:
         print(f"Error fetching execution {execution_id}: {e}")
         return None
 
+def _mark_executions_changed() -> None:
+    """Make the next execution read sync the store first.
+    
+    Poller snapshots taken before the change are no longer used for
+    execution reads, and the poller is woken to take a new one.
+    """
+    global _last_sync, _executions_changed
+    _last_sync = 0.0
+    _executions_changed = time.time()
+    _poller.refresh(timeout=0)
+
 def toggle_workflow(workflow_id: str, active: bool) -> bool:
     """Activate or deactivate a workflow.
     
@@ -158,13 +868,13 @@ def toggle_workflow(workflow_id: str, active: bool) -> bool:
     
     try:
         # Update workflow active status
-        response = requests.patch(
-            f"{N8N_API_URL}/workflows/{workflow_id}",
-            headers=get_headers(),
-            json={"active": active},
-            timeout=10
+        response = get_client().patch(
+            f"/workflows/{workflow_id}",
+            endpoint="workflows",
+            json={"active": active}
         )
         response.raise_for_status()
+        _response_cache.invalidate("/workflows")
         return True
     except Exception as e:
         print(f"Error toggling workflow {workflow_id}: {e}")
@@ -188,19 +898,31 @@ def trigger_workflow(workflow_id: str, data: Dict = None) -> Optional[str]:
         if data:
             payload["data"] = data
             
-        response = requests.post(
-            f"{N8N_API_URL}/workflows/{workflow_id}/execute",
-            headers=get_headers(),
-            json=payload,
-            timeout=30
+        response = get_client().post(
+            f"/workflows/{workflow_id}/execute",
+            endpoint="execute",
+            json=payload
         )
         response.raise_for_status()
+        _response_cache.invalidate("/executions")
+        _mark_executions_changed()
         result = response.json()
         return result.get("data", {}).get("executionId")
     except Exception as e:
         print(f"Error triggering workflow {workflow_id}: {e}")
         return None
 
+def _compute_statistics(executions: List[Dict]) -> Dict:
+    """Compute execution statistics from a list of executions.
+    
+    Args:
+        executions: Execution dictionaries
+        
+    Returns:
+        Dictionary with success rate, avg and p50/p95/p99 duration, error count, etc.
+    """
+    return ExecutionFrame(executions).summary()
+
 def get_workflow_statistics(workflow_id: str, days: int = 30) -> Dict:
     """Get execution statistics for a workflow.
     
@@ -209,109 +931,665 @@ def get_workflow_statistics(workflow_id: str, days: int = 30) -> Dict:
         days: Number of days to analyze
         
     Returns:
-        Dictionary with success rate, avg duration, error count, etc.
+        Dictionary with success rate, avg and p50/p95/p99 duration, error count, etc.
     """
-    executions = get_executions(workflow_id, limit=100)
-    
-    if not executions:
-        return {
-            "total": 0,
-            "success": 0,
-            "error": 0,
-            "waiting": 0,
-            "success_rate": 0,
-            "avg_duration": 0
-        }
+    return get_execution_frame(workflow_id, days).summary()
+
+def get_execution_frame(workflow_id: str, days: int = 30) -> ExecutionFrame:
+    """Get a workflow's execution history in columnar form for analytics.
     
-    total = len(executions)
-    success = len([e for e in executions if e.get('status') == 'success'])
-    error = len([e for e in executions if e.get('status') == 'error'])
-    waiting = len([e for e in executions if e.get('status') == 'waiting'])
+    Args:
+        workflow_id: The workflow ID
+        days: Number of days of history (from the local execution store;
+            without it, only the last 100 executions are available)
     
-    # Calculate average duration for completed executions
-    durations = []
-    for exe in executions:
-        if exe.get('startedAt') and exe.get('finishedAt'):
-            try:
-                start = datetime.fromisoformat(exe['startedAt'].replace('Z', '+00:00'))
-                finish = datetime.fromisoformat(exe['finishedAt'].replace('Z', '+00:00'))
-                duration = (finish - start).total_seconds()
-                durations.append(duration)
-            except:
-                continue
+    Returns:
+        ExecutionFrame over the executions
+    """
+    since = datetime.now() - timedelta(days=days)
+    stored = _stored_executions(workflow_id, since=since)
+    if stored is None:
+        stored = get_executions(workflow_id, limit=100)
+    return ExecutionFrame(stored).window(since=since)
+
+def get_slo_config(workflow_id: str) -> Dict:
+    """Latency threshold (seconds) and target good fraction for a workflow."""
+    override = SLO_OVERRIDES.get(str(workflow_id), {})
+    return {
+        "latency": float(override.get("latency", SLO_LATENCY_SECONDS)),
+        "target": float(override.get("target", SLO_TARGET)),
+    }
+
+def _latency_slo(workflow_id: str, windows: Dict[int, Dict], window_hours: int) -> Dict:
+    config = get_slo_config(workflow_id)
+    error_budget = max(1 - config["target"], 1e-9)
     
-    avg_duration = sum(durations) / len(durations) if durations else 0
+    burn_rates = {}
+    for hours, window in windows.items():
+        total = window["total"]
+        if total == 0:
+            burn_rates[hours] = None
+            continue
+        bad = min(total, window["errors"] + window["sketch"].count_above(config["latency"]))
+        burn_rates[hours] = (bad / total) / error_budget
     
+    window = windows[window_hours]
+    sketch = window["sketch"]
+    bad = min(window["total"], window["errors"] + sketch.count_above(config["latency"]))
     return {
-        "total": total,
-        "success": success,
-        "error": error,
-        "waiting": waiting,
-        "success_rate": (success / total * 100) if total > 0 else 0,
-        "avg_duration": avg_duration
+        "workflow_id": workflow_id,
+        "window_hours": window_hours,
+        "total": window["total"],
+        "errors": window["errors"],
+        "p50_duration": sketch.quantile(0.50),
+        "p95_duration": sketch.quantile(0.95),
+        "p99_duration": sketch.quantile(0.99),
+        "latency_threshold": config["latency"],
+        "target": config["target"],
+        "bad": bad,
+        "good_fraction": 1 - bad / window["total"] if window["total"] else None,
+        "burn_rates": burn_rates,
     }
 
-def get_all_tags() -> List[str]:
-    """Get all unique tags from all workflows.
+def get_latency_slo(workflow_id: str, window_hours: int = 24) -> Optional[Dict]:
+    """Duration percentiles and SLO burn rates for one workflow.
+    
+    Percentiles cover successful executions started in the window and come
+    from the hourly duration sketches (within 1%), so the window has hour
+    resolution. A burn rate of 1 spends the error budget exactly over the
+    SLO period; higher values spend it faster.
+    
+    Args:
+        workflow_id: The workflow ID
+        window_hours: Window for the percentiles and good fraction
     
     Returns:
-        List of unique tag names
+        Dictionary with total, errors, p50/p95/p99_duration (None without
+        data), latency_threshold, target, bad, good_fraction and burn_rates
+        ({hours: rate or None} for each of SLO_BURN_WINDOWS), or None if the
+        execution store is disabled
     """
-    workflows = get_workflows()
-    tags = set()
-    for wf in workflows:
-        tags.update(wf.get('tags', []))
-    return sorted(list(tags))
+    store = get_execution_store()
+    if store is None:
+        return None
+    
+    hours = set(SLO_BURN_WINDOWS) | {window_hours}
+    try:
+        _ensure_synced()
+        windows = store.load_sketches(hours, workflow_id=workflow_id).get(str(workflow_id))
+    except Exception as e:
+        print(f"Error reading duration sketches for workflow {workflow_id}: {e}")
+        return None
+    
+    if windows is None:
+        windows = {h: {"total": 0, "errors": 0, "sketch": DDSketch()} for h in hours}
+    return _latency_slo(str(workflow_id), windows, window_hours)
 
-def test_connection() -> Dict:
-    """Test connection to n8n API.
+def get_fleet_latency_slo(window_hours: int = 24) -> List[Dict]:
+    """Latency SLO status for every workflow with executions in the window.
+    
+    Args:
+        window_hours: Window for the percentiles and good fraction
     
     Returns:
-        Dictionary with connection status and details
+        List of get_latency_slo() dictionaries, fastest-burning first
     """
-    if not is_api_configured():
-        return {
-            "connected": False,
-            "message": "API credentials not configured",
-            "url": N8N_API_URL
-        }
+    store = get_execution_store()
+    if store is None:
+        return []
     
+    hours = set(SLO_BURN_WINDOWS) | {window_hours}
     try:
-        response = requests.get(f"{N8N_API_URL}/workflows", headers=get_headers(), timeout=5)
-        response.raise_for_status()
+        _ensure_synced()
+        all_windows = store.load_sketches(hours)
+    except Exception as e:
+        print(f"Error reading duration sketches: {e}")
+        return []
+    
+    results = [
+        _latency_slo(wf_id, windows, window_hours)
+        for wf_id, windows in all_windows.items()
+        if windows[window_hours]["total"] > 0
+    ]
+    results.sort(
+        key=lambda r: max((b for b in r["burn_rates"].values() if b is not None), default=0),
+        reverse=True
+    )
+    return results
+
+class ExecutionSnapshot:
+    """One fetch of a workflow's recent executions, shared by a page render.
+    
+    Statistics, the execution log and charts read the same rows instead of
+    each making its own request. When the local execution store is enabled,
+    the log and the analytics history are read from it instead, since it
+    holds more than the snapshot's most recent executions.
+    """
+    
+    def __init__(self, workflow_id: str, executions: List[Dict]):
+        self.workflow_id = workflow_id
+        self.executions = executions
+        self.fetched_at = datetime.now()
+        self._frame = None
+        self._statistics = None
+    
+    def __len__(self) -> int:
+        return len(self.executions)
+    
+    def frame(self) -> ExecutionFrame:
+        """The snapshot's executions in columnar form (built once)."""
+        if self._frame is None:
+            self._frame = ExecutionFrame(self.executions)
+        return self._frame
+    
+    def statistics(self) -> Dict:
+        """Execution statistics for the snapshot (computed once)."""
+        if self._statistics is None:
+            self._statistics = self.frame().summary()
+        return self._statistics
+    
+    def page(self, status: str = None, page: int = 0, page_size: int = 25) -> Dict:
+        """One page of the execution log (see get_execution_page).
         
-        workflow_count = len(response.json().get("data", []))
+        Without the store, the snapshot's rows are filtered by status
+        locally, and total counts the matching rows in the snapshot.
+        """
+        if get_execution_store() is not None:
+            return get_execution_page(self.workflow_id, status=status, page=page, page_size=page_size)
         
+        rows = [exe for exe in self.executions if status is None or exe.get('status') == status]
+        offset = page * page_size
         return {
-            "connected": True,
-            "message": f"Successfully connected to n8n",
-            "url": N8N_API_URL,
-            "workflow_count": workflow_count
+            "executions": [
+                {key: value for key, value in exe.items() if key != 'data'}
+                for exe in rows[offset:offset + page_size]
+            ],
+            "total": len(rows),
+            "page": page,
         }
+    
+    def history(self, days: int = 30) -> ExecutionFrame:
+        """Executions of the last ``days`` days (see get_execution_frame).
+        
+        Without the store, this is the part of the snapshot within the window.
+        """
+        if get_execution_store() is not None:
+            return get_execution_frame(self.workflow_id, days)
+        return self.frame().window(since=datetime.now() - timedelta(days=days))
+
+def get_execution_snapshot(workflow_id: str, limit: int = 100) -> ExecutionSnapshot:
+    """Fetch a workflow's recent executions once for a whole page render.
+    
+    They are taken from the background poller's snapshot when it is fresh
+    and holds all of them, and fetched otherwise.
+    
+    Args:
+        workflow_id: The workflow ID
+        limit: Number of most recent executions to fetch
+        
+    Returns:
+        ExecutionSnapshot over the fetched executions
+    """
+    executions = _poller.recent_executions(workflow_id, limit)
+    if executions is None:
+        executions = get_executions(workflow_id, limit=limit)
+    return ExecutionSnapshot(workflow_id, executions)
+
+def get_statistics_bulk(workflow_ids: List[str], concurrency: int = 8,
+                        deadline: float = 30.0, limit: int = 100) -> Dict[str, Dict]:
+    """Get execution statistics for many workflows concurrently.
+    
+    Workflows are fetched on a bounded thread pool. A failure for one
+    workflow does not affect the others, and anything not finished when
+    the deadline passes is reported as timed out.
+    
+    Args:
+        workflow_ids: Workflow IDs to analyze
+        concurrency: Maximum number of requests in flight
+        deadline: Overall time budget in seconds
+        limit: Executions analyzed per workflow
+        
+    Returns:
+        Dictionary mapping workflow ID to its statistics, in input order.
+        Each entry has a "fetch_error" key, None when the fetch succeeded.
+    """
+    if not workflow_ids:
+        return {}
+    
+    def fetch(workflow_id: str) -> Dict:
+        executions = _stored_executions(workflow_id, limit=limit)
+        if executions is None:
+            executions = list(iter_executions(workflow_id, max_items=limit, prefetch=False))
+        return _compute_statistics(executions)
+    
+    results = {}
+    executor = ThreadPoolExecutor(max_workers=max(1, concurrency), thread_name_prefix="n8n-stats")
+    try:
+        futures = {executor.submit(fetch, wf_id): wf_id for wf_id in workflow_ids}
+        done, _ = wait(futures, timeout=deadline)
+        
+        for future, wf_id in futures.items():
+            if future not in done:
+                future.cancel()
+                results[wf_id] = dict(_compute_statistics([]), fetch_error="Deadline exceeded")
+                continue
+            try:
+                results[wf_id] = dict(future.result(), fetch_error=None)
+            except Exception as e:
+                results[wf_id] = dict(_compute_statistics([]), fetch_error=str(e))
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+    
+    return {wf_id: results[wf_id] for wf_id in workflow_ids}
+
+def get_all_tags(workflows: List[Dict] = None) -> List[str]:
+    """Get all unique tags from all workflows.
+    
+    Served from the tag catalog, which is updated incrementally from each
+    new workflow snapshot.
+    
+    Args:
+        workflows: The current workflow snapshot (the poller's, or a fresh
+            fetch if the poller has not loaded one yet, if not given)
+    
+    Returns:
+        Sorted list of tag names
+    """
+    catalog = get_tag_catalog()
+    if workflows is None:
+        snapshot = get_live_snapshot()
+        workflows = snapshot.workflows if snapshot.loaded else get_workflows()
+    catalog.update(workflows)
+    return catalog.tags()
+
+def get_tag_counts(workflows: List[Dict] = None) -> Dict[str, int]:
+    """Number of workflows per tag (same snapshot rules as get_all_tags)."""
+    get_all_tags(workflows)
+    return get_tag_catalog().counts()
+
+# Last known workflow count, recorded whenever the full list is fetched
+_workflow_metadata = {"count": None, "updated": None}
+
+_health_lock = threading.Lock()
+# Signalled when a probe result is published
+_health_published = threading.Condition(_health_lock)
+_health_status = None
+_health_checked = 0.0
+_health_probing = False
+_latency_history = deque(maxlen=LATENCY_HISTORY_SIZE)
+
+_heartbeat_thread = None
+_heartbeat_stop = threading.Event()
+
+def _probe() -> Dict:
+    """Run a minimal request against the API, once and without retries, and time it."""
+    started = time.perf_counter()
+    status = {"url": N8N_API_URL}
+    
+    try:
+        response = get_client().get("/workflows", endpoint="health", retry=False, params={"limit": 1})
+        response.raise_for_status()
+        status.update(connected=True, message="Successfully connected to n8n")
     except requests.exceptions.Timeout:
-        return {
-            "connected": False,
-            "message": "Connection timeout",
-            "url": N8N_API_URL
-        }
+        status.update(connected=False, message="Connection timeout")
     except requests.exceptions.ConnectionError:
-        return {
-            "connected": False,
-            "message": "Cannot reach n8n server",
-            "url": N8N_API_URL
-        }
+        status.update(connected=False, message="Cannot reach n8n server")
     except requests.exceptions.HTTPError as e:
-        return {
-            "connected": False,
-            "message": f"HTTP error: {e.response.status_code}",
-            "url": N8N_API_URL
-        }
+        status.update(connected=False, message=f"HTTP error: {e.response.status_code}")
     except Exception as e:
+        status.update(connected=False, message=f"Error: {str(e)}")
+    
+    status["latency_ms"] = (time.perf_counter() - started) * 1000
+    status["checked_at"] = datetime.now().isoformat()
+    return status
+
+def check_health(force: bool = False) -> Dict:
+    """Check API health with a single-item request, reusing recent results.
+    
+    A probe result is reused for HEALTH_TTL seconds so that every page view
+    does not hit the API. Only one caller probes at a time, outside the
+    lock; the others get the last published result, or wait for the first
+    one if there is none yet. The workflow count comes from the last full
+    workflow fetch rather than from the probe.
+    
+    Args:
+        force: Probe even if a fresh result is cached
+        
+    Returns:
+        Dictionary with connection status, message, url, latency_ms,
+        checked_at and, when known, workflow_count
+    """
+    global _health_status, _health_checked, _health_probing
+    
+    if not is_api_configured():
         return {
             "connected": False,
-            "message": f"Error: {str(e)}",
+            "message": "API credentials not configured",
             "url": N8N_API_URL
         }
+    
+    with _health_lock:
+        due = force or _health_status is None or time.monotonic() - _health_checked > HEALTH_TTL
+        probe = due and not _health_probing
+        if probe:
+            _health_probing = True
+        elif _health_status is None:
+            _health_published.wait_for(
+                lambda: _health_status is not None, timeout=ENDPOINT_TIMEOUTS["health"] + 1
+            )
+    
+    if probe:
+        result = None
+        try:
+            result = _probe()
+        finally:
+            with _health_lock:
+                _health_probing = False
+                if result is not None:
+                    _health_status = result
+                    _health_checked = time.monotonic()
+                    _latency_history.append({
+                        "timestamp": result["checked_at"],
+                        "latency_ms": result["latency_ms"],
+                        "connected": result["connected"]
+                    })
+                _health_published.notify_all()
+    
+    with _health_lock:
+        if _health_status is None:
+            status = {"connected": False, "message": "Connection check in progress", "url": N8N_API_URL}
+        else:
+            status = dict(_health_status)
+    
+    if _workflow_metadata["count"] is not None:
+        status["workflow_count"] = _workflow_metadata["count"]
+    return status
+
+def get_latency_history() -> List[Dict]:
+    """Get recorded health probe results, oldest first.
+    
+    Returns:
+        List of dictionaries with timestamp, latency_ms and connected
+    """
+    with _health_lock:
+        return list(_latency_history)
+
+def _heartbeat_loop(interval: int) -> None:
+    while not _heartbeat_stop.is_set():
+        check_health(force=True)
+        _heartbeat_stop.wait(interval)
+
+def start_heartbeat(interval: int = HEARTBEAT_INTERVAL) -> None:
+    """Start the background health heartbeat if it is not already running.
+    
+    Args:
+        interval: Seconds between probes
+    """
+    global _heartbeat_thread
+    with _health_lock:
+        if _heartbeat_thread is not None and _heartbeat_thread.is_alive():
+            return
+        _heartbeat_stop.clear()
+        _heartbeat_thread = threading.Thread(
+            target=_heartbeat_loop, args=(interval,), name="n8n-heartbeat", daemon=True
+        )
+        _heartbeat_thread.start()
+
+def stop_heartbeat() -> None:
+    """Stop the background health heartbeat."""
+    _heartbeat_stop.set()
+
+class LiveSnapshot:
+    """Workflows and recent executions as last seen by the background poller.
+    
+    Snapshots are immutable and replaced as a whole, so sessions can read
+    one without locking, and ``workflows`` keeps its identity until a poll
+    finds that the workflow list has changed.
+    """
+    
+    def __init__(self, workflows: List[Dict], executions: List[Dict],
+                 workflows_updated: Optional[float], executions_updated: Optional[float],
+                 error: Optional[str], stale_after: float,
+                 executions_complete: bool = False):
+        self.workflows = workflows
+        self.executions = executions
+        # True if ``executions`` is everything there was, not the newest N
+        self.executions_complete = executions_complete
+        self.workflows_updated = workflows_updated
+        self.executions_updated = executions_updated
+        self.error = error
+        self.stale_after = stale_after
+        self._by_workflow = None
+    
+    @property
+    def loaded(self) -> bool:
+        """True once the first workflow poll has succeeded."""
+        return self.workflows_updated is not None
+    
+    def age(self) -> Optional[float]:
+        """Seconds since the workflow list was last refreshed (None if never)."""
+        if self.workflows_updated is None:
+            return None
+        return time.time() - self.workflows_updated
+    
+    def is_stale(self) -> bool:
+        """True if the poller has not refreshed workflows for too long."""
+        age = self.age()
+        return age is None or age > self.stale_after
+    
+    def executions_for(self, workflow_id: str) -> List[Dict]:
+        """Recent executions of one workflow, newest first."""
+        by_workflow = self._by_workflow
+        if by_workflow is None:
+            by_workflow = {}
+            for exe in self.executions:
+                by_workflow.setdefault(str(exe.get('workflowId')), []).append(exe)
+            self._by_workflow = by_workflow
+        return list(by_workflow.get(str(workflow_id), []))
+
+class SnapshotPoller:
+    """Background thread that refreshes a LiveSnapshot on fixed intervals."""
+    
+    def __init__(self, workflow_interval: int = POLL_WORKFLOWS_INTERVAL,
+                 execution_interval: int = POLL_EXECUTIONS_INTERVAL,
+                 execution_limit: int = POLL_EXECUTIONS_LIMIT):
+        self.workflow_interval = workflow_interval
+        self.execution_interval = execution_interval
+        self.execution_limit = execution_limit
+        self._snapshot = LiveSnapshot([], [], None, None, None, self._stale_after())
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._polled = threading.Condition(self._lock)
+        self._poll_count = 0
+        # Forced refreshes requested and served, as sequence numbers
+        self._refresh_requested = 0
+        self._refresh_served = 0
+        self._thread = None
+    
+    def _stale_after(self) -> float:
+        # Tolerate one missed poll plus a slow request
+        return 2 * self.workflow_interval + ENDPOINT_TIMEOUTS["workflows"]
+    
+    def snapshot(self) -> LiveSnapshot:
+        return self._snapshot
+    
+    def recent_executions(self, workflow_id: str, limit: int) -> Optional[List[Dict]]:
+        """A workflow's ``limit`` most recent executions, from the snapshot.
+        
+        Returns:
+            Executions newest first, or None if the last execution poll is
+            older than one missed poll plus a slow request, started before
+            the last change made through this client, or may have missed
+            some of them (it stopped at execution_limit and holds fewer than
+            ``limit`` for this workflow)
+        """
+        snapshot = self._snapshot
+        updated = snapshot.executions_updated
+        max_age = 2 * self.execution_interval + ENDPOINT_TIMEOUTS["executions"]
+        if updated is None or updated <= _executions_changed or time.time() - updated > max_age:
+            return None
+        executions = snapshot.executions_for(workflow_id)
+        if len(executions) < limit and not snapshot.executions_complete:
+            return None
+        return executions[:limit]
+    
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="n8n-poller", daemon=True)
+            self._thread.start()
+    
+    def stop(self) -> None:
+        self._stop.set()
+        self._wake.set()
+    
+    def refresh(self, timeout: float = None) -> bool:
+        """Poll now, bypassing the response cache.
+        
+        Args:
+            timeout: Seconds to wait for the poll to finish (0 to not wait)
+        
+        Returns:
+            True if a poll finished within the timeout
+        """
+        with self._lock:
+            self._refresh_requested += 1
+            target = self._refresh_requested
+        self._wake.set()
+        if timeout == 0:
+            return False
+        with self._lock:
+            return self._polled.wait_for(lambda: self._refresh_served >= target, timeout)
+    
+    def wait_loaded(self, timeout: float) -> bool:
+        """Wait for the first poll to finish."""
+        with self._lock:
+            return self._polled.wait_for(lambda: self._poll_count > 0, timeout)
+    
+    def _poll(self, workflows_due: bool, executions_due: bool) -> None:
+        current = self._snapshot
+        workflows, workflows_updated = current.workflows, current.workflows_updated
+        executions, executions_updated = current.executions, current.executions_updated
+        executions_complete = current.executions_complete
+        errors = []
+        
+        # Polls must see upstream changes, so cached pages are revalidated
+        # (a cheap 304 when nothing changed) instead of served as-is
+        if workflows_due:
+            _response_cache.expire("/workflows")
+            try:
+                fetched = list(iter_workflows(prefetch=False))
+                # Keep the old list object when nothing changed, so that
+                # caches keyed on its identity stay valid
+                if fetched != workflows:
+                    workflows = fetched
+                    get_tag_catalog().update(workflows)
+                workflows_updated = time.time()
+                _workflow_metadata["count"] = len(workflows)
+                _workflow_metadata["updated"] = datetime.now().isoformat()
+            except Exception as e:
+                errors.append(f"workflows: {e}")
+        
+        if executions_due:
+            _response_cache.expire("/executions")
+            # Stamped with the start time, so a poll racing a change is not
+            # taken to include it
+            started = time.time()
+            try:
+                store = get_execution_store()
+                if store is not None:
+                    sync_executions()
+                    executions = store.query(limit=self.execution_limit)
+                else:
+                    executions = list(iter_executions(max_items=self.execution_limit, prefetch=False))
+                executions_updated = started
+                executions_complete = len(executions) < self.execution_limit
+            except Exception as e:
+                errors.append(f"executions: {e}")
+        
+        if errors:
+            print(f"Error polling n8n: {'; '.join(errors)}")
+        
+        self._snapshot = LiveSnapshot(
+            workflows, executions, workflows_updated, executions_updated,
+            "; ".join(errors) or None, self._stale_after(), executions_complete
+        )
+    
+    def _run(self) -> None:
+        next_workflows = next_executions = 0.0
+        while not self._stop.is_set():
+            with self._lock:
+                serving = self._refresh_requested
+            force = serving > self._refresh_served
+            
+            now = time.monotonic()
+            workflows_due = force or now >= next_workflows
+            executions_due = force or now >= next_executions
+            
+            if is_api_configured():
+                self._poll(workflows_due, executions_due)
+            if workflows_due:
+                next_workflows = now + self.workflow_interval
+            if executions_due:
+                next_executions = now + self.execution_interval
+            
+            with self._lock:
+                self._poll_count += 1
+                self._refresh_served = serving
+                self._polled.notify_all()
+            
+            self._wake.wait(max(0.0, min(next_workflows, next_executions) - time.monotonic()))
+            self._wake.clear()
+
+_poller = SnapshotPoller()
+
+def start_poller() -> None:
+    """Start the background snapshot poller if it is not already running."""
+    _poller.start()
+
+def stop_poller() -> None:
+    """Stop the background snapshot poller."""
+    _poller.stop()
+
+def get_live_snapshot(wait: float = 0) -> LiveSnapshot:
+    """Get the poller's current snapshot without touching the network.
+    
+    Args:
+        wait: Seconds to wait for the first poll if nothing is loaded yet
+    
+    Returns:
+        LiveSnapshot (empty with ``loaded`` False until the first poll)
+    """
+    snapshot = _poller.snapshot()
+    if not snapshot.loaded and wait:
+        _poller.wait_loaded(wait)
+        snapshot = _poller.snapshot()
+    return snapshot
+
+def refresh_live_snapshot(timeout: float = 30.0) -> LiveSnapshot:
+    """Force an immediate poll and return the resulting snapshot.
+    
+    Args:
+        timeout: Seconds to wait for the poll to finish
+    
+    Returns:
+        The newest LiveSnapshot
+    """
+    _poller.refresh(timeout)
+    return _poller.snapshot()
+
+def test_connection() -> Dict:
+    """Test connection to n8n API.
+    
+    Uses the lightweight, cached health probe (see check_health).
+    
+    Returns:
+        Dictionary with connection status and details
+    """
+    return check_health()
 
 def delete_execution(execution_id: str) -> bool:
     """Delete a specific execution.
@@ -326,12 +1604,13 @@ def delete_execution(execution_id: str) -> bool:
         return False
     
     try:
-        response = requests.delete(
-            f"{N8N_API_URL}/executions/{execution_id}",
-            headers=get_headers(),
-            timeout=10
-        )
+        response = get_client().delete(f"/executions/{execution_id}", endpoint="executions")
         response.raise_for_status()
+        _response_cache.invalidate("/executions")
+        store = get_execution_store()
+        if store is not None:
+            store.delete([execution_id])
+        _mark_executions_changed()
         return True
     except Exception as e:
         print(f"Error deleting execution {execution_id}: {e}")
@@ -347,13 +1626,8 @@ def get_credentials() -> List[Dict]:
         return []
     
     try:
-        response = requests.get(
-            f"{N8N_API_URL}/credentials",
-            headers=get_headers(),
-            timeout=10
-        )
-        response.raise_for_status()
-        return response.json().get("data", [])
+        body = _response_cache.get_json("/credentials", "credentials")
+        return body.get("data", [])
     except Exception as e:
         print(f"Error fetching credentials: {e}")
         return []
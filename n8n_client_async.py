@@ -0,0 +1,183 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional, Any, Awaitable
+
+import n8n_client
+from n8n_client import N8N_POOL_SIZE, ExecutionSnapshot, LiveSnapshot
+from execution_analytics import ExecutionFrame
+
+# Coroutine versions of the n8n_client API.
+#
+# Each coroutine runs the matching n8n_client function on a worker thread, so
+# the async and sync code paths share one connection pool, response cache,
+# execution store and single-flight deduplication. Use asyncio.gather() to
+# run independent calls concurrently, or gather_sync() from synchronous
+# (Streamlit) code.
+#
+# Every public n8n_client function has a coroutine here with the same
+# parameters, except those in SYNC_ONLY (tests/test_async_client.py checks
+# this, so a new n8n_client function fails the suite until it is mirrored
+# or listed).
+
+# Functions that do no I/O, only manage process-wide state, or are lazy
+# iterators (use get_workflows, get_executions or get_execution_page instead)
+SYNC_ONLY = frozenset({
+    "get_headers", "is_api_configured", "get_client", "reset_client",
+    "get_cache_stats", "clear_cache", "get_execution_store", "get_slo_config",
+    "get_latency_history", "start_heartbeat", "stop_heartbeat",
+    "start_poller", "stop_poller", "iter_workflows", "iter_executions",
+})
+
+_executor = ThreadPoolExecutor(max_workers=N8N_POOL_SIZE, thread_name_prefix="n8n-async")
+
+async def _run(func, *args, **kwargs):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, lambda: func(*args, **kwargs))
+
+async def get_workflows(max_items: int = None) -> List[Dict]:
+    """Async version of n8n_client.get_workflows."""
+    return await _run(n8n_client.get_workflows, max_items=max_items)
+
+async def get_workflow_by_id(workflow_id: str) -> Optional[Dict]:
+    """Async version of n8n_client.get_workflow_by_id."""
+    return await _run(n8n_client.get_workflow_by_id, workflow_id)
+
+async def sync_executions(max_age: float = None) -> Dict:
+    """Async version of n8n_client.sync_executions."""
+    return await _run(n8n_client.sync_executions, max_age=max_age)
+
+async def get_executions(workflow_id: str, limit: int = 20, status: str = None) -> List[Dict]:
+    """Async version of n8n_client.get_executions."""
+    return await _run(n8n_client.get_executions, workflow_id, limit=limit, status=status)
+
+async def get_execution_page(workflow_id: str, status: str = None,
+                             page: int = 0, page_size: int = 25) -> Dict:
+    """Async version of n8n_client.get_execution_page."""
+    return await _run(
+        n8n_client.get_execution_page, workflow_id,
+        status=status, page=page, page_size=page_size
+    )
+
+async def get_execution_by_id(execution_id: str) -> Optional[Dict]:
+    """Async version of n8n_client.get_execution_by_id."""
+    return await _run(n8n_client.get_execution_by_id, execution_id)
+
+async def toggle_workflow(workflow_id: str, active: bool) -> bool:
+    """Async version of n8n_client.toggle_workflow."""
+    return await _run(n8n_client.toggle_workflow, workflow_id, active)
+
+async def trigger_workflow(workflow_id: str, data: Dict = None) -> Optional[str]:
+    """Async version of n8n_client.trigger_workflow."""
+    return await _run(n8n_client.trigger_workflow, workflow_id, data)
+
+async def get_workflow_statistics(workflow_id: str, days: int = 30) -> Dict:
+    """Async version of n8n_client.get_workflow_statistics."""
+    return await _run(n8n_client.get_workflow_statistics, workflow_id, days)
+
+async def get_execution_frame(workflow_id: str, days: int = 30) -> ExecutionFrame:
+    """Async version of n8n_client.get_execution_frame."""
+    return await _run(n8n_client.get_execution_frame, workflow_id, days)
+
+async def get_latency_slo(workflow_id: str, window_hours: int = 24) -> Optional[Dict]:
+    """Async version of n8n_client.get_latency_slo."""
+    return await _run(n8n_client.get_latency_slo, workflow_id, window_hours=window_hours)
+
+async def get_fleet_latency_slo(window_hours: int = 24) -> List[Dict]:
+    """Async version of n8n_client.get_fleet_latency_slo."""
+    return await _run(n8n_client.get_fleet_latency_slo, window_hours=window_hours)
+
+async def get_execution_snapshot(workflow_id: str, limit: int = 100) -> ExecutionSnapshot:
+    """Async version of n8n_client.get_execution_snapshot."""
+    return await _run(n8n_client.get_execution_snapshot, workflow_id, limit=limit)
+
+async def get_statistics_bulk(workflow_ids: List[str], concurrency: int = 8,
+                              deadline: float = 30.0, limit: int = 100) -> Dict[str, Dict]:
+    """Async version of n8n_client.get_statistics_bulk."""
+    return await _run(
+        n8n_client.get_statistics_bulk, workflow_ids,
+        concurrency=concurrency, deadline=deadline, limit=limit
+    )
+
+async def get_all_tags(workflows: List[Dict] = None) -> List[str]:
+    """Async version of n8n_client.get_all_tags."""
+    return await _run(n8n_client.get_all_tags, workflows)
+
+async def get_tag_counts(workflows: List[Dict] = None) -> Dict[str, int]:
+    """Async version of n8n_client.get_tag_counts."""
+    return await _run(n8n_client.get_tag_counts, workflows)
+
+async def check_health(force: bool = False) -> Dict:
+    """Async version of n8n_client.check_health."""
+    return await _run(n8n_client.check_health, force)
+
+async def get_live_snapshot(wait: float = 0) -> LiveSnapshot:
+    """Async version of n8n_client.get_live_snapshot."""
+    return await _run(n8n_client.get_live_snapshot, wait)
+
+async def refresh_live_snapshot(timeout: float = 30.0) -> LiveSnapshot:
+    """Async version of n8n_client.refresh_live_snapshot."""
+    return await _run(n8n_client.refresh_live_snapshot, timeout)
+
+async def test_connection() -> Dict:
+    """Async version of n8n_client.test_connection."""
+    return await _run(n8n_client.test_connection)
+
+async def delete_execution(execution_id: str) -> bool:
+    """Async version of n8n_client.delete_execution."""
+    return await _run(n8n_client.delete_execution, execution_id)
+
+async def get_credentials() -> List[Dict]:
+    """Async version of n8n_client.get_credentials."""
+    return await _run(n8n_client.get_credentials)
+
+# --- SYNC FACADE ---
+
+_loop = None
+_loop_lock = threading.Lock()
+
+def _get_loop() -> asyncio.AbstractEventLoop:
+    """Return the background event loop, starting its thread on first use."""
+    global _loop
+    if _loop is None:
+        with _loop_lock:
+            if _loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(
+                    target=loop.run_forever, name="n8n-async-loop", daemon=True
+                ).start()
+                _loop = loop
+    return _loop
+
+def run_sync(coro: Awaitable, timeout: float = None) -> Any:
+    """Run a coroutine on the background event loop and wait for its result.
+    
+    Args:
+        coro: Coroutine to run
+        timeout: Seconds to wait before raising TimeoutError
+    
+    Returns:
+        The coroutine's result
+    """
+    return asyncio.run_coroutine_threadsafe(coro, _get_loop()).result(timeout)
+
+def gather_sync(*coros: Awaitable, timeout: float = None) -> List[Any]:
+    """Run coroutines concurrently from synchronous code.
+    
+    Example:
+        snapshot, slo = gather_sync(
+            get_execution_snapshot(wf_id),
+            get_latency_slo(wf_id)
+        )
+    
+    Args:
+        *coros: Coroutines to run
+        timeout: Seconds to wait for all of them before raising TimeoutError
+    
+    Returns:
+        List of results in the same order as the coroutines
+    """
+    async def gather_all():
+        return await asyncio.gather(*coros)
+    
+    return run_sync(gather_all(), timeout)
@@ -0,0 +1,236 @@
+from typing import Any, Dict, List, Tuple
+from json.encoder import encode_basestring_ascii
+import json
+import os
+
+# Size-aware viewer support for execution payloads.
+#
+# Execution data can hold megabytes of node output (base64 binary data,
+# large item arrays). PayloadIndex measures every subtree once, in a single
+# pass and without serializing the payload, so the dashboard can show where
+# the bytes are and render a truncated preview that stays within a byte
+# budget. Sizes are those of compact JSON (no spaces).
+
+# Maximum bytes of payload preview rendered at once
+PAYLOAD_BYTE_BUDGET = int(os.getenv("N8N_PAYLOAD_BYTE_BUDGET", "200000"))
+
+# Preview limits below the byte budget
+MAX_PREVIEW_STRING = 500
+MAX_PREVIEW_ITEMS = 50
+
+def json_size(value: Any) -> int:
+    """Length of ``value`` as compact JSON, without building the string."""
+    if isinstance(value, str):
+        return len(encode_basestring_ascii(value))
+    if isinstance(value, dict):
+        # Braces, colons and commas
+        size = 1 + max(len(value), 1) + len(value)
+        for key, item in value.items():
+            size += json_size(str(key)) + json_size(item)
+        return size
+    if isinstance(value, (list, tuple)):
+        size = 1 + max(len(value), 1)
+        for item in value:
+            size += json_size(item)
+        return size
+    return len(json.dumps(value))
+
+def format_bytes(size: int) -> str:
+    for unit in ("B", "KB", "MB"):
+        if size < 1024 or unit == "MB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+class PayloadIndex:
+    """Subtree sizes for one payload, measured once and queried by path.
+    
+    A path is a tuple of dict keys and list indexes from the root.
+    """
+    
+    def __init__(self, payload: Any):
+        self.payload = payload
+        self._sizes: Dict[int, int] = {}
+        # Containers holding a string or list too long to show in full
+        self._long = set()
+        self.total = self._measure(payload)
+    
+    def _measure(self, value: Any) -> int:
+        if isinstance(value, dict):
+            size = 1 + max(len(value), 1) + len(value)
+            long = False
+            for key, item in value.items():
+                size += json_size(str(key)) + self._measure(item)
+                long = long or self._too_long(item)
+        elif isinstance(value, list):
+            size = 1 + max(len(value), 1)
+            long = len(value) > MAX_PREVIEW_ITEMS
+            for item in value:
+                size += self._measure(item)
+                long = long or self._too_long(item)
+        else:
+            return json_size(value)
+        self._sizes[id(value)] = size
+        if long:
+            self._long.add(id(value))
+        return size
+    
+    def size(self, value: Any) -> int:
+        """Size of a value from this payload (measured on demand for scalars)."""
+        size = self._sizes.get(id(value))
+        return size if size is not None else json_size(value)
+    
+    def get(self, path: Tuple = ()) -> Any:
+        """Value at ``path`` (KeyError/IndexError if it does not exist)."""
+        value = self.payload
+        for key in path:
+            value = value[key]
+        return value
+    
+    def children(self, path: Tuple = ()) -> List[Dict]:
+        """Direct children of a container with their sizes, largest first.
+        
+        Returns:
+            List of dictionaries with key, type, items (None for scalars)
+            and size
+        """
+        value = self.get(path)
+        if isinstance(value, dict):
+            entries = value.items()
+        elif isinstance(value, list):
+            entries = enumerate(value)
+        else:
+            return []
+        rows = [
+            {
+                "key": key,
+                "type": type(item).__name__,
+                "items": len(item) if isinstance(item, (dict, list)) else None,
+                "size": self.size(item),
+            }
+            for key, item in entries
+        ]
+        rows.sort(key=lambda row: row["size"], reverse=True)
+        return rows
+    
+    def containers(self, max_depth: int = 4, limit: int = 200) -> List[Tuple]:
+        """Paths of dicts and lists down to ``max_depth``, largest subtrees first.
+        
+        Args:
+            max_depth: Deepest path length returned
+            limit: Maximum number of paths
+        """
+        paths = []
+        level = [((), self.payload)]
+        for _ in range(max_depth):
+            next_level = []
+            for path, value in level:
+                entries = value.items() if isinstance(value, dict) else enumerate(value)
+                for key, item in entries:
+                    if isinstance(item, (dict, list)) and item:
+                        next_level.append((path + (key,), item))
+            paths.extend(next_level)
+            level = next_level
+        paths.sort(key=lambda entry: self.size(entry[1]), reverse=True)
+        return [path for path, _ in paths[:limit]]
+    
+    def node_sizes(self) -> List[Dict]:
+        """Per-node output sizes from an n8n payload's ``resultData.runData``.
+        
+        Returns:
+            List of dictionaries with node, runs, items and size, largest
+            first (empty if the payload has no run data)
+        """
+        run_data = self.payload.get("resultData", {}).get("runData") if isinstance(self.payload, dict) else None
+        if not isinstance(run_data, dict):
+            return []
+        rows = []
+        for node, runs in run_data.items():
+            items = 0
+            for run in runs if isinstance(runs, list) else []:
+                outputs = run.get("data", {}).get("main", []) if isinstance(run, dict) else []
+                items += sum(len(output or []) for output in outputs)
+            rows.append({
+                "node": node,
+                "runs": len(runs) if isinstance(runs, list) else 0,
+                "items": items,
+                "size": self.size(runs),
+            })
+        rows.sort(key=lambda row: row["size"], reverse=True)
+        return rows
+    
+    def preview(self, path: Tuple = (), budget: int = PAYLOAD_BYTE_BUDGET) -> Tuple[Any, bool]:
+        """Truncated copy of the subtree at ``path`` of about ``budget`` bytes.
+        
+        Long strings are cut, long lists keep their first items, and
+        anything that no longer fits is replaced by a short placeholder
+        naming its size.
+        
+        Returns:
+            Tuple of (preview, truncated)
+        """
+        value = self.get(path)
+        if self.size(value) <= budget and not self._too_long(value):
+            return value, False
+        preview, _ = self._truncate(value, budget)
+        return preview, True
+    
+    def _too_long(self, value: Any) -> bool:
+        # Small payloads can still hold long strings or arrays; keep those readable
+        if isinstance(value, str):
+            return len(value) > MAX_PREVIEW_STRING
+        return id(value) in self._long
+    
+    def _placeholder(self, value: Any) -> str:
+        if isinstance(value, dict):
+            return f"<object: {len(value)} keys, {format_bytes(self.size(value))}>"
+        if isinstance(value, list):
+            return f"<array: {len(value)} items, {format_bytes(self.size(value))}>"
+        return f"<{type(value).__name__}: {format_bytes(self.size(value))}>"
+    
+    def _fit(self, value: Any, budget: int) -> Tuple[Any, int]:
+        """A child in full if it fits, else truncated or a placeholder."""
+        if self.size(value) <= budget and not self._too_long(value):
+            return value, self.size(value)
+        if isinstance(value, str) or (isinstance(value, (dict, list)) and budget > 256):
+            return self._truncate(value, budget)
+        placeholder = self._placeholder(value)
+        return placeholder, json_size(placeholder)
+    
+    def _truncate(self, value: Any, budget: int) -> Tuple[Any, int]:
+        """Return (preview, bytes used) for ``value`` within ``budget``."""
+        if isinstance(value, str):
+            if len(value) <= MAX_PREVIEW_STRING and json_size(value) <= budget:
+                return value, json_size(value)
+            keep = max(0, min(MAX_PREVIEW_STRING, budget - 40))
+            cut = f"{value[:keep]}… <{format_bytes(json_size(value))} total>"
+            return cut, json_size(cut)
+        
+        if isinstance(value, dict):
+            out, used = {}, 2
+            for position, (key, item) in enumerate(value.items()):
+                key_size = json_size(str(key)) + 2
+                remaining = budget - used - key_size
+                if remaining <= 64:
+                    out["…"] = f"{len(value) - position} more keys"
+                    break
+                out[key], item_size = self._fit(item, remaining)
+                used += key_size + item_size
+            return out, used
+        
+        if isinstance(value, list):
+            out, used = [], 2
+            for position, item in enumerate(value):
+                remaining = budget - used - 1
+                if position >= MAX_PREVIEW_ITEMS or remaining <= 64:
+                    out.append(f"… {len(value) - position} more items")
+                    break
+                item_preview, item_size = self._fit(item, remaining)
+                out.append(item_preview)
+                used += item_size + 1
+            return out, used
+        
+        return value, json_size(value)
+    
+    def dumps(self) -> bytes:
+        """The full payload as compact JSON, for download."""
+        return json.dumps(self.payload, separators=(",", ":")).encode()
@@ -0,0 +1,244 @@
+from datetime import datetime
+from types import MappingProxyType
+from typing import Dict, Optional, Callable
+import contextlib
+import hashlib
+import hmac
+import json
+import os
+import secrets
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process locking
+    fcntl = None
+
+# File-backed access policy (users, roles, tags and password hashes).
+#
+# The policy lives in a JSON file shared by every process. Readers get an
+# immutable PolicySnapshot and never take a lock; the store notices changes
+# made by other processes by polling the file's mtime and swaps in a new
+# snapshot. Writers lock the file, apply their change to the latest version
+# on disk and replace the file atomically. Each new snapshot gets a higher
+# generation number so caches built on top can tell when to rebuild.
+#
+# The file holds password hashes and decides who is an administrator, so it
+# is created with mode 0600 in a directory created with mode 0700, and a file
+# that another user owns or can write is never loaded.
+
+PASSWORD_HASH_ITERATIONS = 100000
+
+def hash_password(password: str, iterations: int = PASSWORD_HASH_ITERATIONS) -> str:
+    """Hash a password for storage in the policy file."""
+    salt = secrets.token_hex(16)
+    digest = hashlib.pbkdf2_hmac("sha256", password.encode(), bytes.fromhex(salt), iterations)
+    return f"pbkdf2_sha256${iterations}${salt}${digest.hex()}"
+
+def verify_password(password: str, stored: Optional[str]) -> bool:
+    """Check a password against a stored hash."""
+    if not stored or password is None:
+        return False
+    try:
+        algorithm, iterations, salt, expected = stored.split("$")
+    except ValueError:
+        return False
+    if algorithm != "pbkdf2_sha256":
+        return False
+    digest = hashlib.pbkdf2_hmac(
+        "sha256", password.encode(), bytes.fromhex(salt), int(iterations)
+    )
+    return hmac.compare_digest(digest.hex(), expected)
+
+class PolicySnapshot:
+    """Immutable view of the policy at one version."""
+    
+    __slots__ = ("version", "generation", "users")
+    
+    def __init__(self, version: int, generation: int, users: Dict[str, Dict]):
+        self.version = version
+        self.generation = generation
+        self.users = MappingProxyType({
+            username: MappingProxyType({
+                "role": user.get("role", "user"),
+                "tags": tuple(user.get("tags", [])),
+                "password_hash": user.get("password_hash"),
+            })
+            for username, user in users.items()
+        })
+    
+    def role(self, username: str) -> str:
+        user = self.users.get(username)
+        return user["role"] if user is not None else "guest"
+    
+    def tags(self, username: str) -> tuple:
+        user = self.users.get(username)
+        return user["tags"] if user is not None else ()
+    
+    def password_hash(self, username: str) -> Optional[str]:
+        user = self.users.get(username)
+        return user["password_hash"] if user is not None else None
+
+class PolicyStore:
+    """JSON-file-backed policy store with hot reload and copy-on-write snapshots.
+    
+    File format::
+    
+        {"version": 3, "updated_at": "...",
+         "users": {"kelly": {"role": "user", "tags": ["Kelly"],
+                             "password_hash": "pbkdf2_sha256$..."}}}
+    """
+    
+    def __init__(self, path: str, defaults: Dict[str, Dict], reload_interval: float = 1.0):
+        """Open the store, creating the file from ``defaults`` if it is missing.
+        
+        Args:
+            path: Policy file path
+            defaults: Initial users ({username: {"role", "tags", "password_hash"}})
+            reload_interval: Minimum seconds between checks for outside changes
+        """
+        self.path = path
+        self.reload_interval = reload_interval
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._file_stat = None
+        self._last_check = 0.0
+        self._snapshot = PolicySnapshot(0, 0, {})
+        
+        directory = os.path.dirname(os.path.abspath(path))
+        if not os.path.isdir(directory):
+            os.makedirs(directory, mode=0o700, exist_ok=True)
+        if not os.path.exists(path):
+            with self._lock, self._file_lock():
+                if not os.path.exists(path):
+                    self._write_file({"version": 1, "users": defaults})
+        self.reload(force=True)
+    
+    @contextlib.contextmanager
+    def _file_lock(self):
+        """Exclusive lock across processes for read-modify-write cycles."""
+        if fcntl is None:
+            yield
+            return
+        with os.fdopen(os.open(f"{self.path}.lock", os.O_RDWR | os.O_CREAT, 0o600), "r+") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+    
+    def _stat(self) -> Optional[tuple]:
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+    
+    def _check_owner(self, fd: int) -> bool:
+        """Whether an open policy file can be trusted (owned by us, writable only by us)."""
+        if not hasattr(os, "geteuid"):  # Windows: no POSIX ownership or modes
+            return True
+        st = os.fstat(fd)
+        if st.st_uid != os.geteuid():
+            print(f"Refusing policy file {self.path}: owned by uid {st.st_uid}, not {os.geteuid()}")
+            return False
+        if st.st_mode & 0o022:
+            print(f"Refusing policy file {self.path}: writable by group or others")
+            return False
+        return True
+    
+    def _read_file(self) -> Optional[Dict]:
+        try:
+            with open(self.path, "r") as f:
+                if not self._check_owner(f.fileno()):
+                    return None
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Error reading policy file {self.path}: {e}")
+            return None
+        if not isinstance(data, dict) or not isinstance(data.get("users"), dict):
+            print(f"Ignoring malformed policy file {self.path}")
+            return None
+        return data
+    
+    def _write_file(self, data: Dict) -> None:
+        data = dict(data, updated_at=datetime.now().isoformat())
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        if hasattr(os, "fchmod"):
+            # A leftover temp file keeps its old mode; O_CREAT's mode only applies to new files
+            os.fchmod(fd, 0o600)
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f, indent=2, sort_keys=True)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.path)
+    
+    def _install(self, data: Dict, file_stat: Optional[tuple]) -> PolicySnapshot:
+        self._generation += 1
+        snapshot = PolicySnapshot(int(data.get("version", 0)), self._generation, data["users"])
+        self._snapshot = snapshot
+        self._file_stat = file_stat
+        return snapshot
+    
+    def snapshot(self) -> PolicySnapshot:
+        """Return the current policy, picking up outside changes if due.
+        
+        Never blocks on writers: the returned snapshot is immutable.
+        """
+        now = time.monotonic()
+        if now - self._last_check >= self.reload_interval:
+            self._last_check = now
+            self.reload()
+        return self._snapshot
+    
+    def reload(self, force: bool = False) -> bool:
+        """Reload the file if it changed on disk.
+        
+        Returns:
+            True if a new snapshot was installed
+        """
+        file_stat = self._stat()
+        if not force and file_stat == self._file_stat:
+            return False
+        
+        with self._lock:
+            file_stat = self._stat()
+            if not force and file_stat == self._file_stat:
+                return False
+            data = self._read_file()
+            if data is None:
+                # Keep serving the last good snapshot
+                self._file_stat = file_stat
+                return False
+            self._install(data, file_stat)
+            return True
+    
+    def update(self, mutate: Callable[[Dict[str, Dict]], None]) -> PolicySnapshot:
+        """Apply a change to the latest policy on disk and persist it.
+        
+        Args:
+            mutate: Called with a mutable copy of the users mapping
+        
+        Returns:
+            The new snapshot
+        """
+        with self._lock, self._file_lock():
+            data = self._read_file()
+            if data is None:
+                current = self._snapshot
+                data = {
+                    "version": current.version,
+                    "users": {name: dict(user) for name, user in current.users.items()}
+                }
+            
+            users = {
+                name: dict(user, tags=list(user.get("tags", [])))
+                for name, user in data["users"].items()
+            }
+            mutate(users)
+            
+            new_data = {"version": int(data.get("version", 0)) + 1, "users": users}
+            self._write_file(new_data)
+            return self._install(new_data, self._stat())
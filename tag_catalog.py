@@ -0,0 +1,141 @@
+from typing import Dict, List, Optional, Iterable
+import threading
+
+# Catalog of workflow tags.
+#
+# n8n returns tags as objects ({"id": ..., "name": ...}) while the access
+# rules work with tag names, so tags are normalized to names once, when
+# workflows are fetched. The catalog interns every name to a small integer
+# ID and keeps per-tag workflow counts, updated incrementally from each new
+# workflow snapshot by diffing the tags of changed workflows only.
+
+def tag_name(tag) -> Optional[str]:
+    """Name of a tag given as a string or as an n8n tag object."""
+    if isinstance(tag, str):
+        return tag
+    if isinstance(tag, dict):
+        name = tag.get("name")
+        return name if isinstance(name, str) else None
+    return None
+
+def normalize_tags(tags: Iterable) -> List[str]:
+    """Tag names from a workflow's ``tags`` field, in order, without duplicates."""
+    names = []
+    for tag in tags or []:
+        name = tag_name(tag)
+        if name is not None and name not in names:
+            names.append(name)
+    return names
+
+class TagCatalog:
+    """Interned tag names with per-tag workflow counts."""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._ids: Dict[str, int] = {}
+        self._names: List[str] = []
+        self._counts: List[int] = []
+        # Tag IDs per workflow ID as of the last snapshot
+        self._workflow_tags: Dict[str, tuple] = {}
+        # (workflow list, tag IDs by position) for the last snapshot
+        self._source = (None, [])
+        self._sorted = None
+        self.version = 0
+    
+    def intern(self, name: str) -> int:
+        """Integer ID for a tag name, assigning one on first use."""
+        tag_id = self._ids.get(name)
+        if tag_id is None:
+            with self._lock:
+                tag_id = self._ids.get(name)
+                if tag_id is None:
+                    tag_id = len(self._names)
+                    self._names.append(name)
+                    self._counts.append(0)
+                    self._ids[name] = tag_id
+        return tag_id
+    
+    def tag_id(self, name: str) -> Optional[int]:
+        """Interned ID of a known tag name (None if never seen)."""
+        return self._ids.get(name)
+    
+    def name(self, tag_id: int) -> str:
+        return self._names[tag_id]
+    
+    def update(self, workflows: List[Dict]) -> bool:
+        """Bring the counts up to date with a workflow snapshot.
+        
+        Only workflows that are new, removed or whose tags changed since the
+        previous snapshot touch the counts. Passing the same list object
+        again is free.
+        
+        Returns:
+            True if any count changed
+        """
+        if workflows is self._source[0]:
+            return False
+        
+        positional = self._tag_ids(workflows)
+        current = {str(wf.get('id')): tag_ids for wf, tag_ids in zip(workflows, positional)}
+        
+        with self._lock:
+            changed = False
+            previous = self._workflow_tags
+            for wf_id, tag_ids in current.items():
+                old = previous.get(wf_id)
+                if old == tag_ids:
+                    continue
+                for tag_id in old or ():
+                    self._counts[tag_id] -= 1
+                for tag_id in tag_ids:
+                    self._counts[tag_id] += 1
+                changed = True
+            for wf_id in previous.keys() - current.keys():
+                for tag_id in previous[wf_id]:
+                    self._counts[tag_id] -= 1
+                changed = True
+            
+            self._workflow_tags = current
+            self._source = (workflows, positional)
+            if changed:
+                self._sorted = None
+                self.version += 1
+        return changed
+    
+    def _tag_ids(self, workflows: List[Dict]) -> List[tuple]:
+        return [
+            tuple(self.intern(name) for name in normalize_tags(wf.get('tags')))
+            for wf in workflows
+        ]
+    
+    def tag_ids_by_position(self, workflows: List[Dict]) -> List[tuple]:
+        """Interned tag IDs of each workflow in ``workflows``, by position.
+        
+        Reuses the work done by update() when given the same list object.
+        """
+        source, positional = self._source
+        if workflows is source:
+            return positional
+        return self._tag_ids(workflows)
+    
+    def count(self, name: str) -> int:
+        """Number of workflows in the last snapshot carrying the tag."""
+        tag_id = self._ids.get(name)
+        return self._counts[tag_id] if tag_id is not None else 0
+    
+    def counts(self) -> Dict[str, int]:
+        """Workflow count per tag in use, by name."""
+        return {name: self._counts[tag_id] for tag_id, name in enumerate(self._names) if self._counts[tag_id] > 0}
+    
+    def tags(self) -> List[str]:
+        """Sorted names of the tags in use (memoized until the counts change)."""
+        tags = self._sorted
+        if tags is None:
+            tags = self._sorted = sorted(self.counts())
+        return list(tags)
+
+_catalog = TagCatalog()
+
+def get_tag_catalog() -> TagCatalog:
+    """The process-wide tag catalog."""
+    return _catalog
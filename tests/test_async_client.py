@@ -0,0 +1,58 @@
+import inspect
+import os
+import sys
+import time
+import unittest
+from unittest import mock
+
+# n8n_client_async must mirror the public n8n_client API: every public
+# function has a coroutine with the same parameters unless it is listed in
+# SYNC_ONLY, and gather_sync runs the coroutines concurrently.
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import n8n_client
+import n8n_client_async
+
+def _public_functions(module):
+    return {
+        name: func for name, func in inspect.getmembers(module, inspect.isfunction)
+        if func.__module__ == module.__name__ and not name.startswith("_")
+    }
+
+class AsyncClientMirrorTest(unittest.TestCase):
+    
+    def test_every_public_function_is_mirrored(self):
+        async_functions = _public_functions(n8n_client_async)
+        for name, func in _public_functions(n8n_client).items():
+            if name in n8n_client_async.SYNC_ONLY:
+                continue
+            with self.subTest(function=name):
+                self.assertIn(name, async_functions, f"n8n_client_async.{name} is missing")
+                self.assertTrue(inspect.iscoroutinefunction(async_functions[name]))
+                self.assertEqual(
+                    list(inspect.signature(async_functions[name]).parameters.values()),
+                    list(inspect.signature(func).parameters.values())
+                )
+    
+    def test_sync_only_names_exist(self):
+        self.assertLessEqual(n8n_client_async.SYNC_ONLY, set(_public_functions(n8n_client)))
+    
+    def test_gather_sync_runs_calls_concurrently(self):
+        def slow_lookup(workflow_id):
+            time.sleep(0.3)
+            return {"id": workflow_id}
+        
+        with mock.patch.object(n8n_client, "get_workflow_by_id", slow_lookup):
+            started = time.perf_counter()
+            results = n8n_client_async.gather_sync(
+                *(n8n_client_async.get_workflow_by_id(str(i)) for i in range(3))
+            )
+            elapsed = time.perf_counter() - started
+        
+        self.assertEqual(results, [{"id": "0"}, {"id": "1"}, {"id": "2"}])
+        self.assertLess(elapsed, 0.6)
+
+if __name__ == "__main__":
+    unittest.main()
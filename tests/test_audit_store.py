@@ -0,0 +1,223 @@
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+
+# Crash recovery and multi-process behaviour of the audit log stores.
+#
+# Crashes are simulated by stopping a job part-way and expiring its lease, as
+# happens when the owning process dies; a second store instance on the same
+# path stands in for another dashboard process. The background writer is
+# checked against a store that fails for a while: nothing may be lost.
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import audit_store
+from audit_store import (
+    JSONLAuditStore, SQLiteAuditStore, ActivitySummaryStore, AuditWriter,
+    JSONL_IMPORT_JOB, BACKFILL_JOB,
+    migrate_jsonl_to_sqlite, open_audit_store, open_activity_summary
+)
+
+class _Crash(Exception):
+    pass
+
+def _entries(count: int, start: datetime = datetime(2025, 1, 1)):
+    return [
+        {
+            "timestamp": (start + timedelta(seconds=i)).isoformat(),
+            "username": f"user{i % 3}",
+            "action": "view_workflow",
+            "workflow_id": str(i % 5),
+            "workflow_name": f"Workflow {i % 5}",
+            "status": "success",
+            "details": {"n": i},
+        }
+        for i in range(count)
+    ]
+
+class _FlakyStore:
+    """In-memory store whose appends fail until ``healthy`` is set."""
+    
+    def __init__(self):
+        self.entries = []
+        self.healthy = threading.Event()
+    
+    def append(self, entries):
+        if not self.healthy.is_set():
+            raise OSError("disk full")
+        self.entries.extend(entries)
+
+class AuditStoreTest(unittest.TestCase):
+    
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.jsonl_path = os.path.join(self._tmp.name, "audit.jsonl")
+        self.db_path = os.path.join(self._tmp.name, "audit.db")
+    
+    def write_jsonl(self, entries):
+        with open(self.jsonl_path, "w") as f:
+            for entry in entries:
+                f.write(json.dumps(entry) + "\n")
+    
+    def crash_after(self, store, batches: int):
+        """Patch ``store`` so that its job dies after committing ``batches`` batches."""
+        advance = store.advance_job
+        calls = []
+        
+        def advance_then_crash(*args, **kwargs):
+            if len(calls) == batches:
+                raise _Crash()
+            calls.append(1)
+            return advance(*args, **kwargs)
+        
+        return mock.patch.object(store, "advance_job", advance_then_crash)
+    
+    def test_interrupted_jsonl_import_resumes(self):
+        entries = _entries(95)
+        self.write_jsonl(entries)
+        
+        store = SQLiteAuditStore(self.db_path)
+        job = store.claim_job(JSONL_IMPORT_JOB)
+        with self.crash_after(store, 3), self.assertRaises(_Crash):
+            migrate_jsonl_to_sqlite(self.jsonl_path, store, batch_size=10, job=job)
+        self.assertEqual(len(store.query(limit=1000)), 30)
+        
+        # While the dead process's lease is fresh, nobody else imports
+        self.assertIsNone(store.claim_job(JSONL_IMPORT_JOB))
+        
+        with mock.patch.object(audit_store, "JOB_LEASE_SECONDS", 0):
+            resumed = open_audit_store("sqlite", self.jsonl_path, self.db_path)
+        logs = resumed.query(limit=1000)
+        self.assertEqual([log["details"]["n"] for log in reversed(logs)], list(range(95)))
+        self.assertTrue(resumed.get_meta(JSONL_IMPORT_JOB).endswith("(95 entries)"))
+        
+        # Finished: reopening imports nothing
+        with mock.patch.object(audit_store, "JOB_LEASE_SECONDS", 0):
+            open_audit_store("sqlite", self.jsonl_path, self.db_path)
+        self.assertEqual(len(resumed.query(limit=1000)), 95)
+    
+    def test_taken_over_import_stops(self):
+        self.write_jsonl(_entries(20))
+        store = SQLiteAuditStore(self.db_path)
+        job = store.claim_job(JSONL_IMPORT_JOB)
+        with mock.patch.object(audit_store, "JOB_LEASE_SECONDS", 0):
+            other = store.claim_job(JSONL_IMPORT_JOB)
+        self.assertIsNotNone(other)
+        
+        # The first owner's batches are refused once it has lost the job
+        self.assertEqual(migrate_jsonl_to_sqlite(self.jsonl_path, store, batch_size=10, job=job), 0)
+        self.assertFalse(store.finish_job(JSONL_IMPORT_JOB, job, "done"))
+        self.assertEqual(store.query(limit=100), [])
+    
+    def test_interrupted_backfill_leaves_counters_untouched(self):
+        store = SQLiteAuditStore(self.db_path)
+        store.append(_entries(95))
+        summary_path = os.path.join(self._tmp.name, "summary.db")
+        
+        summary = ActivitySummaryStore(summary_path)
+        job = summary.claim_job(BACKFILL_JOB, {"before": datetime.now().isoformat()})
+        with self.crash_after(summary, 3), self.assertRaises(_Crash):
+            summary.backfill(store.iter_all(), before=job["params"]["before"], batch_size=10, job=job)
+        self.assertEqual(summary.user_summary("user0", "2025-01-01")["total_actions"], 0)
+        
+        with mock.patch.object(audit_store, "JOB_LEASE_SECONDS", 0):
+            summary = open_activity_summary(summary_path, store)
+        self.assertEqual(
+            sum(summary.user_summary(f"user{i}", "2025-01-01")["total_actions"] for i in range(3)), 95
+        )
+        self.assertTrue(summary.get_meta(BACKFILL_JOB).endswith("(95 entries)"))
+    
+    def test_rotation_by_another_process_is_not_repeated(self):
+        ours = JSONLAuditStore(self.jsonl_path, max_age=3600)
+        theirs = JSONLAuditStore(self.jsonl_path, max_age=3600)
+        ours.append(_entries(3, start=datetime.now() - timedelta(hours=2)))
+        
+        # The other process rotates the old file and starts a fresh one
+        theirs.rotate()
+        theirs.append(_entries(1, start=datetime.now()))
+        
+        ours.append(_entries(1, start=datetime.now()))
+        self.assertEqual(len(ours.segments()), 1)
+        self.assertEqual(len(ours.query(limit=100)), 5)
+    
+    def test_segment_names_are_never_reused(self):
+        store = JSONLAuditStore(self.jsonl_path)
+        first, second = _entries(2), _entries(2)
+        for entry in second:
+            entry["details"] = {"n": -1}
+        
+        store.append(first)
+        store.rotate()
+        leftover = f"{self.jsonl_path}.rotating"
+        store.append(second)
+        store.rotate()
+        
+        segments = store.segments()
+        self.assertEqual(len(segments), 2)
+        self.assertTrue(segments[0]["path"].endswith(".2-1.gz"))
+        self.assertEqual(sorted(log["details"]["n"] for log in store.query(limit=100)), [-1, -1, 0, 1])
+        
+        # A source archived just before a crash is not archived twice
+        with open(leftover, "w") as f:
+            for entry in first:
+                f.write(json.dumps(entry) + "\n")
+        self.assertIsNone(store.rotate())
+        self.assertEqual(len(store.segments()), 2)
+        self.assertFalse(os.path.exists(leftover))
+    
+    def test_writer_keeps_failed_batches_until_they_commit(self):
+        store = _FlakyStore()
+        writer = AuditWriter(store, batch_size=10, flush_interval=0.01, retry_delay=0.01, max_retry_delay=0.05)
+        self.addCleanup(writer.close)
+        entries = _entries(25)
+        
+        with mock.patch("builtins.print"):
+            for entry in entries[:15]:
+                writer.write(entry)
+            self.assertFalse(writer.flush(timeout=1))
+            
+            store.healthy.set()
+            for entry in entries[15:]:
+                writer.write(entry)
+            self.assertTrue(writer.flush(timeout=5))
+        
+        self.assertEqual(store.entries, entries)
+        self.assertGreater(writer.stats()["write_errors"], 0)
+    
+    def test_full_queue_does_not_drop_entries(self):
+        store = _FlakyStore()
+        store.healthy.set()
+        append = store.append
+        
+        def slow_append(entries):
+            time.sleep(0.05)
+            append(entries)
+        
+        store.append = slow_append
+        writer = AuditWriter(store, batch_size=2, flush_interval=0.01, queue_size=2, put_timeout=0.01)
+        entries = _entries(20)
+        for entry in entries:
+            writer.write(entry)
+        self.assertTrue(writer.flush(timeout=5))
+        
+        stats = writer.stats()
+        self.assertGreater(stats["blocked_writes"], 0)
+        self.assertGreater(stats["sync_writes"], 0)
+        self.assertEqual(sorted(store.entries, key=lambda e: e["timestamp"]), entries)
+        
+        # Writes after close go straight to the store
+        writer.close()
+        late = _entries(1, start=datetime(2025, 2, 1))[0]
+        writer.write(late)
+        self.assertEqual(store.entries[-1], late)
+
+if __name__ == "__main__":
+    unittest.main()
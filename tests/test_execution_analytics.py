@@ -0,0 +1,55 @@
+import os
+import sys
+import time
+import unittest
+from datetime import datetime, timedelta
+
+# Naive timestamps mean local time everywhere: in the analytics columns, in
+# window() bounds, in the execution store's UTC keys and in n8n_client.
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from execution_analytics import ExecutionFrame
+from execution_store import _utc_key
+from n8n_client import _normalize_execution, _parse_timestamp
+
+class NaiveTimestampTest(unittest.TestCase):
+    
+    def setUp(self):
+        # A zone well away from UTC, so local and UTC readings differ
+        previous = os.environ.get("TZ")
+        os.environ["TZ"] = "America/New_York"
+        time.tzset()
+        
+        def restore():
+            if previous is None:
+                os.environ.pop("TZ", None)
+            else:
+                os.environ["TZ"] = previous
+            time.tzset()
+        
+        self.addCleanup(restore)
+    
+    def test_naive_timestamps_are_local_time(self):
+        naive = "2025-01-01T10:00:00"
+        frame = ExecutionFrame([
+            {"id": "1", "status": "success", "startedAt": naive, "finishedAt": "2025-01-01T10:00:05"},
+            {"id": "2", "status": "success", "startedAt": "2025-01-01T15:00:00.000Z"},
+        ])
+        started = frame.df["started"]
+        self.assertEqual(started[0], started[1])
+        self.assertEqual(started[0].strftime("%Y-%m-%dT%H:%M:%S.%f"), _utc_key(naive))
+        self.assertEqual(started[0], _parse_timestamp(naive))
+        self.assertEqual(frame.df["duration"][0], 5.0)
+        
+        start = datetime(2025, 1, 1, 10)
+        self.assertEqual(len(frame.window(since=start, until=start + timedelta(seconds=1))), 2)
+    
+    def test_filled_in_start_time_is_now(self):
+        exe = _normalize_execution({"id": "1", "status": "running"})
+        started = ExecutionFrame([exe]).df["started"][0]
+        self.assertLess(abs((datetime.now().astimezone() - started).total_seconds()), 5)
+
+if __name__ == "__main__":
+    unittest.main()
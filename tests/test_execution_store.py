@@ -0,0 +1,70 @@
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+# In-flight re-sync order of the local execution store: every execution that
+# is still running is re-checked in turn, not just the oldest batch, and
+# readers that find the store stale at the same time share one sync.
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import n8n_client
+from execution_store import ExecutionStore
+
+def _running(count: int):
+    return [
+        {"id": str(i), "workflowId": "1", "status": "running",
+         "startedAt": "2025-01-01T00:00:00.000Z"}
+        for i in range(1, count + 1)
+    ]
+
+class ExecutionStoreTest(unittest.TestCase):
+    
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.path = os.path.join(self._tmp.name, "executions.db")
+    
+    def test_in_flight_rotates_through_all_rows(self):
+        store = ExecutionStore(self.path)
+        store.upsert(_running(25))
+        
+        seen = []
+        for _ in range(3):
+            batch = store.in_flight(10)
+            seen.extend(batch)
+            store.mark_checked(batch)
+        self.assertEqual(sorted(seen[:25], key=int), [str(i) for i in range(1, 26)])
+        
+        # A row that was just written goes to the back of the queue
+        store.upsert([{"id": "1", "workflowId": "1", "status": "running"}])
+        self.assertNotIn("1", store.in_flight(24))
+    
+    def test_concurrent_stale_reads_share_one_sync(self):
+        store = ExecutionStore(self.path)
+        pages = []
+        
+        def slow_iter(*args, **kwargs):
+            pages.append(1)
+            time.sleep(0.2)
+            return iter(_running(3))
+        
+        with mock.patch.object(n8n_client, "get_execution_store", return_value=store), \
+                mock.patch.object(n8n_client, "is_api_configured", return_value=True), \
+                mock.patch.object(n8n_client, "iter_executions", slow_iter), \
+                mock.patch.object(n8n_client, "_last_sync", 0.0):
+            threads = [threading.Thread(target=n8n_client._ensure_synced) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        
+        self.assertEqual(len(pages), 1)
+
+if __name__ == "__main__":
+    unittest.main()
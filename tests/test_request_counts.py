@@ -0,0 +1,183 @@
+import json
+import os
+import sys
+import tempfile
+import threading
+import unittest
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+from urllib.parse import urlparse, parse_qs
+
+# Upstream request counts for one render of the workflow page.
+#
+# app.py runs under Streamlit's AppTest against a stub n8n API on a local
+# port. Stats, the execution log and the analytics charts must all be served
+# by the render's single execution snapshot. That snapshot comes from the
+# background poller when the poll holds all of the workflow's recent
+# executions, so a render then makes no /executions request for the selected
+# workflow; otherwise it makes exactly one, with or without a status filter,
+# and none at all when the local execution store is enabled.
+# Execution payloads are fetched on every call and never kept in the
+# response cache.
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+_tmp = tempfile.TemporaryDirectory()
+os.environ.update({
+    "N8N_API_KEY": "test-key",
+    "N8N_EXECUTION_STORE_PATH": "",
+    "AUDIT_LOG_PATH": os.path.join(_tmp.name, "audit.jsonl"),
+    "AUDIT_DB_PATH": os.path.join(_tmp.name, "audit.db"),
+    "ACL_STORE_PATH": os.path.join(_tmp.name, "acl_policy.json"),
+})
+
+WORKFLOWS = [
+    {"id": str(i), "name": f"Workflow {i}", "active": True, "tags": ["Kelly"], "nodes": []}
+    for i in range(1, 4)
+]
+_now = datetime.now(timezone.utc)
+EXECUTIONS = [
+    {
+        "id": str(1000 - i),
+        "workflowId": str(i % 3 + 1),
+        "status": ("success", "error", "waiting")[i % 4 % 3],
+        "mode": "trigger",
+        "startedAt": (_now - timedelta(minutes=5 * i)).isoformat().replace("+00:00", "Z"),
+        "finishedAt": (_now - timedelta(minutes=5 * i - 1)).isoformat().replace("+00:00", "Z"),
+    }
+    for i in range(300)
+]
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Minimal n8n public API: cursor-paged /workflows and /executions."""
+    
+    requests = []
+    lock = threading.Lock()
+    
+    def log_message(self, *args):
+        pass
+    
+    def _send(self, code, body):
+        data = json.dumps(body).encode()
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+    
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        with self.lock:
+            self.requests.append((url.path, query))
+        
+        limit, cursor = int(query.get("limit", 100)), int(query.get("cursor", 0))
+        if url.path.endswith("/workflows"):
+            rows = WORKFLOWS
+        elif "/executions/" in url.path:
+            execution_id = url.path.rsplit("/", 1)[1]
+            exe = next((exe for exe in EXECUTIONS if exe["id"] == execution_id), None)
+            if exe is None:
+                return self._send(404, {"message": "not found"})
+            payload = {"resultData": {"runData": {}}} if query.get("includeData") == "true" else None
+            return self._send(200, {"data": dict(exe, data=payload)})
+        elif url.path.endswith("/executions"):
+            rows = [
+                exe for exe in EXECUTIONS
+                if query.get("workflowId", exe["workflowId"]) == exe["workflowId"]
+                and query.get("status", exe["status"]) == exe["status"]
+            ]
+        else:
+            return self._send(404, {"message": "not found"})
+        
+        more = cursor + limit < len(rows)
+        self._send(200, {"data": rows[cursor:cursor + limit], "nextCursor": str(cursor + limit) if more else None})
+    
+    do_PATCH = do_POST = do_DELETE = do_GET
+
+class WorkflowPageRequestCountTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        os.environ["N8N_API_URL"] = f"http://127.0.0.1:{cls.server.server_port}/api/v1"
+        
+        import n8n_client
+        cls.client = n8n_client
+        # The module may have been imported (by another test) before the
+        # stub settings were in the environment
+        n8n_client.N8N_API_URL = os.environ["N8N_API_URL"]
+        n8n_client.N8N_API_KEY = os.environ["N8N_API_KEY"]
+        n8n_client.EXECUTION_STORE_PATH = os.environ["N8N_EXECUTION_STORE_PATH"]
+        n8n_client.reset_client()
+    
+    @classmethod
+    def tearDownClass(cls):
+        cls.client.stop_poller()
+        cls.server.shutdown()
+    
+    def setUp(self):
+        from streamlit.testing.v1 import AppTest
+        self.app = AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=60)
+        self.app.session_state.logged_in = True
+        self.app.session_state.username = "admin"
+        self.app.run()
+        self.assertFalse(self.app.exception, [e.value for e in self.app.exception])
+    
+    def render(self, status: str = "all"):
+        """Rerun the page cold (no cached responses) and return its workflow /executions requests."""
+        self.client._response_cache.invalidate()
+        with StubHandler.lock:
+            StubHandler.requests.clear()
+        self.app.selectbox(key="exec_filter").set_value(status)
+        self.app.run()
+        self.assertFalse(self.app.exception, [e.value for e in self.app.exception])
+        with StubHandler.lock:
+            return [
+                (path, query) for path, query in StubHandler.requests
+                if path.endswith("/executions") and "workflowId" in query
+            ]
+    
+    def test_no_executions_request_when_poller_has_them(self):
+        # The poll returns all 300 executions, fewer than its limit
+        self.client.refresh_live_snapshot()
+        for status in ("all", "error"):
+            with self.subTest(status=status):
+                self.assertEqual(self.render(status), [])
+    
+    def test_one_executions_request_per_render(self):
+        # A poll cut off at 50 executions holds too few of the workflow's
+        with mock.patch.object(self.client._poller, "execution_limit", 50):
+            self.client.refresh_live_snapshot()
+            for status in ("all", "error", "success", "all"):
+                with self.subTest(status=status):
+                    requests = self.render(status)
+                    self.assertEqual(len(requests), 1, requests)
+                    # Status filtering is done locally on the snapshot's rows
+                    self.assertNotIn("status", requests[0][1])
+        self.client.refresh_live_snapshot()
+    
+    def test_no_executions_request_with_local_store(self):
+        store_path = os.path.join(_tmp.name, "executions.db")
+        with mock.patch.object(self.client, "EXECUTION_STORE_PATH", store_path), \
+                mock.patch.object(self.client, "_execution_store", None):
+            self.client.sync_executions()
+            for status in ("all", "error"):
+                with self.subTest(status=status):
+                    self.assertEqual(self.render(status), [])
+
+    def test_execution_payloads_bypass_the_response_cache(self):
+        with StubHandler.lock:
+            StubHandler.requests.clear()
+        for _ in range(2):
+            details = self.client.get_execution_by_id("1000")
+            self.assertEqual(details["data"], {"resultData": {"runData": {}}})
+        self.assertNotIn(("/executions/1000", (("includeData", "true"),)), self.client._response_cache._entries)
+        with StubHandler.lock:
+            self.assertEqual([path for path, _ in StubHandler.requests].count("/api/v1/executions/1000"), 2)
+
+if __name__ == "__main__":
+    unittest.main()
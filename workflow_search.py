@@ -0,0 +1,117 @@
+from collections import OrderedDict
+from typing import List, Dict, Optional
+import numpy as np
+from tag_catalog import normalize_tags
+
+# Sidebar search over one workflow snapshot.
+#
+# Names are lowercased once and indexed by trigram, and tags and active
+# status are kept as boolean bitmaps over snapshot positions. A search is
+# then a bitmap AND, an intersection of the query's trigram posting lists
+# and a substring check on the few remaining candidates. Results are
+# memoized per (query, tag, status) for as long as the index is in use.
+
+# Minimum fraction of the query's trigrams a name must contain to be
+# returned as a fuzzy match when nothing matches exactly
+FUZZY_MIN_SIMILARITY = 0.6
+
+# Number of filter combinations remembered per index
+SEARCH_MEMO_SIZE = 128
+
+def trigrams(text: str) -> set:
+    """Distinct 3-character substrings of ``text``."""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+class WorkflowSearchIndex:
+    """Name, tag and status index over a workflow list, built once per snapshot."""
+    
+    def __init__(self, workflows: List[Dict]):
+        self.workflows = workflows
+        self.names = [str(wf.get('name') or '').lower() for wf in workflows]
+        size = len(workflows)
+        
+        postings = {}
+        for position, name in enumerate(self.names):
+            for gram in trigrams(name):
+                postings.setdefault(gram, []).append(position)
+        self.postings = {gram: np.array(positions, dtype=np.int32) for gram, positions in postings.items()}
+        
+        tag_positions = {}
+        for position, wf in enumerate(workflows):
+            for tag in normalize_tags(wf.get('tags')):
+                tag_positions.setdefault(tag, []).append(position)
+        self.tag_bitmaps = {}
+        for tag, positions in tag_positions.items():
+            bitmap = np.zeros(size, dtype=bool)
+            bitmap[positions] = True
+            self.tag_bitmaps[tag] = bitmap
+        
+        self.active = np.fromiter((bool(wf.get('active')) for wf in workflows), dtype=bool, count=size)
+        self._memo = OrderedDict()
+    
+    def __len__(self) -> int:
+        return len(self.workflows)
+    
+    def search(self, query: str = "", tag: str = None, active: Optional[bool] = None) -> List[Dict]:
+        """Workflows matching all the given filters, in snapshot order.
+        
+        Args:
+            query: Case-insensitive name substring (empty matches everything).
+                If nothing contains it, names sharing most of its trigrams
+                are returned instead, best match first.
+            tag: Only workflows with this tag
+            active: Only active (True) or inactive (False) workflows
+        
+        Returns:
+            List of workflows (memoized; treat as read-only)
+        """
+        query = (query or "").strip().lower()
+        key = (query, tag, active)
+        result = self._memo.get(key)
+        if result is not None:
+            self._memo.move_to_end(key)
+            return result
+        
+        result = [self.workflows[i] for i in self._positions(query, tag, active)]
+        self._memo[key] = result
+        if len(self._memo) > SEARCH_MEMO_SIZE:
+            self._memo.popitem(last=False)
+        return result
+    
+    def _positions(self, query: str, tag: str, active: Optional[bool]) -> List[int]:
+        mask = np.ones(len(self.workflows), dtype=bool)
+        if tag is not None:
+            mask &= self.tag_bitmaps.get(tag, False)
+        if active is not None:
+            mask &= self.active if active else ~self.active
+        
+        if not query:
+            return np.flatnonzero(mask).tolist()
+        
+        grams = trigrams(query)
+        if not grams:
+            # Too short for trigrams: check the names that pass the bitmaps
+            return [i for i in np.flatnonzero(mask).tolist() if query in self.names[i]]
+        
+        lists = sorted((self.postings.get(gram) for gram in grams), key=lambda p: 0 if p is None else len(p))
+        if lists[0] is not None:
+            candidates = lists[0][mask[lists[0]]]
+            for positions in lists[1:]:
+                if len(candidates) == 0:
+                    break
+                candidates = np.intersect1d(candidates, positions, assume_unique=True)
+            matches = [i for i in candidates.tolist() if query in self.names[i]]
+            if matches:
+                return matches
+        return self._fuzzy(grams, mask)
+    
+    def _fuzzy(self, grams: set, mask: np.ndarray) -> List[int]:
+        """Positions sharing at least FUZZY_MIN_SIMILARITY of ``grams``, best first."""
+        found = [self.postings[gram] for gram in grams if gram in self.postings]
+        if not found:
+            return []
+        scores = np.bincount(np.concatenate(found), minlength=len(self.workflows))
+        scores[~mask] = 0
+        positions = np.flatnonzero(scores >= FUZZY_MIN_SIMILARITY * len(grams))
+        order = np.argsort(-scores[positions], kind="stable")
+        return positions[order].tolist()